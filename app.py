@@ -6,6 +6,15 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from utils.assets import COLUMN_WIDTHS, image_asset
+from utils.bootstrap import warm_up_in_background
+from utils.figure_cache import plotly_chart_cached
+from utils.profiling import profile_page
+
+# Load shared datasets for the other pages while this one renders
+# (a no-op when the server was started through serve.py)
+warm_up_in_background(prerender=False)
+
 # Page configuration
 st.set_page_config(
     page_title="Verathon Marketing Intelligence Platform",
@@ -14,6 +23,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("Home")
+
 # Verathon brand colors
 VERATHON_BLUE = "#0056A7"
 VERATHON_WHITE = "#FFFFFF"
@@ -43,61 +55,64 @@ webinar programs, and competitive intelligence in real-time, with a focus on you
 # Digital Factory 24 Framework visualization
 st.header("Digital Factory 24's Growth Maturity Framework")
 
-# Create a 3D-style diagram for the framework stages
-framework_data = pd.DataFrame({
-    'Stage': ['Foundation', 'Development', 'Expansion', 'Innovation', 'Sustaining Success'],
-    'Level': [1, 2, 3, 4, 5],
-    'Value': [85, 70, 60, 45, 30],  # Size of the circles
-    'Description': [
-        'Building the Basics',
-        'Enhancing Engagement',
-        'Scaling for Success',
-        'Leading the Market',
-        'Continuous Optimization'
-    ]
-})
-
-fig = px.scatter(
-    framework_data,
-    x='Level',
-    y='Value',
-    size='Value',
-    text='Stage',
-    color='Stage',
-    color_discrete_sequence=[VERATHON_BLUE, "#3C78D8", "#6FA8DC", "#9FC5E8", "#CFE2F3"],
-    size_max=60,
-    height=400
-)
+def build_framework_figure():
+    # Create a 3D-style diagram for the framework stages
+    framework_data = pd.DataFrame({
+        'Stage': ['Foundation', 'Development', 'Expansion', 'Innovation', 'Sustaining Success'],
+        'Level': [1, 2, 3, 4, 5],
+        'Value': [85, 70, 60, 45, 30],  # Size of the circles
+        'Description': [
+            'Building the Basics',
+            'Enhancing Engagement',
+            'Scaling for Success',
+            'Leading the Market',
+            'Continuous Optimization'
+        ]
+    })
 
-# Customize to look more 3D-like
-fig.update_traces(
-    textposition='middle center',
-    textfont=dict(color='white', size=12),
-    marker=dict(opacity=0.9, line=dict(width=2, color='white')),
-)
+    fig = px.scatter(
+        framework_data,
+        x='Level',
+        y='Value',
+        size='Value',
+        text='Stage',
+        color='Stage',
+        color_discrete_sequence=[VERATHON_BLUE, "#3C78D8", "#6FA8DC", "#9FC5E8", "#CFE2F3"],
+        size_max=60,
+        height=400
+    )
 
-# Add connecting lines to show progression
-fig.add_trace(
-    go.Scatter(
-        x=framework_data['Level'],
-        y=framework_data['Value'],
-        mode='lines',
-        line=dict(color=VERATHON_BLUE, width=3),
-        showlegend=False
+    # Customize to look more 3D-like
+    fig.update_traces(
+        textposition='middle center',
+        textfont=dict(color='white', size=12),
+        marker=dict(opacity=0.9, line=dict(width=2, color='white')),
     )
-)
 
-# Clean up the layout
-fig.update_layout(
-    title="Digital Marketing Growth Maturity Journey",
-    xaxis_title="",
-    yaxis_title="",
-    xaxis=dict(showticklabels=False, showgrid=False),
-    yaxis=dict(showticklabels=False, showgrid=False),
-    plot_bgcolor='rgba(0,0,0,0)',
-)
+    # Add connecting lines to show progression
+    fig.add_trace(
+        go.Scatter(
+            x=framework_data['Level'],
+            y=framework_data['Value'],
+            mode='lines',
+            line=dict(color=VERATHON_BLUE, width=3),
+            showlegend=False
+        )
+    )
+
+    # Clean up the layout
+    fig.update_layout(
+        title="Digital Marketing Growth Maturity Journey",
+        xaxis_title="",
+        yaxis_title="",
+        xaxis=dict(showticklabels=False, showgrid=False),
+        yaxis=dict(showticklabels=False, showgrid=False),
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig
 
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart_cached('landing.framework', build_framework_figure, use_container_width=True)
 
 # Add descriptions under the chart
 framework_cols = st.columns(5)
@@ -139,7 +154,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Digital Marketing & Campaign Analytics")
-    st.image("https://images.unsplash.com/photo-1432888498266-38ffec3eaf0a", 
+    st.image(image_asset("campaign_analytics", COLUMN_WIDTHS["half"]), 
              caption="Advanced Campaign Analytics Dashboard")
     st.markdown("""
     Track all your digital marketing KPIs with Google Tag Manager integration, providing real-time insights 
@@ -156,7 +171,7 @@ with col1:
 
 with col2:
     st.subheader("Webinar Marketing Framework")
-    st.image("https://images.unsplash.com/photo-1517245386807-bb43f82c33c4", 
+    st.image(image_asset("webinar_management", COLUMN_WIDTHS["half"]), 
              caption="Webinar Management System with Cvent Integration")
     st.markdown("""
     Manage your webinar program using the Crawl-Walk-Run framework, with seamless Cvent integration. 
@@ -195,35 +210,38 @@ with new_product_col1:
     st.button("View New Product GTM Playbook", key="gtm_btn")
 
 with new_product_col2:
-    # Create a simple funnel chart showing accelerated GTM process
-    funnel_stages = ['Market Research', 'Strategy Development', 'Campaign Creation', 'Launch Execution', 'Performance Optimization']
-    traditional_values = [100, 80, 65, 50, 35]
-    df24_values = [100, 95, 85, 75, 60]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Funnel(
-        name = 'Traditional Approach',
-        y = funnel_stages,
-        x = traditional_values,
-        textinfo = "value+percent initial",
-        marker = {"color": "lightgrey"}
-    ))
-    
-    fig.add_trace(go.Funnel(
-        name = 'DF24 Accelerated Approach',
-        y = funnel_stages,
-        x = df24_values,
-        textinfo = "value+percent initial",
-        marker = {"color": VERATHON_BLUE}
-    ))
-    
-    fig.update_layout(
-        title="GTM Acceleration Comparison",
-        height=400,
-    )
+    def build_gtm_funnel_figure():
+        # Create a simple funnel chart showing accelerated GTM process
+        funnel_stages = ['Market Research', 'Strategy Development', 'Campaign Creation', 'Launch Execution', 'Performance Optimization']
+        traditional_values = [100, 80, 65, 50, 35]
+        df24_values = [100, 95, 85, 75, 60]
+
+        fig = go.Figure()
+
+        fig.add_trace(go.Funnel(
+            name = 'Traditional Approach',
+            y = funnel_stages,
+            x = traditional_values,
+            textinfo = "value+percent initial",
+            marker = {"color": "lightgrey"}
+        ))
+
+        fig.add_trace(go.Funnel(
+            name = 'DF24 Accelerated Approach',
+            y = funnel_stages,
+            x = df24_values,
+            textinfo = "value+percent initial",
+            marker = {"color": VERATHON_BLUE}
+        ))
+
+        fig.update_layout(
+            title="GTM Acceleration Comparison",
+            height=400,
+        )
+        
+        return fig
     
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart_cached('landing.gtm_funnel', build_gtm_funnel_figure, use_container_width=True)
 
 # Case studies section
 st.markdown("---")
@@ -254,24 +272,28 @@ with tabs[0]:
         """)
     
     with healthcare_col2:
-        # Create a bar chart showing the results
-        results_data = pd.DataFrame({
-            'Metric': ['Lead Increase', 'CPA Reduction', 'ROI Improvement'],
-            'Percentage': [42, 28, 167]
-        })
+        def build_healthcare_results_figure():
+            # Create a bar chart showing the results
+            results_data = pd.DataFrame({
+                'Metric': ['Lead Increase', 'CPA Reduction', 'ROI Improvement'],
+                'Percentage': [42, 28, 167]
+            })
+
+            fig = px.bar(
+                results_data, 
+                x='Percentage', 
+                y='Metric', 
+                orientation='h',
+                color='Percentage',
+                color_continuous_scale=['#0056A7', '#4682B4', '#87CEEB'],
+                labels={'Percentage': 'Improvement (%)'},
+                title="Healthcare Case Study Results"
+            )
+            fig.update_layout(height=300)
+            
+            return fig
         
-        fig = px.bar(
-            results_data, 
-            x='Percentage', 
-            y='Metric', 
-            orientation='h',
-            color='Percentage',
-            color_continuous_scale=['#0056A7', '#4682B4', '#87CEEB'],
-            labels={'Percentage': 'Improvement (%)'},
-            title="Healthcare Case Study Results"
-        )
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart_cached('landing.healthcare_results', build_healthcare_results_figure, use_container_width=True)
 
 with tabs[1]:
     medical_col1, medical_col2 = st.columns([2, 1])
@@ -296,30 +318,34 @@ with tabs[1]:
         """)
     
     with medical_col2:
-        # Create a timeline chart showing the accelerated launch
-        timeline_data = pd.DataFrame({
-            'Stage': ['Planning', 'Development', 'Testing', 'Launch', 'Optimization'],
-            'Traditional': [30, 45, 30, 15, 30],
-            'DF24 Approach': [20, 25, 15, 10, 15]
-        })
+        def build_launch_timeline_figure():
+            # Create a timeline chart showing the accelerated launch
+            timeline_data = pd.DataFrame({
+                'Stage': ['Planning', 'Development', 'Testing', 'Launch', 'Optimization'],
+                'Traditional': [30, 45, 30, 15, 30],
+                'DF24 Approach': [20, 25, 15, 10, 15]
+            })
+
+            timeline_data['Traditional_Cumulative'] = timeline_data['Traditional'].cumsum()
+            timeline_data['DF24_Cumulative'] = timeline_data['DF24 Approach'].cumsum()
+
+            fig = px.line(
+                timeline_data, 
+                x='Stage', 
+                y=['Traditional_Cumulative', 'DF24_Cumulative'],
+                markers=True,
+                labels={'value': 'Days', 'variable': 'Approach'},
+                title="Launch Timeline Comparison",
+                color_discrete_map={
+                    'Traditional_Cumulative': 'lightgrey',
+                    'DF24_Cumulative': VERATHON_BLUE
+                }
+            )
+            fig.update_layout(height=300)
+            
+            return fig
         
-        timeline_data['Traditional_Cumulative'] = timeline_data['Traditional'].cumsum()
-        timeline_data['DF24_Cumulative'] = timeline_data['DF24 Approach'].cumsum()
-        
-        fig = px.line(
-            timeline_data, 
-            x='Stage', 
-            y=['Traditional_Cumulative', 'DF24_Cumulative'],
-            markers=True,
-            labels={'value': 'Days', 'variable': 'Approach'},
-            title="Launch Timeline Comparison",
-            color_discrete_map={
-                'Traditional_Cumulative': 'lightgrey',
-                'DF24_Cumulative': VERATHON_BLUE
-            }
-        )
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart_cached('landing.launch_timeline', build_launch_timeline_figure, use_container_width=True)
 
 with tabs[2]:
     st.subheader("Enterprise Technology Provider")
@@ -363,47 +389,50 @@ with tabs[3]:
 st.markdown("---")
 st.header("Competitive Intelligence: Market Position Analysis")
 
-# Create data for the competitive positioning chart
-competitors = ['Verathon', 'Competitor A', 'Competitor B', 'Competitor C', 'Competitor D']
-dimensions = ['Digital Presence', 'GTM Effectiveness', 'Campaign Integration', 'Technology Adoption', 'Customer Experience']
-
-# Create random scores for demonstration (1-10 scale)
-np.random.seed(42)  # For reproducibility
-competitor_data = {}
-
-# Verathon scores - slightly above average but with room for improvement
-competitor_data['Verathon'] = [7, 6, 5, 6, 7]
-
-# Generate scores for competitors
-competitor_data['Competitor A'] = [8, 7, 9, 8, 7]
-competitor_data['Competitor B'] = [6, 8, 7, 9, 8]
-competitor_data['Competitor C'] = [5, 4, 6, 7, 5]
-competitor_data['Competitor D'] = [7, 6, 5, 4, 6]
-
-# Create the radar chart
-fig = go.Figure()
-
-for competitor in competitors:
-    fig.add_trace(go.Scatterpolar(
-        r=competitor_data[competitor],
-        theta=dimensions,
-        fill='toself',
-        name=competitor,
-        opacity=0.8
-    ))
-
-fig.update_layout(
-    polar=dict(
-        radialaxis=dict(
-            visible=True,
-            range=[0, 10]
-        )),
-    showlegend=True,
-    title="Competitive Digital Marketing Capabilities",
-    height=500
-)
+def build_competitive_radar_figure():
+    # Create data for the competitive positioning chart
+    competitors = ['Verathon', 'Competitor A', 'Competitor B', 'Competitor C', 'Competitor D']
+    dimensions = ['Digital Presence', 'GTM Effectiveness', 'Campaign Integration', 'Technology Adoption', 'Customer Experience']
 
-st.plotly_chart(fig, use_container_width=True)
+    # Create random scores for demonstration (1-10 scale)
+    np.random.seed(42)  # For reproducibility
+    competitor_data = {}
+
+    # Verathon scores - slightly above average but with room for improvement
+    competitor_data['Verathon'] = [7, 6, 5, 6, 7]
+
+    # Generate scores for competitors
+    competitor_data['Competitor A'] = [8, 7, 9, 8, 7]
+    competitor_data['Competitor B'] = [6, 8, 7, 9, 8]
+    competitor_data['Competitor C'] = [5, 4, 6, 7, 5]
+    competitor_data['Competitor D'] = [7, 6, 5, 4, 6]
+
+    # Create the radar chart
+    fig = go.Figure()
+
+    for competitor in competitors:
+        fig.add_trace(go.Scatterpolar(
+            r=competitor_data[competitor],
+            theta=dimensions,
+            fill='toself',
+            name=competitor,
+            opacity=0.8
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 10]
+            )),
+        showlegend=True,
+        title="Competitive Digital Marketing Capabilities",
+        height=500
+    )
+    
+    return fig
+
+plotly_chart_cached('landing.competitive_radar', build_competitive_radar_figure, use_container_width=True)
 
 comp_col1, comp_col2 = st.columns(2)
 
@@ -462,38 +491,41 @@ with ux_col1:
     """)
 
 with ux_col2:
-    # Create a stacked bar chart showing UX improvement results
-    ux_data = pd.DataFrame({
-        'Metric': ['Conversion Rate', 'Engagement Time', 'Task Completion', 'User Satisfaction'],
-        'Before': [20, 45, 65, 72],
-        'After': [42, 72, 89, 94]
-    })
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=ux_data['Metric'],
-        y=ux_data['Before'],
-        name='Before DF24',
-        marker_color='lightgrey'
-    ))
-    
-    fig.add_trace(go.Bar(
-        x=ux_data['Metric'],
-        y=ux_data['After'] - ux_data['Before'],  # Show only the improvement
-        name='DF24 Improvement',
-        marker_color=VERATHON_BLUE,
-        base=ux_data['Before']  # Start from the "before" value
-    ))
-    
-    fig.update_layout(
-        title="UX/UI Improvement Impact",
-        yaxis_title="Percentage (%)",
-        barmode='stack',
-        height=300
-    )
+    def build_ux_impact_figure():
+        # Create a stacked bar chart showing UX improvement results
+        ux_data = pd.DataFrame({
+            'Metric': ['Conversion Rate', 'Engagement Time', 'Task Completion', 'User Satisfaction'],
+            'Before': [20, 45, 65, 72],
+            'After': [42, 72, 89, 94]
+        })
+
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=ux_data['Metric'],
+            y=ux_data['Before'],
+            name='Before DF24',
+            marker_color='lightgrey'
+        ))
+
+        fig.add_trace(go.Bar(
+            x=ux_data['Metric'],
+            y=ux_data['After'] - ux_data['Before'],  # Show only the improvement
+            name='DF24 Improvement',
+            marker_color=VERATHON_BLUE,
+            base=ux_data['Before']  # Start from the "before" value
+        ))
+
+        fig.update_layout(
+            title="UX/UI Improvement Impact",
+            yaxis_title="Percentage (%)",
+            barmode='stack',
+            height=300
+        )
+        
+        return fig
     
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart_cached('landing.ux_impact', build_ux_impact_figure, use_container_width=True)
 
 # 24/7 Support Model
 st.markdown("---")
@@ -540,39 +572,42 @@ with support_col3:
     - Continuous performance optimization
     """)
 
-# World map showing global support
-support_locations = pd.DataFrame({
-    'city': ['New York', 'London', 'Singapore', 'Sydney', 'Tokyo', 'Berlin', 'Mumbai', 'San Francisco'],
-    'lat': [40.7128, 51.5074, 1.3521, -33.8688, 35.6762, 52.5200, 19.0760, 37.7749],
-    'lon': [-74.0060, -0.1278, 103.8198, 151.2093, 139.6503, 13.4050, 72.8777, -122.4194],
-    'size': [25, 20, 15, 15, 10, 15, 20, 25]
-})
-
-fig = px.scatter_geo(
-    support_locations,
-    lat='lat',
-    lon='lon',
-    size='size',
-    color_discrete_sequence=[VERATHON_BLUE],
-    projection='natural earth',
-    title="Digital Factory 24 Global Support Centers",
-    height=400
-)
+def build_support_map_figure():
+    # World map showing global support
+    support_locations = pd.DataFrame({
+        'city': ['New York', 'London', 'Singapore', 'Sydney', 'Tokyo', 'Berlin', 'Mumbai', 'San Francisco'],
+        'lat': [40.7128, 51.5074, 1.3521, -33.8688, 35.6762, 52.5200, 19.0760, 37.7749],
+        'lon': [-74.0060, -0.1278, 103.8198, 151.2093, 139.6503, 13.4050, 72.8777, -122.4194],
+        'size': [25, 20, 15, 15, 10, 15, 20, 25]
+    })
 
-fig.update_geos(
-    showcountries=True,
-    countrycolor="Gray",
-    showcoastlines=True,
-    coastlinecolor="Gray",
-    showland=True,
-    landcolor="lightgray",
-    showocean=True,
-    oceancolor="aliceblue"
-)
+    fig = px.scatter_geo(
+        support_locations,
+        lat='lat',
+        lon='lon',
+        size='size',
+        color_discrete_sequence=[VERATHON_BLUE],
+        projection='natural earth',
+        title="Digital Factory 24 Global Support Centers",
+        height=400
+    )
 
-fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+    fig.update_geos(
+        showcountries=True,
+        countrycolor="Gray",
+        showcoastlines=True,
+        coastlinecolor="Gray",
+        showland=True,
+        landcolor="lightgray",
+        showocean=True,
+        oceancolor="aliceblue"
+    )
 
-st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+    
+    return fig
+
+plotly_chart_cached('landing.support_map', build_support_map_figure, use_container_width=True)
 
 # Footer with resources
 st.markdown("---")
@@ -620,3 +655,5 @@ st.markdown(f"""
 # Add copyright footer
 st.markdown("")
 st.markdown("<p style='text-align:center; color:gray; font-size:12px;'>© 2024 Digital Factory 24. Created exclusively for Verathon.</p>", unsafe_allow_html=True)
+
+profiler.finish()
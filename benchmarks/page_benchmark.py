@@ -0,0 +1,229 @@
+"""Headless per-page performance benchmark.
+
+Every page script is run with Streamlit's ``AppTest`` in a fresh
+interpreter against a synthetic metrics store of a given scale, and the
+benchmark records:
+
+- ``cold_ms``: first run, including imports and store/cache warm-up
+- ``warm_ms``: median of the following reruns
+- ``peak_rss_mb``: peak resident memory of the worker process
+- ``figures`` and ``figure_bytes``: Plotly charts and their JSON spec size
+
+Usage::
+
+    python -m benchmarks.page_benchmark --scales small medium --output results.json
+    python -m benchmarks.page_benchmark --save-baseline
+    python -m benchmarks.page_benchmark --baseline benchmarks/baseline.json
+
+With ``--baseline`` each metric is compared against the stored run and the
+command exits non-zero when any page regressed by more than
+``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+WORK_DIR = APP_ROOT / ".benchmarks"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Days of daily traffic and conversions history per scale
+SCALES = {
+    "small": 365,
+    "medium": 5 * 365,
+    "large": 20 * 365,
+}
+
+WARM_RUNS = 5
+DEFAULT_TOLERANCE = 0.25
+# Metrics where a larger value is a regression
+COMPARED_METRICS = ["cold_ms", "warm_ms", "peak_rss_mb", "figure_bytes"]
+
+
+def page_scripts():
+    return [APP_ROOT / "app.py"] + sorted((APP_ROOT / "pages").glob("*.py"))
+
+
+def data_dir(scale):
+    return WORK_DIR / f"data-{scale}"
+
+
+def seed_scaled_store(scale):
+    """Write the sample datasets with ``SCALES[scale]`` days of history."""
+    from utils.data_store import MetricsStore
+    from utils.sample_data import (
+        SAMPLE_DATASETS, build_conversions, build_crm_leads, build_marketing, build_traffic, build_webinar_registrations,
+        build_webinars
+    )
+
+    store = MetricsStore(data_dir(scale))
+    if all(store.has(name) for name in SAMPLE_DATASETS):
+        return store
+
+    start = date.today() - timedelta(days=SCALES[scale] - 1)
+    scaled = {
+        "traffic": lambda: build_traffic(start=start),
+        "conversions": lambda: build_conversions(start=start),
+        "marketing": lambda: build_marketing(start=start),
+        "webinars": lambda: build_webinars(start=start),
+        "webinar_registrations": lambda: build_webinar_registrations(start=start),
+        "crm_leads": lambda: build_crm_leads(start=start),
+    }
+    for name, (builder, date_column) in SAMPLE_DATASETS.items():
+        store.write(name, scaled.get(name, builder)(), date_column=date_column, mode="overwrite")
+    return store
+
+
+def _figures(app):
+    specs = [element.proto.spec for element in app.get("plotly_chart")]
+    return len(specs), sum(len(spec.encode()) for spec in specs)
+
+
+def measure_page(script, warm_runs=WARM_RUNS):
+    """Run ``script`` in this process and return its measurements."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(script), default_timeout=300)
+    started = time.perf_counter()
+    app.run()
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    warm = []
+    for _ in range(warm_runs):
+        started = time.perf_counter()
+        app.run()
+        warm.append((time.perf_counter() - started) * 1000)
+
+    figures, figure_bytes = _figures(app)
+    return {
+        "cold_ms": round(cold_ms, 1),
+        "warm_ms": round(statistics.median(warm), 1) if warm else None,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "figures": figures,
+        "figure_bytes": figure_bytes,
+        "exceptions": [str(e.value) for e in app.exception],
+    }
+
+
+def run_worker(script, scale, warm_runs):
+    """Measure one page in a fresh interpreter so cold numbers are cold."""
+    env = dict(os.environ, VERATHON_DATA_DIR=str(data_dir(scale)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(APP_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.page_benchmark", "--worker", str(script),
+         "--warm-runs", str(warm_runs)],
+        cwd=APP_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "worker failed"}
+    # Streamlit may log to stdout; the measurement is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_suite(scales, pages=None, warm_runs=WARM_RUNS):
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "warm_runs": warm_runs,
+        "scales": {},
+    }
+    for scale in scales:
+        seed_scaled_store(scale)
+        results["scales"][scale] = {
+            script.name: run_worker(script, scale, warm_runs) for script in (pages or page_scripts())
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Per page and metric ratio to the baseline, with regressions listed.
+
+    A page that fails or raises exceptions the baseline run didn't is a
+    regression however fast it rendered; its timings aren't compared.
+    """
+    comparison, regressions = {}, []
+    for scale, pages in results["scales"].items():
+        for page, metrics in pages.items():
+            before = baseline.get("scales", {}).get(scale, {}).get(page)
+            if not before:
+                continue
+            if "error" in metrics and "error" not in before:
+                regressions.append(f"{scale}/{page}: failed ({metrics['error']})")
+                continue
+            if "error" in metrics or "error" in before:
+                continue
+            new_exceptions = [e for e in metrics.get("exceptions", []) if e not in before.get("exceptions", [])]
+            if new_exceptions:
+                regressions.append(f"{scale}/{page}: new exceptions {new_exceptions}")
+                continue
+            for metric in COMPARED_METRICS:
+                if not before.get(metric) or metrics.get(metric) is None:
+                    continue
+                ratio = round(metrics[metric] / before[metric], 3)
+                comparison.setdefault(scale, {}).setdefault(page, {})[metric] = ratio
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{scale}/{page}: {metric} x{ratio}")
+    return comparison, regressions
+
+
+def _print_table(results):
+    for scale, pages in results["scales"].items():
+        print(f"\n[{scale}] {SCALES[scale]} days of traffic")
+        print(f"{'page':<40}{'cold ms':>10}{'warm ms':>10}{'rss MB':>9}{'figs':>6}{'fig KB':>9}")
+        for page, m in pages.items():
+            if "error" in m:
+                print(f"{page:<40}  error: {m['error']}")
+                continue
+            print(f"{page:<40}{m['cold_ms']:>10}{m['warm_ms']:>10}{m['peak_rss_mb']:>9}"
+                  f"{m['figures']:>6}{m['figure_bytes'] / 1024:>9.1f}"
+                  + (f"  ({len(m['exceptions'])} exceptions)" if m["exceptions"] else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard page headlessly.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--pages", nargs="+", help="Page scripts to run (default: all)")
+    parser.add_argument("--warm-runs", type=int, default=WARM_RUNS)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this stored results file")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE),
+                        help=f"Store the results as the baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown before a metric counts as regressed")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure_page(Path(args.worker).resolve(), args.warm_runs)))
+        return 0
+
+    pages = [Path(p).resolve() for p in args.pages] if args.pages else None
+    results = run_suite(args.scales, pages, args.warm_runs)
+    _print_table(results)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        results["comparison"], regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = 1 if regressions else 0
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
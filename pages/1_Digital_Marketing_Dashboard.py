@@ -3,20 +3,34 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+from utils.downsample import downsample
+from utils.lazy import is_open, lazy_expander, lazy_tabs
+from utils.paginated_table import frame_source, paginated_table
+from utils.profiling import profile_page
+from utils.queries import (
+    CAMPAIGNS, MARKETING_DIMENSIONS, TIME_PERIODS, conversion_funnel, daily_anomalies, data_through, kpi_totals,
+    landing_page_stats, marketing_cube, period_bounds
+)
+from utils.table_format import column_config
 
 # Page configuration
 st.set_page_config(page_title="Digital Marketing Dashboard", page_icon="📊", layout="wide")
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("Digital Marketing Dashboard")
+
 # Dashboard title
 st.title("Digital Marketing Dashboard")
 
 # Time period filter
 time_period = st.selectbox(
     "Select Time Period",
-    ["Last 7 Days", "Last 30 Days", "Last Quarter", "Year to Date", "Custom"]
+    TIME_PERIODS
 )
 
+start_date = end_date = None
 if time_period == "Custom":
     col1, col2 = st.columns(2)
     with col1:
@@ -24,256 +38,350 @@ if time_period == "Custom":
     with col2:
         end_date = st.date_input("End Date", datetime.now())
 
-# Main dashboard layout
-top_kpi_col1, top_kpi_col2, top_kpi_col3, top_kpi_col4 = st.columns(4)
+# Relative periods end on the last day with data, which trails today when the store isn't fed daily
+period_start, period_end = period_bounds(time_period, data_through(date.today()), start_date, end_date)
+period_days = (period_end - period_start).days + 1
 
-# Sample KPI metrics
-with top_kpi_col1:
-    st.metric(label="Website Visitors", value="24,589", delta="12.7%")
-    
-with top_kpi_col2:
-    st.metric(label="Conversion Rate", value="3.2%", delta="0.5%")
-    
-with top_kpi_col3:
-    st.metric(label="MQLs", value="583", delta="-2.1%", delta_color="inverse")
-    
-with top_kpi_col4:
-    st.metric(label="Cost per MQL", value="$42.18", delta="-8.3%", delta_color="inverse")
+# Seconds between refreshes of the KPI tiles
+KPI_REFRESH_SECONDS = 60
 
-# Tabs for different sections
-tab1, tab2, tab3, tab4 = st.tabs(["Traffic Analytics", "Conversion Funnel", "Channel Effectiveness", "Campaign Performance"])
 
-with tab1:
-    st.subheader("Traffic Source Analysis")
+@st.fragment(run_every=KPI_REFRESH_SECONDS)
+def kpi_tiles(time_period, start_date, end_date):
+    # Reruns on its own timer without the rest of the page; the counters
+    # behind kpi_totals only read what changed since the last refresh
+    last_day = data_through(date.today())
+    period_start, period_end = period_bounds(time_period, last_day, start_date, end_date)
     
-    # Sample data for traffic sources
-    source_data = pd.DataFrame({
-        'Date': pd.date_range(start='2024-01-01', periods=90, freq='D'),
-        'Organic Search': np.random.randint(500, 1500, 90),
-        'Direct': np.random.randint(300, 800, 90),
-        'Referral': np.random.randint(200, 600, 90),
-        'Social Media': np.random.randint(100, 400, 90),
-        'Email': np.random.randint(50, 250, 90),
-        'Paid Search': np.random.randint(150, 500, 90)
-    })
+    # Same-length period immediately before the selection, for the KPI deltas
+    period_days = (period_end - period_start).days + 1
+    previous_end = period_start - timedelta(days=1)
+    previous_start = previous_end - timedelta(days=period_days - 1)
     
-    fig = px.line(
-        source_data, 
-        x='Date', 
-        y=['Organic Search', 'Direct', 'Referral', 'Social Media', 'Email', 'Paid Search'],
-        title='Daily Traffic by Source'
-    )
+    kpis = kpi_totals(period_start, period_end)
+    previous_kpis = kpi_totals(previous_start, previous_end)
     
-    fig.update_layout(
-        xaxis_title='Date',
-        yaxis_title='Visitors',
-        legend_title='Source',
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    def pct_change(key):
+        previous = previous_kpis[key]
+        return f"{(kpis[key] - previous) / previous * 100:.1f}%" if previous else None
     
-    col1, col2 = st.columns(2)
+    top_kpi_col1, top_kpi_col2, top_kpi_col3, top_kpi_col4 = st.columns(4)
     
-    with col1:
-        st.subheader("Top Landing Pages")
-        landing_pages = pd.DataFrame({
-            'Page': [
-                '/products/new-device', 
-                '/solutions/healthcare', 
-                '/blog/medical-innovation',
-                '/about-verathon',
-                '/contact'
-            ],
-            'Visitors': [3245, 2891, 1654, 1432, 987],
-            'Bounce Rate': [32.4, 28.7, 45.2, 39.1, 22.8]
-        })
-        
-        st.dataframe(landing_pages, hide_index=True, use_container_width=True)
+    with top_kpi_col1:
+        st.metric(label="Website Visitors", value=f"{kpis['Visitors']:,.0f}", delta=pct_change('Visitors'))
+        
+    with top_kpi_col2:
+        st.metric(
+            label="Conversion Rate",
+            value=f"{kpis['Conversion Rate']:.1f}%",
+            # A change of a rate, so in percentage points rather than percent
+            delta=f"{kpis['Conversion Rate'] - previous_kpis['Conversion Rate']:.1f} pp"
+        )
+        
+    with top_kpi_col3:
+        st.metric(label="MQLs", value=f"{kpis['MQLs']:,.0f}", delta=pct_change('MQLs'))
+        
+    with top_kpi_col4:
+        st.metric(label="Cost per MQL", value=f"${kpis['Cost per MQL']:,.2f}", delta=pct_change('Cost per MQL'), delta_color="inverse")
     
-    with col2:
-        st.subheader("Geographic Distribution")
-        geo_data = pd.DataFrame({
-            'Country': ['United States', 'Canada', 'United Kingdom', 'Germany', 'Australia', 'France', 'Japan', 'Other'],
-            'Visitors': [12453, 3245, 2876, 1765, 1342, 876, 765, 1267]
-        })
-        
-        fig = px.pie(
-            geo_data, 
-            values='Visitors', 
-            names='Country',
-            title='Visitors by Country'
+    data_note = f" · data through {last_day:%b %d, %Y}" if last_day < date.today() else ""
+    st.caption(f"KPIs updated {datetime.now():%H:%M:%S}{data_note}")
+
+
+# Main dashboard layout
+kpi_tiles(time_period, start_date, end_date)
+
+# Cross-filters for the traffic, channel and campaign views, which are all
+# slices of the same in-memory cube
+cube = marketing_cube()
+filter_cols = st.columns(len(MARKETING_DIMENSIONS))
+cube_filters = {}
+for filter_col, dimension in zip(filter_cols, MARKETING_DIMENSIONS):
+    with filter_col:
+        cube_filters[dimension] = st.multiselect(dimension, cube.labels[dimension], key=f"cube_{dimension}")
+cube_slice = dict(start=period_start, end=period_end, **cube_filters)
+
+# Tabs for different sections; only the selected one is computed on a rerun
+tab1, tab2, tab3, tab4 = lazy_tabs(
+    ["Traffic Analytics", "Conversion Funnel", "Channel Effectiveness", "Campaign Performance"], key='marketing_tabs'
+)
+
+with tab1:
+    if is_open(tab1):
+        st.subheader("Traffic Source Analysis")
+        
+        # Daily traffic by source for the selected period
+        source_data = cube.rollup(['Date', 'Channel'], ['Visitors'], **cube_slice)
+        
+        # At most one point per pixel of the chart width per source
+        source_points = downsample(source_data, 'Date', 'Visitors', color='Channel')
+        
+        fig = px.line(
+            source_points, 
+            x='Date', 
+            y='Visitors',
+            color='Channel',
+            title='Daily Traffic by Source'
+        )
+        
+        # Anomalous days in the selected period, across every monitored series
+        anomalies = daily_anomalies()
+        anomalies = anomalies[
+            (anomalies['Date'] >= pd.Timestamp(period_start)) & (anomalies['Date'] <= pd.Timestamp(period_end))
+        ]
+        
+        # Flags are computed on whole-source traffic, so they only line up with
+        # the chart while it is not narrowed by device, country or campaign
+        if not any(cube_filters[dimension] for dimension in ['Device', 'Country', 'Campaign']):
+            traffic_anomalies = anomalies[anomalies['Group'] == 'Traffic']
+            if cube_filters['Channel']:
+                traffic_anomalies = traffic_anomalies[traffic_anomalies['Series'].isin(cube_filters['Channel'])]
+            fig.add_trace(go.Scatter(
+                x=traffic_anomalies['Date'],
+                y=traffic_anomalies['Value'],
+                mode='markers',
+                name='Anomaly',
+                marker=dict(color='red', size=10, symbol='x'),
+                customdata=traffic_anomalies[['Series', 'Baseline', 'Z']],
+                hovertemplate='%{customdata[0]}: %{y:,.0f} (expected %{customdata[1]:,.0f}, z=%{customdata[2]})<extra></extra>'
+            ))
+        
+        fig.update_layout(
+            xaxis_title='Date',
+            yaxis_title='Visitors',
+            legend_title='Source',
+            height=500
         )
         
         st.plotly_chart(fig, use_container_width=True)
+        
+        anomaly_expander = lazy_expander(f"Anomalies in this period ({len(anomalies)})", key='anomalies')
+        with anomaly_expander:
+            if is_open(anomaly_expander):
+                st.dataframe(
+                    anomalies,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config=column_config({'Value': 'number', 'Baseline': 'number', 'Z': 'number'})
+                )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Top Landing Pages")
+            # Sessionized pageviews for the selected period
+            landing_pages = landing_page_stats(period_start, period_end)
+            
+            paginated_table(
+                frame_source(landing_pages, 'landing_pages'),
+                key='landing_pages',
+                page_size=10,
+                default_sort='Sessions',
+                descending=True,
+                hide_index=True,
+                use_container_width=True,
+                column_config=column_config({
+                    'Sessions': 'integer',
+                    'Bounce Rate': 'percent',
+                    'Pages / Session': 'number',
+                    'Avg. Duration (s)': 'integer'
+                })
+            )
+        
+        with col2:
+            st.subheader("Geographic Distribution")
+            geo_data = cube.rollup('Country', ['Visitors'], **cube_slice)
+            
+            fig = px.pie(
+                geo_data, 
+                values='Visitors', 
+                names='Country',
+                title='Visitors by Country'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
 
 with tab2:
-    st.subheader("Marketing Funnel Analysis")
-    
-    funnel_stages = ['Website Visitors', 'Product Page Views', 'Form Fills', 'MQLs', 'SQLs', 'Opportunities', 'Closed Won']
-    funnel_values = [24589, 12345, 2468, 583, 291, 87, 32]
-    
-    fig = go.Figure(go.Funnel(
-        y=funnel_stages,
-        x=funnel_values,
-        textinfo="value+percent initial",
-        marker={"color": ["#0056A7", "#1268B9", "#247ACC", "#368CDE", "#489EF1", "#5AB0FF", "#6BC2FF"]}
-    ))
-    
-    fig.update_layout(
-        title="Marketing Conversion Funnel",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Conversion by Device")
+    if is_open(tab2):
+        st.subheader("Marketing Funnel Analysis")
         
-        device_data = pd.DataFrame({
-            'Device': ['Desktop', 'Mobile', 'Tablet'],
-            'Visitors': [14753, 8234, 1602],
-            'Conversions': [442, 123, 18],
-            'Rate': [3.0, 1.5, 1.1]
-        })
+        # Funnel slicers; changing them only re-sums the precomputed funnel
+        window_col, device_col, channel_col, campaign_col = st.columns(4)
+        with window_col:
+            window_days = st.selectbox("Conversion Window", [30, 60, 90, 180], index=2, format_func=lambda d: f"{d} days")
         
-        device_data['Rate'] = device_data['Rate'].astype(str) + '%'
-        st.dataframe(device_data, hide_index=True, use_container_width=True)
-    
-    with col2:
-        st.subheader("Form Completion Analysis")
+        funnel = conversion_funnel(window_days)
+        with device_col:
+            devices = st.multiselect("Device", funnel.labels['Device'])
+        with channel_col:
+            channels = st.multiselect("Channel", funnel.labels['Channel'])
+        with campaign_col:
+            campaigns = st.multiselect("Campaign", funnel.labels['Campaign'])
+        funnel_filters = {'Device': devices, 'Channel': channels, 'Campaign': campaigns}
+        
+        funnel_stages = funnel.stages
+        funnel_values = funnel.counts(**funnel_filters)
+        
+        fig = go.Figure(go.Funnel(
+            y=funnel_stages,
+            x=funnel_values,
+            textinfo="value+percent initial",
+            marker={"color": ["#0056A7", "#1268B9", "#247ACC", "#368CDE", "#489EF1", "#5AB0FF", "#6BC2FF"]}
+        ))
+        
+        fig.update_layout(
+            title="Marketing Conversion Funnel",
+            height=500
+        )
         
-        form_data = pd.DataFrame({
-            'Form': ['Contact Us', 'Product Demo', 'Whitepaper Download', 'Newsletter Signup'],
-            'Starts': [1245, 876, 654, 432],
-            'Completions': [623, 438, 523, 389],
-            'Rate': [50.0, 50.0, 79.9, 90.0]
-        })
+        st.plotly_chart(fig, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Conversion by Device")
+            
+            # Conversions are MQLs, within the other funnel slicers
+            by_device = funnel.breakdown('Device', **dict(funnel_filters, Device=None))
+            device_data = pd.DataFrame({
+                'Device': by_device.index,
+                'Visitors': by_device['Website Visitors'].to_numpy(),
+                'Conversions': by_device['MQLs'].to_numpy()
+            })
+            device_data['Rate'] = (device_data['Conversions'] / device_data['Visitors'].where(device_data['Visitors'] > 0) * 100).round(1)
+            
+            st.dataframe(
+                device_data,
+                hide_index=True,
+                use_container_width=True,
+                column_config=column_config({'Visitors': 'integer', 'Conversions': 'integer', 'Rate': 'percent'})
+            )
         
-        form_data['Rate'] = form_data['Rate'].astype(str) + '%'
-        st.dataframe(form_data, hide_index=True, use_container_width=True)
+        with col2:
+            st.subheader("Form Completion Analysis")
+            
+            form_data = pd.DataFrame({
+                'Form': ['Contact Us', 'Product Demo', 'Whitepaper Download', 'Newsletter Signup'],
+                'Starts': [1245, 876, 654, 432],
+                'Completions': [623, 438, 523, 389],
+                'Rate': [50.0, 50.0, 79.9, 90.0]
+            })
+            
+            form_data['Rate'] = form_data['Rate'].astype(str) + '%'
+            st.dataframe(form_data, hide_index=True, use_container_width=True)
 
 with tab3:
-    st.subheader("Channel Performance Analysis")
-    
-    channel_data = pd.DataFrame({
-        'Channel': ['Organic Search', 'Paid Search', 'Email', 'Social Media', 'Direct', 'Referral'],
-        'Visitors': [10234, 5621, 2145, 3256, 2568, 765],
-        'MQLs': [256, 183, 72, 43, 23, 6],
-        'Conv. Rate': [2.5, 3.2, 3.4, 1.3, 0.9, 0.8],
-        'Cost': [0, 15432, 5400, 7200, 0, 800],
-        'CPL': [0, 84.33, 75.00, 167.44, 0, 133.33]
-    })
-    
-    fig = px.bar(
-        channel_data,
-        x='Channel',
-        y=['Visitors', 'MQLs'],
-        barmode='group',
-        title='Traffic and Leads by Channel',
-        labels={'value': 'Count', 'variable': 'Metric'}
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
+    if is_open(tab3):
+        st.subheader("Channel Performance Analysis")
+        
+        channel_data = cube.rollup('Channel', ['Visitors', 'MQLs', 'Spend'], **cube_slice).rename(columns={'Spend': 'Cost'})
+        channel_data['Conv. Rate'] = (channel_data['MQLs'] / channel_data['Visitors'].where(channel_data['Visitors'] > 0) * 100).round(1)
+        channel_data['CPL'] = (channel_data['Cost'] / channel_data['MQLs'].where(channel_data['MQLs'] > 0)).round(2)
+        
         fig = px.bar(
             channel_data,
             x='Channel',
-            y='Conv. Rate',
-            title='Conversion Rate by Channel (%)',
-            color='Channel',
-            labels={'Conv. Rate': 'Conversion Rate (%)'}
+            y=['Visitors', 'MQLs'],
+            barmode='group',
+            title='Traffic and Leads by Channel',
+            labels={'value': 'Count', 'variable': 'Metric'}
         )
         
-        fig.update_layout(showlegend=False)
         st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        # Filter out channels with zero cost
-        cost_data = channel_data[channel_data['Cost'] > 0]
         
-        fig = px.bar(
-            cost_data,
-            x='Channel',
-            y='CPL',
-            title='Cost per Lead by Channel ($)',
-            color='Channel',
-            labels={'CPL': 'Cost per Lead ($)'}
-        )
+        col1, col2 = st.columns(2)
         
-        fig.update_layout(showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            fig = px.bar(
+                channel_data,
+                x='Channel',
+                y='Conv. Rate',
+                title='Conversion Rate by Channel (%)',
+                color='Channel',
+                labels={'Conv. Rate': 'Conversion Rate (%)'}
+            )
+            
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            # Filter out channels with zero cost
+            cost_data = channel_data[channel_data['Cost'] > 0]
+            
+            fig = px.bar(
+                cost_data,
+                x='Channel',
+                y='CPL',
+                title='Cost per Lead by Channel ($)',
+                color='Channel',
+                labels={'CPL': 'Cost per Lead ($)'}
+            )
+            
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
 
 with tab4:
-    st.subheader("Campaign Performance Metrics")
-    
-    campaign_data = pd.DataFrame({
-        'Campaign': [
-            'New Product Launch', 
-            'Healthcare Conference', 
-            'Q1 Email Nurture', 
-            'Retargeting Ads',
-            'Medical Blog Promotion', 
-            'Partner Webinar'
-        ],
-        'Status': ['Active', 'Completed', 'Active', 'Active', 'Paused', 'Completed'],
-        'Budget': [25000, 15000, 5000, 10000, 3000, 2000],
-        'Spend': [12500, 15000, 3750, 8000, 1500, 2000],
-        'Leads': [145, 87, 62, 93, 18, 32],
-        'Opportunities': [12, 8, 5, 7, 1, 3],
-        'Revenue': [180000, 120000, 75000, 95000, 15000, 40000],
-        'ROI': [14.4, 8.0, 20.0, 11.9, 10.0, 20.0]
-    })
-    
-    campaign_data['Spend %'] = (campaign_data['Spend'] / campaign_data['Budget'] * 100).round(1)
-    campaign_data['CPL'] = (campaign_data['Spend'] / campaign_data['Leads']).round(2)
-    campaign_data['ROI'] = campaign_data['ROI'].astype(str) + 'x'
-    
-    # Format columns for display
-    display_data = campaign_data.copy()
-    display_data['Budget'] = display_data['Budget'].apply(lambda x: f"${x:,}")
-    display_data['Spend'] = display_data['Spend'].apply(lambda x: f"${x:,}")
-    display_data['Revenue'] = display_data['Revenue'].apply(lambda x: f"${x:,}")
-    display_data['Spend %'] = display_data['Spend %'].astype(str) + '%'
-    display_data['CPL'] = display_data['CPL'].apply(lambda x: f"${x}")
-    
-    st.dataframe(display_data, hide_index=True, use_container_width=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        fig = px.bar(
-            campaign_data,
-            x='Campaign',
-            y='Leads',
-            color='Status',
-            title='Leads Generated by Campaign',
-            labels={'Leads': 'Number of Leads'}
-        )
+    if is_open(tab4):
+        st.subheader("Campaign Performance Metrics")
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        fig = px.scatter(
-            campaign_data,
-            x='Spend',
-            y='Revenue',
-            size='Leads',
-            color='Campaign',
-            title='Campaign ROI Analysis',
-            labels={
-                'Spend': 'Total Spend ($)',
-                'Revenue': 'Revenue Generated ($)',
-                'Leads': 'Number of Leads'
-            }
+        campaign_data = cube.rollup('Campaign', ['Spend', 'MQLs', 'Opportunities', 'Revenue'], **cube_slice)
+        campaign_data = campaign_data[campaign_data['Campaign'].isin(list(CAMPAIGNS))].rename(columns={'MQLs': 'Leads'})
+        campaign_data.insert(1, 'Status', campaign_data['Campaign'].map(lambda c: CAMPAIGNS[c][0]))
+        # Monthly budgets pro-rated to the selected period
+        campaign_data.insert(2, 'Budget', campaign_data['Campaign'].map(lambda c: CAMPAIGNS[c][1] * period_days * 12 / 365).round(0))
+        campaign_data['ROI'] = (campaign_data['Revenue'] / campaign_data['Spend'].where(campaign_data['Spend'] > 0)).round(1)
+        
+        campaign_data['Spend %'] = (campaign_data['Spend'] / campaign_data['Budget'] * 100).round(1)
+        campaign_data['CPL'] = (campaign_data['Spend'] / campaign_data['Leads'].where(campaign_data['Leads'] > 0)).round(2)
+        
+        # Columns stay numeric (and sortable); display formats live in the column config
+        paginated_table(
+            frame_source(campaign_data, 'campaigns'),
+            key='campaigns',
+            filter_options={'Status': ['Active', 'Paused', 'Completed']},
+            search_column='Campaign',
+            hide_index=True,
+            use_container_width=True,
+            column_config=column_config({
+                'Budget': 'currency',
+                'Spend': 'currency',
+                'Revenue': 'currency',
+                'ROI': ('multiplier', 1),
+                'Spend %': 'percent',
+                'CPL': ('currency', 2)
+            })
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig = px.bar(
+                campaign_data,
+                x='Campaign',
+                y='Leads',
+                color='Status',
+                title='Leads Generated by Campaign',
+                labels={'Leads': 'Number of Leads'}
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = px.scatter(
+                campaign_data,
+                x='Spend',
+                y='Revenue',
+                size='Leads',
+                color='Campaign',
+                title='Campaign ROI Analysis',
+                labels={
+                    'Spend': 'Total Spend ($)',
+                    'Revenue': 'Revenue Generated ($)',
+                    'Leads': 'Number of Leads'
+                }
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
 
 # Digital Marketing Maturity Framework section
 st.markdown("---")
@@ -365,3 +473,5 @@ with col2:
     st.info("1. Implement marketing automation for email nurture campaigns")
     st.info("2. Develop basic lead scoring model based on website behavior")
     st.info("3. Enhance content strategy with persona-specific content")
+
+profiler.finish()
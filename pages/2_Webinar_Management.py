@@ -3,11 +3,25 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+from utils.forecast import PACE_STATUSES
+from utils.lazy import is_open, lazy_expander, lazy_tabs
+from utils.paginated_table import frame_source, paginated_table
+from utils.profiling import profile_page
+from utils.queries import (
+    live_webinar_monitor, registration_curves, webinar_aggregates, webinar_catalog, webinar_lead_funnel,
+    webinar_trends
+)
+from utils.table_format import STATUS_COLORS, colored_dataframe, column_config
+from utils.trends import TREND_GROUP_COLUMNS
 
 # Page configuration
 st.set_page_config(page_title="Webinar Management", page_icon="🎥", layout="wide")
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("Webinar Management")
+
 # Dashboard title
 st.title("Webinar Management Dashboard")
 
@@ -33,6 +47,39 @@ with col3:
         default=["Product Demo", "Thought Leadership", "Educational"]
     )
 
+today = date.today()
+catalog = webinar_catalog(today)
+
+col4, col5 = st.columns(2)
+
+with col4:
+    regions = st.multiselect("Region", catalog.values('Region'))
+
+with col5:
+    product_lines = st.multiselect("Product Line", catalog.values('Product Line'))
+
+# Date range bounds the webinar date from below, so upcoming webinars always pass
+range_days = {"Last 30 Days": 30, "Last Quarter": 91, "Last 6 Months": 182}
+if date_range in range_days:
+    range_start = today - timedelta(days=range_days[date_range])
+elif date_range == "Year to Date":
+    range_start = today.replace(month=1, day=1)
+else:
+    range_start = None
+
+# Empty multiselects mean no restriction
+webinar_filters = {
+    'Type': webinar_type or None,
+    'Region': regions or None,
+    'Product Line': product_lines or None
+}
+
+
+def filtered_webinars(status):
+    # Webinars of one status within the filters; none when the status filter excludes it
+    statuses = [status] if webinar_status in ("All", status) else []
+    return catalog.select(start=range_start, Status=statuses, **webinar_filters)
+
 # Webinar program KPIs
 st.markdown("### Webinar Program KPIs")
 kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
@@ -52,374 +99,439 @@ with kpi4:
 with kpi5:
     st.metric(label="Cost per Lead", value="$42.18", delta="-5.3%", delta_color="inverse")
 
-# Tabs for different sections
-tab1, tab2, tab3 = st.tabs(["Webinar Overview", "Performance Analysis", "Maturity Framework"])
+# Seconds between ticks of the live webinar panel
+LIVE_REFRESH_SECONDS = 2
 
-with tab1:
-    # Upcoming webinars
-    st.subheader("Upcoming Webinars")
-    
-    upcoming_webinars = pd.DataFrame({
-        'Webinar Name': [
-            'New Product Launch: XYZ Medical Device', 
-            'Healthcare Trends 2024', 
-            'Regulatory Compliance Update', 
-            'Customer Success Story: Memorial Hospital'
-        ],
-        'Date': ['May 15, 2024', 'June 2, 2024', 'June 18, 2024', 'July 10, 2024'],
-        'Type': ['Product Demo', 'Thought Leadership', 'Educational', 'Customer Stories'],
-        'Current Registrations': [124, 87, 45, 12],
-        'Registration Goal': [200, 150, 100, 50],
-        'Status': ['On Track', 'Needs Attention', 'At Risk', 'Just Announced']
-    })
-    
-    # Function to style the dataframe
-    def highlight_status(val):
-        if val == 'On Track':
-            return 'background-color: #d4edda; color: #155724'
-        elif val == 'Needs Attention':
-            return 'background-color: #fff3cd; color: #856404'
-        elif val == 'At Risk':
-            return 'background-color: #f8d7da; color: #721c24'
-        else:
-            return 'background-color: #d1ecf1; color: #0c5460'
-    
-    st.dataframe(upcoming_webinars.style.applymap(highlight_status, subset=['Status']), hide_index=True, use_container_width=True)
-    
-    # Past webinars performance
-    st.subheader("Recent Webinar Performance")
-    
-    past_webinars = pd.DataFrame({
-        'Webinar Name': [
-            'Medical Device Innovations', 
-            'Healthcare Marketing Strategies', 
-            'Patient Engagement Solutions', 
-            'Digital Transformation in Healthcare',
-            'Supply Chain Optimization'
-        ],
-        'Date': ['Apr 12, 2024', 'Mar 28, 2024', 'Mar 15, 2024', 'Feb 22, 2024', 'Feb 8, 2024'],
-        'Registrations': [187, 212, 156, 198, 142],
-        'Attendees': [92, 96, 74, 82, 61],
-        'Attendance Rate': ['49%', '45%', '47%', '41%', '43%'],
-        'MQLs Generated': [34, 42, 28, 36, 22],
-        'MQL Conversion': ['18.2%', '19.8%', '17.9%', '18.2%', '15.5%']
-    })
-    
-    st.dataframe(past_webinars, hide_index=True, use_container_width=True)
-    
-    # Registration trends chart
-    st.subheader("Registration Trends")
-    
-    # Sample data for trends
-    trend_data = pd.DataFrame({
-        'Date': pd.date_range(start='2024-01-01', periods=16, freq='W'),
-        'Registrations': [87, 95, 82, 78, 92, 110, 105, 112, 128, 145, 132, 156, 187, 212, 198, 124],
-        'Attendees': [38, 42, 35, 36, 44, 52, 49, 48, 58, 63, 57, 72, 92, 96, 82, 0]
-    })
-    
-    # Add moving averages
-    trend_data['Reg_4W_Avg'] = trend_data['Registrations'].rolling(window=4).mean()
-    trend_data['Att_4W_Avg'] = trend_data['Attendees'].rolling(window=4).mean()
-    
-    fig = px.line(
-        trend_data, 
-        x='Date', 
-        y=['Registrations', 'Attendees', 'Reg_4W_Avg', 'Att_4W_Avg'],
-        title='Webinar Registration and Attendance Trends',
-        labels={'value': 'Count', 'variable': 'Metric'},
-        line_shape='spline'
-    )
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_webinars():
+    # Reruns on its own timer without the rest of the page; the monitor is
+    # shared by every session and polls its feed at most once per interval
+    monitor = live_webinar_monitor(today)
+    counters = monitor.tick()
+    updated_at = monitor.updated_at
+    
+    # Deltas are against the counters this session saw at the poll before
+    seen_at, seen, previous = st.session_state.get('live_counters', (None, counters, counters))
+    if seen_at != updated_at:
+        previous = seen
+        st.session_state['live_counters'] = (updated_at, counters, previous)
+    previous = previous.reindex(counters.index, fill_value=0)
+    
+    if counters.empty:
+        st.info("No webinars in progress.")
+        return
+    
+    names = catalog.frame.set_index('Webinar ID')['Webinar Name']
+    for webinar_id, live in counters.iterrows():
+        st.markdown(f"**{names.get(webinar_id, webinar_id)}**")
+        live1, live2, live3, live4, live5 = st.columns(5)
+        
+        with live1:
+            st.metric(label="Attending Now", value=f"{live['Attending']:,}", delta=int(live['Attending'] - previous.at[webinar_id, 'Attending']))
+        
+        with live2:
+            st.metric(label="Peak Attendance", value=f"{live['Peak']:,}")
+        
+        with live3:
+            st.metric(label="Joined", value=f"{live['Joined']:,}")
+        
+        with live4:
+            st.metric(label="Poll Responses", value=f"{live['Poll Responses']:,}", delta=int(live['Poll Responses'] - previous.at[webinar_id, 'Poll Responses']))
+        
+        with live5:
+            st.metric(label="Questions", value=f"{live['Questions']:,}", delta=int(live['Questions'] - previous.at[webinar_id, 'Questions']))
     
-    fig.update_layout(height=500)
+    history = monitor.history()
+    history['Webinar'] = history['Webinar ID'].map(names).fillna(history['Webinar ID'])
+    fig = px.line(history, x='Timestamp', y='Attending', color='Webinar', title='Attendance Since the Monitor Started')
+    fig.update_layout(height=300, legend_title_text='')
     st.plotly_chart(fig, use_container_width=True)
-
-with tab2:
-    col1, col2 = st.columns(2)
     
-    with col1:
-        st.subheader("Registration by Webinar Type")
+    st.caption(f"{monitor.source} · updated {updated_at:%H:%M:%S}")
+
+
+# Webinars running now, from the live attendee event feed
+if webinar_status in ("All", "In Progress"):
+    st.markdown("### Live Webinars")
+    live_webinars()
+
+# Tabs for different sections; only the selected one is computed on a rerun
+tab1, tab2, tab3 = lazy_tabs(["Webinar Overview", "Performance Analysis", "Maturity Framework"], key='webinar_tabs')
+
+with tab1:
+    if is_open(tab1):
+        # Upcoming webinars
+        st.subheader("Upcoming Webinars")
         
-        type_data = pd.DataFrame({
-            'Type': ['Product Demo', 'Thought Leadership', 'Educational', 'Customer Stories', 'Partner Webinars'],
-            'Registrations': [1245, 876, 654, 321, 160],
-            'Avg per Webinar': [155.6, 146.0, 109.0, 80.3, 53.3]
+        # Final registrations projected from the typical curve of past webinars; the status compares them with the goal
+        upcoming = filtered_webinars("Upcoming")
+        forecast = registration_curves(today).project(upcoming, today)
+        upcoming_webinars = pd.DataFrame({
+            'Webinar Name': upcoming['Webinar Name'],
+            'Date': upcoming['Date'],
+            'Type': upcoming['Type'],
+            'Region': upcoming['Region'],
+            'Current Registrations': upcoming['Registrations'],
+            'Projected Registrations': forecast['Projected Registrations'],
+            'Registration Goal': upcoming['Registration Goal'],
+            'Status': forecast['Status']
         })
         
-        fig = px.bar(
-            type_data,
-            x='Type',
-            y='Registrations',
-            color='Type',
-            title='Total Registrations by Webinar Type',
-            text='Registrations'
+        # Status colors, rendered as tags by the table
+        status_colors = {
+            'On Track': STATUS_COLORS['good'],
+            'Needs Attention': STATUS_COLORS['warning'],
+            'At Risk': STATUS_COLORS['bad'],
+            'Just Announced': STATUS_COLORS['info']
+        }
+        
+        paginated_table(
+            frame_source(upcoming_webinars, 'upcoming_webinars'),
+            key='upcoming_webinars',
+            filter_options={
+                'Type': catalog.values('Type'),
+                'Status': PACE_STATUSES
+            },
+            default_sort='Date',
+            colors={'Status': status_colors},
+            hide_index=True,
+            use_container_width=True,
+            column_config={'Date': st.column_config.DateColumn(format='MMM D, YYYY')}
         )
         
-        fig.update_layout(showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("Attendance Rate by Webinar Type")
+        # Past webinars performance
+        st.subheader("Recent Webinar Performance")
         
-        attendance_data = pd.DataFrame({
-            'Type': ['Product Demo', 'Thought Leadership', 'Educational', 'Customer Stories', 'Partner Webinars'],
-            'Attendance Rate': [45, 48, 52, 39, 37]
+        completed = filtered_webinars("Completed")
+        registrations = completed['Registrations'].where(completed['Registrations'] > 0)
+        past_webinars = pd.DataFrame({
+            'Webinar Name': completed['Webinar Name'],
+            'Date': completed['Date'],
+            'Registrations': completed['Registrations'],
+            'Attendees': completed['Attendees'],
+            'Attendance Rate': (completed['Attendees'] / registrations * 100).round(1),
+            'MQLs Generated': completed['MQLs'],
+            'MQL Conversion': (completed['MQLs'] / registrations * 100).round(1)
         })
         
-        fig = px.bar(
-            attendance_data,
-            x='Type',
-            y='Attendance Rate',
-            color='Type',
-            title='Average Attendance Rate by Webinar Type (%)',
-            text='Attendance Rate'
+        paginated_table(
+            frame_source(past_webinars, 'past_webinars'),
+            key='past_webinars',
+            search_column='Webinar Name',
+            default_sort='Date',
+            descending=True,
+            hide_index=True,
+            use_container_width=True,
+            column_config=column_config(
+                {'Attendance Rate': 'percent', 'MQL Conversion': 'percent'},
+                Date=st.column_config.DateColumn(format='MMM D, YYYY')
+            )
         )
         
-        fig.update_layout(showlegend=False)
-        fig.update_traces(texttemplate='%{text}%', textposition='outside')
-        fig.update_yaxes(range=[0, 60])
+        # Registration trends chart
+        st.subheader("Registration Trends")
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    st.subheader("Lead Generation Performance")
-    
-    lead_data = pd.DataFrame({
-        'Webinar Name': [
-            'Medical Device Innovations', 
-            'Healthcare Marketing Strategies', 
-            'Patient Engagement Solutions', 
-            'Digital Transformation in Healthcare',
-            'Supply Chain Optimization',
-            'Regulatory Compliance Updates',
-            'Healthcare Data Security',
-            'Remote Patient Monitoring'
-        ],
-        'Date': [
-            'Apr 12, 2024', 
-            'Mar 28, 2024', 
-            'Mar 15, 2024', 
-            'Feb 22, 2024', 
-            'Feb 8, 2024',
-            'Jan 25, 2024',
-            'Jan 11, 2024',
-            'Dec 14, 2023'
-        ],
-        'Registrations': [187, 212, 156, 198, 142, 165, 178, 145],
-        'MQLs': [34, 42, 28, 36, 22, 31, 33, 27],
-        'SQLs': [12, 16, 8, 15, 6, 10, 12, 9],
-        'Opportunities': [4, 5, 2, 3, 1, 2, 3, 2],
-        'Closed Won': [1, 2, 0, 1, 0, 1, 1, 1]
-    })
-    
-    # Calculate conversion rates
-    lead_data['MQL Rate'] = (lead_data['MQLs'] / lead_data['Registrations'] * 100).round(1)
-    lead_data['SQL Rate'] = (lead_data['SQLs'] / lead_data['MQLs'] * 100).round(1)
-    
-    # Create a funnel chart for the overall pipeline
-    total_funnel = {
-        'Stage': ['Registrations', 'MQLs', 'SQLs', 'Opportunities', 'Closed Won'],
-        'Count': [
-            lead_data['Registrations'].sum(),
-            lead_data['MQLs'].sum(),
-            lead_data['SQLs'].sum(), 
-            lead_data['Opportunities'].sum(),
-            lead_data['Closed Won'].sum()
+        # Weekly series of the webinar groups within the filters; the 4-week means are kept up to date as registrations land
+        trends = webinar_trends()
+        trend_groups = [
+            group for group in trends.groups
+            if all(webinar_filters[column] is None or value in webinar_filters[column]
+                   for column, value in zip(TREND_GROUP_COLUMNS, group))
         ]
-    }
-    
-    fig = go.Figure(go.Funnel(
-        y=total_funnel['Stage'],
-        x=total_funnel['Count'],
-        textinfo="value+percent initial",
-        marker={"color": ["#0056A7", "#1268B9", "#247ACC", "#368CDE", "#489EF1"]}
-    ))
-    
-    fig.update_layout(
-        title="Webinar Lead Conversion Funnel",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("MQL Conversion Rate by Webinar")
-        
-        fig = px.bar(
-            lead_data.sort_values('MQL Rate', ascending=False),
-            x='Webinar Name',
-            y='MQL Rate',
-            color='MQL Rate',
-            title='MQL Conversion Rate (%)',
-            labels={'MQL Rate': 'MQL Conversion (%)'},
-            text='MQL Rate'
-        )
-        
-        fig.update_layout(showlegend=False, xaxis_tickangle=-45)
-        fig.update_traces(texttemplate='%{text}%', textposition='outside')
+        trend_data = trends.frame(groups=trend_groups, start=range_start, end=today).rename(columns={
+            'Registrations 4W Avg': 'Reg_4W_Avg',
+            'Attendees 4W Avg': 'Att_4W_Avg'
+        })
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("SQL Conversion Rate by Webinar")
-        
-        fig = px.bar(
-            lead_data.sort_values('SQL Rate', ascending=False),
-            x='Webinar Name',
-            y='SQL Rate',
-            color='SQL Rate',
-            title='SQL Conversion Rate (%)',
-            labels={'SQL Rate': 'SQL Conversion (%)'},
-            text='SQL Rate'
+        fig = px.line(
+            trend_data, 
+            x='Date', 
+            y=['Registrations', 'Attendees', 'Reg_4W_Avg', 'Att_4W_Avg'],
+            title='Webinar Registration and Attendance Trends',
+            labels={'value': 'Count', 'variable': 'Metric'},
+            line_shape='spline'
         )
         
-        fig.update_layout(showlegend=False, xaxis_tickangle=-45)
-        fig.update_traces(texttemplate='%{text}%', textposition='outside')
-        
+        fig.update_layout(height=500)
         st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
-    st.subheader("Webinar Program Maturity Framework")
-    
-    st.markdown("""
-    The Digital Factory 24 Webinar Maturity Framework helps organizations assess and improve their webinar program 
-    through three stages of maturity: Crawl, Walk, and Run.
-    """)
-    
-    # Maturity stages
-    stages = {
-        "Crawl": {
-            "Technology": ["Basic webinar platform", "Manual registration process", "Standard templates", "Limited analytics"],
-            "Content": ["Generic presentations", "Minimal audience engagement", "Limited follow-up", "Basic promotion"],
-            "Process": ["Ad-hoc planning", "Manual lead routing", "Basic metrics tracking", "No formal strategy"]
-        },
-        "Walk": {
-            "Technology": ["Integration with marketing automation", "Semi-automated workflows", "Custom branding", "Enhanced analytics"],
-            "Content": ["Segmented content strategy", "Interactive presentations", "Structured follow-up", "Multi-channel promotion"],
-            "Process": ["Standardized planning", "Automated lead routing", "Regular reporting", "Quarterly strategy"]
-        },
-        "Run": {
-            "Technology": ["Full marketing tech stack integration", "AI-driven personalization", "Advanced production quality", "Predictive analytics"],
-            "Content": ["Personalized content journeys", "Multi-format engagement", "Automated nurture paths", "Integrated campaigns"],
-            "Process": ["Continuous optimization", "Closed-loop analytics", "Revenue attribution", "Integrated program strategy"]
-        }
-    }
-    
-    # Show maturity framework in expandable sections
-    for stage, categories in stages.items():
-        with st.expander(f"{stage} Stage", expanded=(stage == "Crawl")):
-            for category, items in categories.items():
-                st.markdown(f"**{category}**")
-                for item in items:
-                    st.markdown(f"- {item}")
-    
-    # Current maturity assessment
-    st.subheader("Current Maturity Assessment")
-    
-    col1, col2 = st.columns([3, 2])
-    
-    with col1:
-        categories = ['Technology Stack', 'Content Strategy', 'Audience Engagement', 'Lead Management', 'Analytics', 'Follow-up Process', 'Program Integration']
+with tab2:
+    if is_open(tab2):
+        # Completed webinars within the filters
+        completed = filtered_webinars("Completed")
         
-        maturity_levels = {
-            'Current': [1, 2, 1, 1, 0, 1, 0],
-            'Target Q2': [2, 2, 2, 2, 1, 2, 1],
-            'Target EOY': [2, 3, 2, 3, 2, 2, 2]
-        }
+        # Per-type totals from the materialized type/region/product line/quarter aggregates,
+        # less the webinars not held yet; the date range starts at its quarter
+        pending = catalog.select(Status=['Upcoming', 'In Progress'], columns=['Webinar ID'], **webinar_filters)
+        by_type = webinar_aggregates().rollup('Type', start=range_start, exclude=pending['Webinar ID'], **webinar_filters)
+        if webinar_status not in ("All", "Completed"):
+            by_type = by_type.iloc[:0]
         
-        # Create radar chart
-        fig = go.Figure()
+        col1, col2 = st.columns(2)
         
-        # Add traces for current and targets
-        fig.add_trace(go.Scatterpolar(
-            r=maturity_levels['Current'],
-            theta=categories,
-            fill='toself',
-            name='Current'
-        ))
+        with col1:
+            st.subheader("Registration by Webinar Type")
+            
+            type_data = pd.DataFrame({
+                'Registrations': by_type['Registrations'],
+                'Avg per Webinar': (by_type['Registrations'] / by_type['Webinars']).round(1)
+            }).reset_index()
+            
+            fig = px.bar(
+                type_data,
+                x='Type',
+                y='Registrations',
+                color='Type',
+                title='Total Registrations by Webinar Type',
+                text='Registrations'
+            )
+            
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
         
-        fig.add_trace(go.Scatterpolar(
-            r=maturity_levels['Target Q2'],
-            theta=categories,
-            fill='toself',
-            name='Target Q2'
-        ))
+        with col2:
+            st.subheader("Attendance Rate by Webinar Type")
+            
+            attendance_data = pd.DataFrame({
+                'Attendance Rate': (by_type['Attendees'] / by_type['Registrations'].where(by_type['Registrations'] > 0) * 100).round(0)
+            }).reset_index()
+            
+            fig = px.bar(
+                attendance_data,
+                x='Type',
+                y='Attendance Rate',
+                color='Type',
+                title='Average Attendance Rate by Webinar Type (%)',
+                text='Attendance Rate'
+            )
+            
+            fig.update_layout(showlegend=False)
+            fig.update_traces(texttemplate='%{text}%', textposition='outside')
+            fig.update_yaxes(range=[0, 60])
+            
+            st.plotly_chart(fig, use_container_width=True)
         
-        fig.add_trace(go.Scatterpolar(
-            r=maturity_levels['Target EOY'],
-            theta=categories,
-            fill='toself',
-            name='Target EOY'
+        st.subheader("Lead Generation Performance")
+        
+        # Funnel of each completed webinar from registrations matched to CRM lead stages, most recent first
+        lead_data = completed[['Webinar ID', 'Webinar Name', 'Date']].iloc[::-1].join(
+            webinar_lead_funnel(), on='Webinar ID'
+        ).reset_index(drop=True)
+        
+        # Per-webinar charts show the most recent webinars; names repeat, so label with the date
+        recent_leads = lead_data.head(8).copy()
+        recent_leads['Webinar'] = recent_leads['Webinar Name'] + recent_leads['Date'].dt.strftime(' (%b %d, %Y)')
+        
+        # Create a funnel chart for the overall pipeline
+        total_funnel = {
+            'Stage': ['Registrations', 'MQLs', 'SQLs', 'Opportunities', 'Closed Won'],
+            'Count': [
+                lead_data['Registrations'].sum(),
+                lead_data['MQLs'].sum(),
+                lead_data['SQLs'].sum(), 
+                lead_data['Opportunities'].sum(),
+                lead_data['Closed Won'].sum()
+            ]
+        }
+        
+        fig = go.Figure(go.Funnel(
+            y=total_funnel['Stage'],
+            x=total_funnel['Count'],
+            textinfo="value+percent initial",
+            marker={"color": ["#0056A7", "#1268B9", "#247ACC", "#368CDE", "#489EF1"]}
         ))
         
-        # Update layout
         fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 3]
-                )
-            ),
-            showlegend=True,
+            title="Webinar Lead Conversion Funnel",
             height=500
         )
         
         st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.markdown("### Key Improvement Areas")
-        
-        improvements = [
-            {
-                "area": "Analytics Implementation",
-                "current": "Basic attendance tracking only",
-                "recommendation": "Implement attendee engagement scoring and post-webinar behavioral tracking"
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("MQL Conversion Rate by Webinar")
+            
+            fig = px.bar(
+                recent_leads.sort_values('MQL Rate', ascending=False),
+                x='Webinar',
+                y='MQL Rate',
+                color='MQL Rate',
+                title='MQL Conversion Rate (%)',
+                labels={'MQL Rate': 'MQL Conversion (%)'},
+                text='MQL Rate'
+            )
+            
+            fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+            fig.update_traces(texttemplate='%{text}%', textposition='outside')
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("SQL Conversion Rate by Webinar")
+            
+            fig = px.bar(
+                recent_leads.sort_values('SQL Rate', ascending=False),
+                x='Webinar',
+                y='SQL Rate',
+                color='SQL Rate',
+                title='SQL Conversion Rate (%)',
+                labels={'SQL Rate': 'SQL Conversion (%)'},
+                text='SQL Rate'
+            )
+            
+            fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+            fig.update_traces(texttemplate='%{text}%', textposition='outside')
+            
+            st.plotly_chart(fig, use_container_width=True)
+
+with tab3:
+    if is_open(tab3):
+        st.subheader("Webinar Program Maturity Framework")
+        
+        st.markdown("""
+        The Digital Factory 24 Webinar Maturity Framework helps organizations assess and improve their webinar program 
+        through three stages of maturity: Crawl, Walk, and Run.
+        """)
+        
+        # Maturity stages
+        stages = {
+            "Crawl": {
+                "Technology": ["Basic webinar platform", "Manual registration process", "Standard templates", "Limited analytics"],
+                "Content": ["Generic presentations", "Minimal audience engagement", "Limited follow-up", "Basic promotion"],
+                "Process": ["Ad-hoc planning", "Manual lead routing", "Basic metrics tracking", "No formal strategy"]
             },
-            {
-                "area": "Lead Management",
-                "current": "Manual lead qualification",
-                "recommendation": "Implement automated lead scoring based on webinar engagement and follow-up actions"
+            "Walk": {
+                "Technology": ["Integration with marketing automation", "Semi-automated workflows", "Custom branding", "Enhanced analytics"],
+                "Content": ["Segmented content strategy", "Interactive presentations", "Structured follow-up", "Multi-channel promotion"],
+                "Process": ["Standardized planning", "Automated lead routing", "Regular reporting", "Quarterly strategy"]
             },
-            {
-                "area": "Program Integration",
-                "current": "Standalone webinars",
-                "recommendation": "Integrate webinars into full content marketing and nurture programs"
+            "Run": {
+                "Technology": ["Full marketing tech stack integration", "AI-driven personalization", "Advanced production quality", "Predictive analytics"],
+                "Content": ["Personalized content journeys", "Multi-format engagement", "Automated nurture paths", "Integrated campaigns"],
+                "Process": ["Continuous optimization", "Closed-loop analytics", "Revenue attribution", "Integrated program strategy"]
             }
-        ]
+        }
         
-        for item in improvements:
-            st.markdown(f"**{item['area']}**")
-            st.markdown(f"*Current State:* {item['current']}")
-            st.markdown(f"*Recommendation:* {item['recommendation']}")
-            st.markdown("---")
-    
-    # Implementation roadmap
-    st.subheader("Implementation Roadmap")
-    
-    roadmap_data = pd.DataFrame({
-        'Task': [
-            'Implement marketing automation integration',
-            'Develop engagement scoring system',
-            'Create content strategy template',
-            'Build automated follow-up workflows',
-            'Implement lead scoring model',
-            'Develop webinar program analytics dashboard',
-            'Create integrated promotional plan',
-            'Implement A/B testing framework'
-        ],
-        'Stage': ['Crawl→Walk', 'Crawl→Walk', 'Crawl→Walk', 'Walk', 'Walk', 'Walk', 'Walk→Run', 'Walk→Run'],
-        'Priority': ['High', 'High', 'Medium', 'High', 'Medium', 'Low', 'Medium', 'Low'],
-        'Estimated Timeline': ['Q2 2024', 'Q2 2024', 'Q2 2024', 'Q3 2024', 'Q3 2024', 'Q3 2024', 'Q4 2024', 'Q4 2024'],
-        'Status': ['In Progress', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started']
-    })
-    
-    # Function to color the status
-    def color_status(val):
-        if val == 'Completed':
-            return 'background-color: #d4edda; color: #155724'
-        elif val == 'In Progress':
-            return 'background-color: #fff3cd; color: #856404'
-        else:
-            return 'background-color: #f8d7da; color: #721c24'
-    
-    st.dataframe(roadmap_data.style.applymap(color_status, subset=['Status']), hide_index=True, use_container_width=True)
+        # Show maturity framework in expandable sections, filled in when opened
+        for stage, categories in stages.items():
+            stage_expander = lazy_expander(f"{stage} Stage", key=f"maturity_{stage}", expanded=(stage == "Crawl"))
+            with stage_expander:
+                if is_open(stage_expander):
+                    for category, items in categories.items():
+                        st.markdown(f"**{category}**")
+                        for item in items:
+                            st.markdown(f"- {item}")
+        
+        # Current maturity assessment
+        st.subheader("Current Maturity Assessment")
+        
+        col1, col2 = st.columns([3, 2])
+        
+        with col1:
+            categories = ['Technology Stack', 'Content Strategy', 'Audience Engagement', 'Lead Management', 'Analytics', 'Follow-up Process', 'Program Integration']
+            
+            maturity_levels = {
+                'Current': [1, 2, 1, 1, 0, 1, 0],
+                'Target Q2': [2, 2, 2, 2, 1, 2, 1],
+                'Target EOY': [2, 3, 2, 3, 2, 2, 2]
+            }
+            
+            # Create radar chart
+            fig = go.Figure()
+            
+            # Add traces for current and targets
+            fig.add_trace(go.Scatterpolar(
+                r=maturity_levels['Current'],
+                theta=categories,
+                fill='toself',
+                name='Current'
+            ))
+            
+            fig.add_trace(go.Scatterpolar(
+                r=maturity_levels['Target Q2'],
+                theta=categories,
+                fill='toself',
+                name='Target Q2'
+            ))
+            
+            fig.add_trace(go.Scatterpolar(
+                r=maturity_levels['Target EOY'],
+                theta=categories,
+                fill='toself',
+                name='Target EOY'
+            ))
+            
+            # Update layout
+            fig.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        visible=True,
+                        range=[0, 3]
+                    )
+                ),
+                showlegend=True,
+                height=500
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.markdown("### Key Improvement Areas")
+            
+            improvements = [
+                {
+                    "area": "Analytics Implementation",
+                    "current": "Basic attendance tracking only",
+                    "recommendation": "Implement attendee engagement scoring and post-webinar behavioral tracking"
+                },
+                {
+                    "area": "Lead Management",
+                    "current": "Manual lead qualification",
+                    "recommendation": "Implement automated lead scoring based on webinar engagement and follow-up actions"
+                },
+                {
+                    "area": "Program Integration",
+                    "current": "Standalone webinars",
+                    "recommendation": "Integrate webinars into full content marketing and nurture programs"
+                }
+            ]
+            
+            for item in improvements:
+                st.markdown(f"**{item['area']}**")
+                st.markdown(f"*Current State:* {item['current']}")
+                st.markdown(f"*Recommendation:* {item['recommendation']}")
+                st.markdown("---")
+        
+        # Implementation roadmap
+        st.subheader("Implementation Roadmap")
+        
+        roadmap_data = pd.DataFrame({
+            'Task': [
+                'Implement marketing automation integration',
+                'Develop engagement scoring system',
+                'Create content strategy template',
+                'Build automated follow-up workflows',
+                'Implement lead scoring model',
+                'Develop webinar program analytics dashboard',
+                'Create integrated promotional plan',
+                'Implement A/B testing framework'
+            ],
+            'Stage': ['Crawl→Walk', 'Crawl→Walk', 'Crawl→Walk', 'Walk', 'Walk', 'Walk', 'Walk→Run', 'Walk→Run'],
+            'Priority': ['High', 'High', 'Medium', 'High', 'Medium', 'Low', 'Medium', 'Low'],
+            'Estimated Timeline': ['Q2 2024', 'Q2 2024', 'Q2 2024', 'Q3 2024', 'Q3 2024', 'Q3 2024', 'Q4 2024', 'Q4 2024'],
+            'Status': ['In Progress', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started', 'Not Started']
+        })
+        
+        # Status colors
+        roadmap_colors = {
+            'Completed': STATUS_COLORS['good'],
+            'In Progress': STATUS_COLORS['warning'],
+            'Not Started': STATUS_COLORS['bad']
+        }
+        
+        colored_dataframe(roadmap_data, {'Status': roadmap_colors}, hide_index=True, use_container_width=True)
+
+profiler.finish()
@@ -6,6 +6,9 @@ from datetime import datetime, timedelta
 import numpy as np
 import json
 
+from utils.assets import COLUMN_WIDTHS, image_asset
+from utils.profiling import profile_page
+
 # Page configuration
 st.set_page_config(
     page_title="Marketing Automation - Verathon",
@@ -13,6 +16,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("Marketing Automation")
+
 # Header
 st.title("Marketing Automation Workflows")
 st.markdown("Build, manage, and optimize your marketing automation workflows")
@@ -88,7 +94,7 @@ with workflow_col1:
     
     # This is a simplified representation - in a real app, this would be a canvas
     # with draggable elements rendered with a specialized library
-    st.image("https://images.unsplash.com/photo-1507925921958-8a62f3d1a50d", 
+    st.image(image_asset("workflow_canvas", COLUMN_WIDTHS["three_quarters"]), 
              caption="Marketing Workflow Canvas - Webinar Lead Nurturing")
     
     st.info("Drag and drop elements from the sidebar to build your workflow. Connect elements to create a complete automation flow.")
@@ -123,7 +129,7 @@ template_col1, template_col2, template_col3 = st.columns(3)
 
 with template_col1:
     st.subheader("Webinar Lead Nurturing")
-    st.image("https://images.unsplash.com/photo-1517245386807-bb43f82c33c4", 
+    st.image(image_asset("webinar_management", COLUMN_WIDTHS["third"]), 
              caption="Webinar Automation Workflow")
     st.markdown("""
     **Stages:**
@@ -137,7 +143,7 @@ with template_col1:
 
 with template_col2:
     st.subheader("Product Interest Qualification")
-    st.image("https://images.unsplash.com/photo-1454165804606-c3d57bc86b40", 
+    st.image(image_asset("product_interest", COLUMN_WIDTHS["third"]), 
              caption="Product Interest Workflow")
     st.markdown("""
     **Stages:**
@@ -151,7 +157,7 @@ with template_col2:
 
 with template_col3:
     st.subheader("Event Follow-up Sequence")
-    st.image("https://images.unsplash.com/photo-1519389950473-47ba0277781c", 
+    st.image(image_asset("event_follow_up", COLUMN_WIDTHS["third"]), 
              caption="Event Follow-up Workflow")
     st.markdown("""
     **Stages:**
@@ -321,3 +327,5 @@ with scoring_col2:
     """)
     
     st.button("Edit Routing Rules")
+
+profiler.finish()
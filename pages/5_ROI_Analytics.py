@@ -5,6 +5,11 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 
+from utils.downsample import downsample
+from utils.profiling import profile_page
+from utils.queries import roi_trend
+from utils.table_format import formatted_dataframe
+
 # Page configuration
 st.set_page_config(
     page_title="ROI Analytics - Verathon",
@@ -12,6 +17,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("ROI Analytics")
+
 # Header
 st.title("Marketing ROI Analytics")
 st.markdown("Track, analyze, and optimize your marketing investments")
@@ -169,30 +177,8 @@ with webinar_col2:
 # ROI Over Time
 st.header("Marketing ROI Trends")
 
-# Create sample data for ROI over time
-dates = pd.date_range(start='2023-01-01', periods=12, freq='M')
-channels = ['Webinars', 'Trade Shows', 'Content Marketing', 'Email', 'Paid Media']
-
-roi_trend_data = pd.DataFrame()
-for channel in channels:
-    # Generate slightly different ROI trend patterns for each channel
-    if channel == 'Webinars':
-        roi_values = np.linspace(3.8, 5.2, len(dates)) + np.random.normal(0, 0.3, len(dates))
-    elif channel == 'Trade Shows':
-        roi_values = np.linspace(3.5, 2.8, len(dates)) + np.random.normal(0, 0.3, len(dates))
-    elif channel == 'Content Marketing':
-        roi_values = np.linspace(4.0, 4.8, len(dates)) + np.random.normal(0, 0.2, len(dates))
-    elif channel == 'Email':
-        roi_values = np.linspace(5.5, 6.2, len(dates)) + np.random.normal(0, 0.4, len(dates))
-    else:  # Paid Media
-        roi_values = np.linspace(2.8, 3.5, len(dates)) + np.random.normal(0, 0.3, len(dates))
-    
-    channel_data = pd.DataFrame({
-        'Date': dates,
-        'Channel': channel,
-        'ROI': roi_values
-    })
-    roi_trend_data = pd.concat([roi_trend_data, channel_data])
+# Monthly ROI per channel from the metrics store
+roi_trend_data = downsample(roi_trend(), 'Date', 'ROI', color='Channel')
 
 fig = px.line(
     roi_trend_data,
@@ -322,11 +308,16 @@ st.plotly_chart(fig, use_container_width=True)
 
 # Campaign performance table with formatting
 st.subheader("Campaign Performance Details")
-campaign_display = campaign_data.copy()
-campaign_display['Investment'] = campaign_display['Investment'].apply(lambda x: f"${x:,.0f}")
-campaign_display['Pipeline'] = campaign_display['Pipeline'].apply(lambda x: f"${x:,.0f}")
-campaign_display['Closed Revenue'] = campaign_display['Closed Revenue'].apply(lambda x: f"${x:,.0f}")
-campaign_display['ROI'] = campaign_display['ROI'].apply(lambda x: f"{x:.2f}x")
-campaign_display['Pipeline Ratio'] = campaign_display['Pipeline Ratio'].apply(lambda x: f"{x:.2f}x")
+formatted_dataframe(
+    campaign_data,
+    {
+        'Investment': 'currency',
+        'Pipeline': 'currency',
+        'Closed Revenue': 'currency',
+        'ROI': 'multiplier',
+        'Pipeline Ratio': 'multiplier'
+    },
+    use_container_width=True
+)
 
-st.dataframe(campaign_display, use_container_width=True)
+profiler.finish()
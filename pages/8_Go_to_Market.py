@@ -4,6 +4,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
+from utils.profiling import profile_page
+
 # Page configuration
 st.set_page_config(
     page_title="Go-To-Market Strategy - Verathon",
@@ -11,6 +13,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Render profiling (add ?profile=1 to the URL for the breakdown)
+profiler = profile_page("Go to Market")
+
 # Verathon brand colors
 VERATHON_BLUE = "#0056A7"
 VERATHON_WHITE = "#FFFFFF"
@@ -348,3 +353,5 @@ st.markdown(f"""
     <p style="color:white;">Contact your Digital Factory 24 representative to schedule a GTM strategy session for your new product line.</p>
 </div>
 """, unsafe_allow_html=True)
+
+profiler.finish()
@@ -0,0 +1,27 @@
+"""Start the dashboard from a warmed-up process.
+
+    python serve.py [streamlit run options]
+
+Heavy imports, shared datasets and the landing page figures are loaded
+in this process before the server accepts its first session.
+"""
+
+import os
+import sys
+
+from utils.bootstrap import APP_ROOT, LANDING_PAGE, warm_up
+
+
+def main():
+    os.chdir(APP_ROOT)
+    report = warm_up()
+    print(f"Warm-up finished in {report['total_ms']:.0f} ms", file=sys.stderr)
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(LANDING_PAGE), *sys.argv[1:]]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from utils.forecast import RegistrationCurves
+
+TODAY = pd.Timestamp('2024-06-01')
+
+
+def _webinars():
+    return pd.DataFrame({
+        'Webinar ID': ['HELD', 'DEMO', 'NEW'],
+        'Date': pd.to_datetime(['2024-05-01', '2024-06-20', '2024-06-20']),
+        'Announced': pd.to_datetime(['2024-03-20', '2024-05-01', '2024-05-01']),
+        'Type': ['Product Demo', 'Product Demo', 'Brand New Format'],
+        'Registrations': [50, 10, 10],
+        'Registration Goal': [100, 100, 100]
+    })
+
+
+def _registrations():
+    return pd.DataFrame({
+        'Webinar ID': ['HELD'] * 50,
+        'Registered At': pd.date_range('2024-03-21', '2024-04-30', periods=50)
+    })
+
+
+def test_type_without_completed_webinars_is_not_projected():
+    webinars = _webinars()
+    curves = RegistrationCurves.fit(webinars, _registrations(), TODAY)
+    upcoming = webinars.iloc[1:]
+
+    assert curves.types == ['Product Demo']
+    share = curves.share(upcoming, TODAY)
+    assert share[0] > 0 and np.isnan(share[1])
+
+    forecast = curves.project(upcoming, TODAY)
+    # Registrations so far, not scaled up by a curve it doesn't have
+    assert forecast.loc[2, 'Projected Registrations'] == 10
+    assert forecast.loc[2, 'Status'] == 'Just Announced'
+
+
+def test_no_completed_webinars_at_all():
+    webinars = _webinars()
+    curves = RegistrationCurves.fit(webinars, _registrations(), pd.Timestamp('2024-01-01'))
+    forecast = curves.project(webinars, pd.Timestamp('2024-01-01'))
+    assert (forecast['Projected Registrations'] == webinars['Registrations']).all()
+    assert (forecast['Status'] == 'Just Announced').all()
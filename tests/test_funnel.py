@@ -0,0 +1,19 @@
+import pandas as pd
+
+from utils.funnel import FunnelEngine
+from utils.ga4_ingest import NOT_SET
+
+
+def test_missing_dimension_values_count_as_not_set():
+    engine = FunnelEngine.from_events(
+        users=['u1', 'u1', 'u2'],
+        steps=[0, 1, 0],
+        timestamps=pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-01']),
+        stages=['Visit', 'Signup'],
+        dimensions={'Campaign': ['A', 'A', None]}
+    )
+
+    assert engine.labels['Campaign'] == [NOT_SET, 'A']
+    assert list(engine.counts()) == [2, 1]
+    assert list(engine.counts(Campaign=[NOT_SET])) == [1, 0]
+    assert engine.breakdown('Campaign').loc['A'].tolist() == [1, 1]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import data_store, queries
+from utils.data_store import MetricsStore
+from utils.ga4_ingest import NOT_SET, ingest_export
+from utils.sample_data import build_marketing, build_traffic
+
+START, END = '2024-01-01', '2024-02-29'
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MetricsStore(tmp_path / 'data')
+    store.write('traffic', build_traffic(START, END), date_column='Date', mode='overwrite')
+    store.write('marketing', build_marketing(START, END), date_column='Date', mode='overwrite')
+    monkeypatch.setattr(data_store, 'get_store', lambda root=None: store)
+    monkeypatch.setattr(queries, 'get_store', lambda root=None: store)
+    return store
+
+
+def test_ingested_ga4_traffic_reaches_the_marketing_cube(store, tmp_path):
+    export = tmp_path / 'ga4.csv'
+    pd.DataFrame({
+        'date': ['20240105', '20240105', '20240105', '20240106', '20240301'],
+        'sessionSource': ['google', 'newsletter', 'partner.org', 'google', 'google'],
+        'sessionMedium': ['organic', 'email', 'referral', 'organic', 'organic'],
+        'sessions': [100, 40, 7, 250, 30]
+    }).to_csv(export, index=False)
+    ingest_export(export, store=store)
+
+    traffic = store.read('traffic')
+    expected = traffic.melt(id_vars='Date', var_name='Channel', value_name='Visitors')
+    expected['Date'] = expected['Date'].astype('datetime64[ns]')
+    expected = expected[expected['Visitors'] > 0].set_index(['Date', 'Channel'])['Visitors'].sort_index()
+
+    rolled = queries.marketing_cube().rollup(['Date', 'Channel'], ['Visitors'])
+    rolled['Date'] = pd.to_datetime(rolled['Date']).astype('datetime64[ns]')
+    actual = rolled[rolled['Visitors'] > 0].set_index(['Date', 'Channel'])['Visitors'].sort_index()
+
+    assert expected.loc[(pd.Timestamp('2024-01-05'), 'Organic Search')] == 100
+    pd.testing.assert_series_equal(actual.astype(np.int64), expected.astype(np.int64), check_names=False)
+
+    # March had no marketing facts: its visits are kept in "(not set)" cells
+    march = store.read('marketing', start=pd.Timestamp('2024-03-01').date())
+    assert (march[['Device', 'Country', 'Campaign']] == NOT_SET).all().all()
+
+
+def test_partial_month_export_only_rescales_its_days(store, tmp_path):
+    traffic_before = store.read('traffic')
+    marketing_before = store.read('marketing')
+    export = tmp_path / 'ga4-partial.csv'
+    pd.DataFrame({
+        'date': ['20240110', '20240110', '20240111', '20240112'],
+        'sessionSource': ['google', 'newsletter', 'google', '(direct)'],
+        'sessionMedium': ['organic', 'email', 'organic', '(none)'],
+        'sessions': [300, 20, 280, 90]
+    }).to_csv(export, index=False)
+    ingest_export(export, store=store)
+
+    days = pd.to_datetime(['2024-01-10', '2024-01-11', '2024-01-12'])
+    traffic = store.read('traffic')
+    marketing = store.read('marketing')
+
+    # The month's other days keep their traffic and facts as they were
+    pd.testing.assert_frame_equal(
+        traffic[~traffic['Date'].isin(days)].reset_index(drop=True),
+        traffic_before[~traffic_before['Date'].isin(days)].reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(
+        marketing[~marketing['Date'].isin(days)].reset_index(drop=True),
+        marketing_before[~marketing_before['Date'].isin(days)].reset_index(drop=True)
+    )
+
+    # The export's days match the export per channel
+    exported = marketing[marketing['Date'].isin(days)].groupby(['Date', 'Channel'])['Visitors'].sum()
+    assert exported[exported > 0].to_dict() == {
+        (days[0], 'Organic Search'): 300,
+        (days[0], 'Email'): 20,
+        (days[1], 'Organic Search'): 280,
+        (days[2], 'Direct'): 90
+    }
+
+    # Sessions-only exports leave the other measures alone
+    measures = ['MQLs', 'Opportunities', 'Spend', 'Revenue']
+    pd.testing.assert_frame_equal(
+        marketing.groupby('Date')[measures].sum(), marketing_before.groupby('Date')[measures].sum()
+    )
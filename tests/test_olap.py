@@ -0,0 +1,20 @@
+import pandas as pd
+
+from utils.ga4_ingest import NOT_SET
+from utils.olap import Cube
+
+
+def test_missing_dimension_values_count_as_not_set():
+    facts = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02']),
+        'Channel': ['Email', 'Email', 'Direct'],
+        'Campaign': ['Spring Launch', None, None],
+        'Visitors': [10, 5, 7]
+    })
+    cube = Cube.from_frame(facts, 'Date', ['Channel', 'Campaign'], ['Visitors'])
+
+    assert cube.labels['Campaign'] == [NOT_SET, 'Spring Launch']
+    assert cube.totals() == {'Visitors': 22}
+    rolled = cube.rollup(['Campaign'])
+    assert dict(zip(rolled['Campaign'], rolled['Visitors'])) == {NOT_SET: 12, 'Spring Launch': 10}
+    assert cube.totals(Campaign=[NOT_SET], Channel=['Email']) == {'Visitors': 5}
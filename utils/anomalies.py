@@ -0,0 +1,75 @@
+"""Anomaly detection over many daily series at once.
+
+Every series is a row of one ``series x days`` matrix. The expected value
+of a day is the median of the same weekday over the previous few weeks
+(a seasonal baseline), and a day is anomalous when its deviation from that
+baseline is far outside the deviations of the trailing weeks, measured as
+a robust z-score (median and MAD instead of mean and standard deviation,
+so the anomalies themselves do not widen the band). All steps are array
+operations over the whole matrix; nothing loops over series.
+"""
+
+import warnings
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# MAD of a normal distribution is 0.6745 sigma
+MAD_SCALE = 1.4826
+
+DEFAULT_THRESHOLD = 3.5
+
+
+def _nanmedian(values, axis):
+    # Leading days have no history yet; all-NaN slices are expected there
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmedian(values, axis=axis)
+
+
+def seasonal_baseline(values, season=7, cycles=4):
+    """Median of the previous ``cycles`` values ``season`` days apart, per cell."""
+    lagged = np.full((cycles,) + values.shape, np.nan)
+    for k in range(1, cycles + 1):
+        lag = k * season
+        lagged[k - 1, :, lag:] = values[:, :-lag]
+    return _nanmedian(lagged, axis=0)
+
+
+def robust_z(residuals, window=56):
+    """Z-scores of ``residuals`` against the median/MAD of the trailing ``window`` days."""
+    n_series, n_days = residuals.shape
+    padded = np.concatenate([np.full((n_series, window), np.nan), residuals], axis=1)
+    # Window for day t covers days t - window .. t - 1
+    history = sliding_window_view(padded, window, axis=1)[:, :n_days]
+    center = _nanmedian(history, axis=2)
+    spread = _nanmedian(np.abs(history - center[..., None]), axis=2) * MAD_SCALE
+    # Too little history for a stable spread: no score
+    enough = np.count_nonzero(~np.isnan(history), axis=2) >= window // 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(enough & (spread > 0), (residuals - center) / spread, np.nan)
+
+
+def detect_anomalies(frame, threshold=DEFAULT_THRESHOLD, season=7, cycles=4, window=56):
+    """Flag anomalous days in a wide frame (date index, one column per series).
+
+    Returns one row per flagged day with the series label(s), ``Date``,
+    ``Value``, ``Baseline`` and ``Z``. Column labels may be a MultiIndex,
+    e.g. (group, series); each level becomes a column of the result.
+    """
+    frame = frame.sort_index()
+    values = frame.to_numpy(dtype=float).T
+    baseline = seasonal_baseline(values, season, cycles)
+    z = robust_z(values - baseline, window)
+
+    with np.errstate(invalid='ignore'):
+        series, day = np.nonzero(np.abs(z) > threshold)
+    labels = frame.columns[series].to_frame(index=False)
+    labels.columns = [name or 'Series' for name in frame.columns.names]
+    flagged = labels.assign(
+        Date=frame.index[day],
+        Value=values[series, day],
+        Baseline=baseline[series, day],
+        Z=z[series, day].round(2)
+    )
+    return flagged.sort_values(['Date'] + list(labels.columns), kind='stable').reset_index(drop=True)
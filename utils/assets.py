@@ -0,0 +1,266 @@
+"""Local image asset pipeline.
+
+Page images are fetched (or taken from ``assets/images``) once, resized
+to the width of the column they render in and encoded as WebP. Results
+live in a content-addressed cache: sources are stored under the SHA-256
+of their bytes and renditions under that hash plus the target width, so
+an image is downloaded and encoded at most once per width.
+
+Downloads never run on the render path: :func:`fetch_sources` runs on
+the warm-up thread (or a background thread started by the first render),
+and until a source is in the cache the bundled fallback in
+``assets/images`` is used, so pages render fully offline. Downloads that
+fail or aren't images are remembered and not retried for a while.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+BUNDLED_DIR = APP_ROOT / "assets" / "images"
+CACHE_DIR = Path(os.environ.get("VERATHON_ASSET_CACHE", APP_ROOT / ".asset_cache"))
+
+WEBP_QUALITY = 80
+DOWNLOAD_TIMEOUT = 5
+# Seconds before a failed download is tried again
+RETRY_AFTER = 24 * 60 * 60
+# Largest width any page renders an image at; sources are fetched at this size
+MAX_SOURCE_WIDTH = 1280
+
+# Rendered content widths (px) of the column layouts used in the wide page layout
+COLUMN_WIDTHS = {
+    "full": 1200,
+    "three_quarters": 900,
+    "half": 600,
+    "third": 400,
+}
+
+# asset name -> remote source
+IMAGE_SOURCES = {
+    "campaign_analytics": "https://images.unsplash.com/photo-1432888498266-38ffec3eaf0a",
+    "webinar_management": "https://images.unsplash.com/photo-1517245386807-bb43f82c33c4",
+    "workflow_canvas": "https://images.unsplash.com/photo-1507925921958-8a62f3d1a50d",
+    "product_interest": "https://images.unsplash.com/photo-1454165804606-c3d57bc86b40",
+    "event_follow_up": "https://images.unsplash.com/photo-1519389950473-47ba0277781c",
+}
+
+FALLBACK_COLOR = (0, 86, 167)  # Verathon blue
+
+_lock = threading.Lock()
+# Held for a whole fetch_sources run, so the warm-up and a background fetch don't both download
+_fetch_lock = threading.Lock()
+_fetch_thread = None
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _index_path():
+    return CACHE_DIR / "index.json"
+
+
+def _failures_path():
+    return CACHE_DIR / "failures.json"
+
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _load_index():
+    return _load_json(_index_path())
+
+
+def _save_index(index):
+    _save_json(_index_path(), index)
+
+
+def _store_source(data):
+    digest = _sha256(data)
+    path = CACHE_DIR / "sources" / digest
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return digest
+
+
+def _download(url):
+    # Unsplash serves resized JPEGs on request, so never pull the full original
+    sized_url = f"{url}?w={MAX_SOURCE_WIDTH}&q=85&fm=jpg"
+    request = urllib.request.Request(sized_url, headers={"User-Agent": "verathon-dashboard"})
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _is_image(data):
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+    except Exception:
+        return False
+    return True
+
+
+def _bundled_source(name):
+    for path in sorted(BUNDLED_DIR.glob(f"{name}.*")):
+        return path.read_bytes()
+    return None
+
+
+def render_placeholder(label, width=MAX_SOURCE_WIDTH):
+    """Branded placeholder used when no source is available at all."""
+    height = width * 9 // 16
+    image = Image.new("RGB", (width, height), FALLBACK_COLOR)
+    draw = ImageDraw.Draw(image)
+    for y in range(height):
+        shade = int(60 * y / height)
+        draw.line([(0, y), (width, y)], fill=(shade, 86 + shade, 167 + shade // 2))
+    try:
+        font = ImageFont.load_default(size=width // 24)
+    except TypeError:
+        # Pillow < 10.1 only ships the fixed-size bitmap font
+        font = ImageFont.load_default()
+    draw.text((width // 20, height - height // 6), label, fill=(255, 255, 255), font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=WEBP_QUALITY)
+    return buffer.getvalue()
+
+
+def fetch_source(name):
+    """Download the remote source of ``name`` into the cache; True once it is there.
+
+    Sources already cached, and ones whose download failed within
+    ``RETRY_AFTER`` seconds, are not fetched again.
+    """
+    digest = _load_index().get(name)
+    if digest and (CACHE_DIR / "sources" / digest).exists():
+        return True
+    url = IMAGE_SOURCES.get(name)
+    if not url or time.time() - _load_json(_failures_path()).get(name, 0) < RETRY_AFTER:
+        return False
+
+    try:
+        data = _download(url)
+        if not _is_image(data):
+            raise ValueError("response is not an image")
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not fetch image %s (%s); using bundled fallback", name, exc)
+        with _lock:
+            failures = _load_json(_failures_path())
+            failures[name] = time.time()
+            _save_json(_failures_path(), failures)
+        return False
+
+    with _lock:
+        index = _load_index()
+        index[name] = _store_source(data)
+        _save_index(index)
+    return True
+
+
+def fetch_sources(names=None):
+    """Fetch every remote source not cached yet, then serve them from the next render on."""
+    with _fetch_lock:
+        fetched = [name for name in names or IMAGE_SOURCES if fetch_source(name)]
+    # Renditions looked up before the fetch point at the fallbacks
+    image_asset.cache_clear()
+    return fetched
+
+
+def fetch_sources_in_background():
+    """Start :func:`fetch_sources` on a daemon thread, once per process."""
+    global _fetch_thread
+
+    with _lock:
+        if _fetch_thread is None:
+            _fetch_thread = threading.Thread(target=fetch_sources, name="image-fetch", daemon=True)
+            _fetch_thread.start()
+    return _fetch_thread
+
+
+def _fallback_digest(name):
+    data = _bundled_source(name) or render_placeholder(name.replace("_", " ").title())
+    return _store_source(data)
+
+
+def _source_digest(name):
+    """Content hash of the cached source for ``name``, or of its fallback."""
+    digest = _load_index().get(name)
+    if digest and (CACHE_DIR / "sources" / digest).exists():
+        return digest
+    return _fallback_digest(name)
+
+
+def _encode(source_path, width, target):
+    with Image.open(source_path) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        image.save(tmp, format="WEBP", quality=WEBP_QUALITY, method=6)
+        os.replace(tmp, target)
+
+
+@lru_cache(maxsize=None)
+def image_asset(name, width=COLUMN_WIDTHS["half"]):
+    """Path of the WebP rendition of asset ``name`` at ``width`` pixels."""
+    fetch_sources_in_background()
+    with _lock:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        digest = _source_digest(name)
+        target = CACHE_DIR / "renditions" / f"{digest}-{width}.webp"
+        if not target.exists():
+            try:
+                _encode(CACHE_DIR / "sources" / digest, width, target)
+            except OSError as exc:
+                # A source cached before downloads were validated: drop it
+                logger.warning("Cached image %s is unreadable (%s); using bundled fallback", name, exc)
+                index = _load_index()
+                index.pop(name, None)
+                _save_index(index)
+                digest = _fallback_digest(name)
+                target = CACHE_DIR / "renditions" / f"{digest}-{width}.webp"
+                if not target.exists():
+                    _encode(CACHE_DIR / "sources" / digest, width, target)
+    return str(target)
+
+
+def build_bundled_fallbacks(names=None, width=COLUMN_WIDTHS["full"]):
+    """Refresh ``assets/images`` with a WebP copy of each source image."""
+    BUNDLED_DIR.mkdir(parents=True, exist_ok=True)
+    fetch_sources(names)
+    for name in names or IMAGE_SOURCES:
+        rendition = image_asset(name, width)
+        (BUNDLED_DIR / f"{name}.webp").write_bytes(Path(rendition).read_bytes())
+
+
+if __name__ == "__main__":
+    build_bundled_fallbacks()
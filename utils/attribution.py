@@ -0,0 +1,205 @@
+"""Webinar lead funnels: registrations joined to CRM lead stages.
+
+Registrations carry the email typed into the form, CRM lead-stage records
+a contact id and email. Emails on both sides are normalized (trimmed and
+lower-cased) and dictionary-encoded with Arrow, so the join is one hash
+lookup of every registration email in the CRM email dictionary, giving a
+small integer contact code. Each stage record is then credited to the
+contact's last attended webinar before it (within ``ATTRIBUTION_DAYS``),
+found with one sorted search over ``contact * span + day`` keys. After
+the string hashing everything is integer array work, and new
+registrations only re-credit the stage records of the contacts they
+touch.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.data_store import changed_partitions
+
+# CRM stage -> funnel column, in funnel order
+STAGE_COLUMNS = {
+    'MQL': 'MQLs',
+    'SQL': 'SQLs',
+    'Opportunity': 'Opportunities',
+    'Closed Won': 'Closed Won'
+}
+
+# Stages reached this many days after a webinar or later are not credited to it
+ATTRIBUTION_DAYS = 90
+
+# Day numbers stay below this, so contact * _DAY_SPAN + day orders by contact, then day
+_DAY_SPAN = 1 << 20
+
+
+def normalize_emails(emails):
+    """Trimmed, lower-cased emails as an Arrow string array."""
+    return pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(emails, type=pa.string())))
+
+
+def _days(timestamps):
+    return np.asarray(timestamps, dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def last_touch(touch_contact, touch_day, contact, day, window=ATTRIBUTION_DAYS):
+    """Position of the latest touch of the same contact on or before each (contact, day), or -1.
+
+    Touches more than ``window`` days before ``day`` do not count.
+    """
+    if len(touch_contact) == 0:
+        return np.full(len(contact), -1, dtype=np.int64)
+    order = np.lexsort((touch_day, touch_contact))
+    keys = touch_contact[order] * _DAY_SPAN + touch_day[order]
+    found = np.searchsorted(keys, contact * _DAY_SPAN + day, side='right') - 1
+    touch = order[np.clip(found, 0, None)]
+    hit = (found >= 0) & (touch_contact[touch] == contact) & (day - touch_day[touch] <= window)
+    return np.where(hit, touch, -1)
+
+
+class LeadAttribution:
+    """Per-webinar lead funnel from registrations and CRM lead-stage records.
+
+    ``webinars`` has ``Webinar ID`` and ``Date``; ``leads`` has
+    ``Contact ID``, ``Email``, ``Stage`` and ``Stage Date``. Registrations
+    arrive in named batches (e.g. store partitions) through :meth:`update`,
+    so a batch can be replaced without touching the others.
+    """
+
+    def __init__(self, webinars, leads, window=ATTRIBUTION_DAYS):
+        self.window = window
+        self.stages = list(STAGE_COLUMNS)
+        self._webinars = pd.Index(webinars['Webinar ID'])
+        self._webinar_days = _days(webinars['Date'])
+
+        # Contact and email dictionaries of the CRM side
+        contacts = pc.dictionary_encode(pa.array(leads['Contact ID'], type=pa.string()))
+        self._stage_contact = contacts.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+        emails = normalize_emails(leads['Email'])
+        self._emails = pc.unique(emails)
+        self._email_contact = np.full(len(self._emails), -1, dtype=np.int64)
+        self._email_contact[pc.index_in(emails, value_set=self._emails).to_numpy(zero_copy_only=False)] = self._stage_contact
+
+        self._stage = pd.Index(self.stages).get_indexer(leads['Stage'])
+        self._stage_day = _days(leads['Stage Date'])
+        self._credited = np.full(len(leads), -1, dtype=np.int64)
+
+        self.registrations = np.zeros(len(self._webinars), dtype=np.int64)
+        self.counts = np.zeros((len(self._webinars), len(self.stages)), dtype=np.int64)
+        self._batches = {}
+
+    def encode(self, registrations):
+        """(contact code, webinar position, attended) arrays of registration rows; -1 where unmatched."""
+        codes = pc.index_in(normalize_emails(registrations['Email']), value_set=self._emails)
+        codes = codes.to_numpy(zero_copy_only=False)
+        matched = ~np.isnan(codes) if codes.dtype.kind == 'f' else np.ones(len(codes), dtype=bool)
+        contact = np.full(len(codes), -1, dtype=np.int64)
+        contact[matched] = self._email_contact[codes[matched].astype(np.int64)]
+        webinar = self._webinars.get_indexer(registrations['Webinar ID'])
+        return contact, webinar, np.asarray(registrations['Attended'], dtype=bool)
+
+    def update(self, batches):
+        """Replace registration batches, ``{name: frame or None}``; None drops the batch."""
+        touched = []
+        for name, frame in batches.items():
+            previous = self._batches.pop(name, None)
+            if previous is not None:
+                self._count_registrations(previous, -1)
+                touched.append(previous[0])
+            if frame is not None and len(frame):
+                batch = self.encode(frame)
+                self._batches[name] = batch
+                self._count_registrations(batch, 1)
+                touched.append(batch[0])
+        if touched:
+            contacts = np.unique(np.concatenate(touched))
+            self._credit(contacts[contacts >= 0])
+        return self
+
+    def _count_registrations(self, batch, sign):
+        webinar = batch[1][batch[1] >= 0]
+        self.registrations += sign * np.bincount(webinar, minlength=len(self._webinars))
+
+    def _credit(self, contacts):
+        # Re-credit the stage records of ``contacts`` against all attended registrations
+        records = np.flatnonzero(np.isin(self._stage_contact, contacts) & (self._stage >= 0))
+        previous = self._credited[records]
+        was = previous >= 0
+        np.subtract.at(self.counts, (previous[was], self._stage[records][was]), 1)
+
+        if self._batches:
+            contact, webinar, attended = (np.concatenate(parts) for parts in zip(*self._batches.values()))
+            touch = attended & (webinar >= 0) & np.isin(contact, contacts)
+            touch_contact, touch_webinar = contact[touch], webinar[touch]
+            found = last_touch(
+                touch_contact, self._webinar_days[touch_webinar],
+                self._stage_contact[records], self._stage_day[records], self.window
+            )
+            credited = np.where(found >= 0, touch_webinar[np.clip(found, 0, None)], -1) if len(touch_webinar) else found
+        else:
+            credited = np.full(len(records), -1, dtype=np.int64)
+
+        self._credited[records] = credited
+        now = credited >= 0
+        np.add.at(self.counts, (credited[now], self._stage[records][now]), 1)
+
+    def funnel(self):
+        """Registrations and credited stages per webinar, with ``MQL Rate`` and ``SQL Rate`` in percent."""
+        funnel = pd.DataFrame(self.counts, index=self._webinars, columns=list(STAGE_COLUMNS.values()))
+        funnel.insert(0, 'Registrations', self.registrations)
+        funnel['MQL Rate'] = (funnel['MQLs'] / funnel['Registrations'].where(funnel['Registrations'] > 0) * 100).round(1)
+        funnel['SQL Rate'] = (funnel['SQLs'] / funnel['MQLs'].where(funnel['MQLs'] > 0) * 100).round(1)
+        return funnel
+
+
+class StoreLeadAttribution:
+    """A :class:`LeadAttribution` kept current with the store.
+
+    Registration month partitions whose files changed since the last
+    :meth:`refresh` are re-read and replace their batch; a change to the
+    webinars or the CRM leads rebuilds the join.
+    """
+
+    def __init__(self, store, window=ATTRIBUTION_DAYS):
+        self.store = store
+        self.window = window
+        self.attribution = None
+        self._versions = {}
+        self._partitions = {}
+        self._funnel = None
+        self._lock = threading.Lock()
+
+    def _rebuild(self):
+        webinars = self.store.read('webinars', columns=['Webinar ID', 'Date'])
+        leads = self.store.read('crm_leads', columns=['Contact ID', 'Email', 'Stage', 'Stage Date'])
+        self.attribution = LeadAttribution(webinars, leads, self.window)
+        self._partitions = {}
+
+    def _refresh_registrations(self):
+        partitions = self.store.partitions('webinar_registrations')
+        changed = changed_partitions(self._partitions, partitions)
+        reload = [key for key in changed if key in partitions]
+        batches = dict.fromkeys(changed)
+        if reload:
+            rows = self.store.scan_partitions(
+                'webinar_registrations', reload, columns=['Webinar ID', 'Email', 'Attended']
+            ).to_pandas()
+            for (year, month), batch in rows.groupby(['year', 'month']):
+                batches[(int(year), int(month))] = batch
+        self.attribution.update(batches)
+        self._partitions = partitions
+
+    def refresh(self):
+        """Fold in whatever changed; returns the per-webinar funnel (read-only)."""
+        with self._lock:
+            versions = {dataset: self.store.version(dataset) for dataset in ('webinars', 'crm_leads', 'webinar_registrations')}
+            if versions != self._versions:
+                if any(versions[d] != self._versions.get(d) for d in ('webinars', 'crm_leads')):
+                    self._rebuild()
+                self._refresh_registrations()
+                self._versions = versions
+                self._funnel = self.attribution.funnel()
+        return self._funnel
@@ -0,0 +1,188 @@
+"""Process warm-up for the dashboard server.
+
+Imports the heavy modules every page needs, loads the shared datasets and
+image renditions, and pre-renders the landing page once per process, so the first visitor after
+a deploy does not pay for any of it. Timings of each step are kept as a
+report that can be written out and compared from release to release.
+
+Run ``python -m utils.bootstrap`` for a cold-start report from a fresh
+interpreter, or start the server through ``serve.py`` to warm it in-process.
+"""
+
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+LANDING_PAGE = APP_ROOT / "app.py"
+
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "pyarrow.dataset",
+    "plotly.graph_objects",
+    "plotly.express",
+    "PIL.Image",
+    "streamlit",
+]
+
+_lock = threading.Lock()
+_report = None
+_thread = None
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def preload_modules(modules=HEAVY_MODULES):
+    """Import ``modules`` and return milliseconds spent per module.
+
+    Modules already in ``sys.modules`` report 0, so timings are only a
+    cold-start measure when taken in a fresh interpreter.
+    """
+    timings = {}
+    for name in modules:
+        already_loaded = name in sys.modules
+        timings[name] = 0.0 if already_loaded else _timed(lambda: importlib.import_module(name))
+    return timings
+
+
+def preload_datasets():
+    """Open the store and run the queries the pages make on first render."""
+    from utils.data_store import get_store
+    from utils.queries import (
+        TIME_PERIODS, competitor_table, conversion_funnel, daily_anomalies, data_through,
+        kpi_rollups, landing_page_stats, marketing_cube, period_bounds, registration_curves, roi_trend,
+        webinar_aggregates, webinar_catalog, webinar_lead_funnel, webinar_trends
+    )
+    from utils.sample_data import COMPANIES, COMPETITIVE_TABLES
+
+    timings = {}
+    timings["store"] = _timed(get_store)
+    timings["kpi_rollups"] = _timed(kpi_rollups)
+    timings["marketing_cube"] = _timed(marketing_cube)
+    timings["anomalies"] = _timed(daily_anomalies)
+    timings["roi_trend"] = _timed(roi_trend)
+    timings["funnel"] = _timed(conversion_funnel)
+    timings["webinars"] = _timed(lambda: webinar_catalog(date.today()))
+    timings["webinar_trends"] = _timed(webinar_trends)
+    timings["webinar_aggregates"] = _timed(webinar_aggregates)
+    timings["registration_curves"] = _timed(lambda: registration_curves(date.today()))
+    timings["webinar_leads"] = _timed(webinar_lead_funnel)
+    # Default time period of the Digital Marketing page
+    default_period = period_bounds(TIME_PERIODS[0], data_through(date.today()))
+    timings["landing_pages"] = _timed(lambda: landing_page_stats(*default_period))
+
+    # Page defaults of the Competitive Intelligence filters
+    default_competitors = COMPANIES[:3]
+    timings["competitive"] = _timed(lambda: [
+        competitor_table(table, default_competitors, "Last 30 Days") for table in COMPETITIVE_TABLES
+    ])
+    return timings
+
+
+def preload_images():
+    """Fetch and encode the image renditions the pages display."""
+    from utils.assets import COLUMN_WIDTHS, fetch_sources, image_asset
+
+    fetch_sources()
+
+    renditions = [
+        ("campaign_analytics", "half"),
+        ("webinar_management", "half"),
+        ("workflow_canvas", "three_quarters"),
+        ("webinar_management", "third"),
+        ("product_interest", "third"),
+        ("event_follow_up", "third"),
+    ]
+    for name, column in renditions:
+        image_asset(name, COLUMN_WIDTHS[column])
+
+
+def prerender_landing_page():
+    """Run ``app.py`` headlessly so its figures land in the figure cache."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(LANDING_PAGE), default_timeout=120).run()
+    if app.exception:
+        raise RuntimeError(f"Landing page failed to render: {app.exception[0].value}")
+
+
+def warm_up(prerender=True):
+    """Warm the current process once and return the timing report."""
+    global _report
+
+    with _lock:
+        if _report is not None:
+            return _report
+
+        started = time.perf_counter()
+        report = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "imports_ms": preload_modules(),
+            "datasets_ms": preload_datasets(),
+            "images_ms": _timed(preload_images),
+        }
+        if prerender:
+            report["landing_page_ms"] = _timed(prerender_landing_page)
+        report["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        logger.info("Warm-up finished in %.0f ms", report["total_ms"])
+        _report = report
+        return report
+
+
+def warm_up_in_background(prerender=True):
+    """Start :func:`warm_up` on a daemon thread, once per process."""
+    global _thread
+
+    if _thread is None:
+        _thread = threading.Thread(target=warm_up, kwargs={"prerender": prerender}, name="warm-up", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def last_report():
+    return _report
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure dashboard cold-start time.")
+    parser.add_argument("--output", help="Write the timing report as JSON to this path")
+    parser.add_argument("--no-prerender", action="store_true", help="Skip rendering the landing page")
+    args = parser.parse_args(argv)
+
+    os.chdir(APP_ROOT)
+    if str(APP_ROOT) not in sys.path:
+        sys.path.insert(0, str(APP_ROOT))
+
+    report = warm_up(prerender=not args.no_prerender)
+    if args.output:
+        write_report(report, args.output)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
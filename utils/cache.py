@@ -0,0 +1,152 @@
+"""Result cache for page computations.
+
+Entries are keyed by the function, its (filter state) arguments and the
+data version of the store datasets it reads, expire after a TTL, and are
+evicted least-recently-used once the cache is full. Writes to the store
+drop the entries that depend on the written dataset. Callers missing on
+the same key at the same time share one computation.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_ENTRIES = 512
+
+_MISSING = object()
+
+
+def _freeze(value):
+    # Filter state arrives as lists (multiselect) and dicts; make it hashable
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < now:
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, datasets=(), ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, frozenset(datasets), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, datasets=(), ttl=None):
+        """Value of ``key``, calling ``compute()`` on a miss.
+
+        Only the first caller to miss computes; callers missing on the same
+        key meanwhile wait for its result (or its exception).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] >= time.monotonic():
+                return entry[2]
+            flight = self._pending.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._pending[key] = Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            self.set(key, value, datasets=datasets, ttl=ttl)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def invalidate(self, dataset=None):
+        """Drop every entry depending on ``dataset`` (or everything)."""
+        with self._lock:
+            if dataset is None:
+                self._entries.clear()
+                return
+            stale = [key for key, entry in self._entries.items() if dataset in entry[1]]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+result_cache = ResultCache()
+
+
+def cached(datasets=(), ttl=None, cache=None):
+    """Cache a function's result by arguments and store data version.
+
+    Functions are identified by module and qualified name rather than by
+    object identity, so functions defined inside a page script keep
+    hitting the same entries across reruns.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from utils.data_store import get_store
+
+            target = cache or result_cache
+            store = get_store()
+            versions = tuple(store.version(dataset) for dataset in datasets)
+            key = (name, _freeze(args), _freeze(kwargs), versions)
+
+            return target.get_or_compute(key, lambda: func(*args, **kwargs), datasets=datasets, ttl=ttl)
+
+        wrapper.cache_name = name
+        return wrapper
+
+    return decorator
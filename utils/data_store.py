@@ -0,0 +1,282 @@
+"""Date-partitioned Parquet store for dashboard metrics.
+
+Each dataset lives in its own directory under the store root and is
+partitioned hive-style by ``year=YYYY/month=M`` on its date column, so a
+range query only opens the partitions that overlap the range and only
+decodes the columns it asks for.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MANIFEST_FILE = "_manifest.json"
+PARTITION_KEYS = ["year", "month"]
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int16()), ("month", pa.int8())]),
+    flavor="hive"
+)
+
+
+def _to_timestamp(value):
+    if value is None:
+        return None
+    return pd.Timestamp(value)
+
+
+def _partition_filter(start, end):
+    # Expressions on the partition keys only, so pyarrow prunes whole
+    # directories before touching any file
+    expr = None
+    if start is not None:
+        lower = (ds.field("year") > start.year) | (
+            (ds.field("year") == start.year) & (ds.field("month") >= start.month)
+        )
+        expr = lower
+    if end is not None:
+        upper = (ds.field("year") < end.year) | (
+            (ds.field("year") == end.year) & (ds.field("month") <= end.month)
+        )
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+def changed_partitions(known, current):
+    """Sorted ``(year, month)`` keys whose files differ between two :meth:`MetricsStore.partitions` maps."""
+    return sorted(key for key in set(known) | set(current) if known.get(key) != current.get(key))
+
+
+class MetricsStore:
+    """Partitioned columnar storage with a per-dataset data version."""
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get("VERATHON_DATA_DIR", DEFAULT_DATA_DIR))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._date_columns = {}
+        self._manifest = ({}, None)
+        self._listeners = []
+
+    # Manifest ---------------------------------------------------------
+
+    def _manifest_path(self):
+        return self.root / MANIFEST_FILE
+
+    def _load_manifest(self):
+        # Re-read only when another writer (thread or process) changed it
+        path = self._manifest_path()
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        manifest, cached_mtime = self._manifest
+        if cached_mtime != mtime:
+            with open(path) as f:
+                manifest = json.load(f)
+            self._manifest = (manifest, mtime)
+        return manifest
+
+    def _save_manifest(self, manifest):
+        tmp = self._manifest_path().with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._manifest_path())
+        self._manifest = (manifest, self._manifest_path().stat().st_mtime_ns)
+
+    def datasets(self):
+        return sorted(self._load_manifest())
+
+    def has(self, dataset):
+        return dataset in self._load_manifest()
+
+    def version(self, dataset=None):
+        """Return the data version of ``dataset``, or of the whole store.
+
+        Versions only ever increase, so they can be used as cache keys.
+        """
+        manifest = self._load_manifest()
+        if dataset is None:
+            return sum(entry["version"] for entry in manifest.values())
+        return manifest.get(dataset, {}).get("version", 0)
+
+    def date_column(self, dataset):
+        if dataset not in self._date_columns:
+            self._date_columns[dataset] = self._load_manifest()[dataset]["date_column"]
+        return self._date_columns[dataset]
+
+    # Writes -----------------------------------------------------------
+
+    def write(self, dataset, df, date_column="Date", mode="append"):
+        """Write ``df`` into ``dataset`` partitioned by ``date_column``.
+
+        ``mode="overwrite"`` replaces the partitions touched by ``df``;
+        ``mode="append"`` adds a new file next to the existing ones.
+        """
+        if mode not in ("append", "overwrite"):
+            raise ValueError(f"Unknown write mode: {mode}")
+
+        frame = df.copy()
+        frame[date_column] = pd.to_datetime(frame[date_column])
+        frame["year"] = frame[date_column].dt.year.astype("int16")
+        frame["month"] = frame[date_column].dt.month.astype("int8")
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+
+        with self._lock:
+            manifest = self._load_manifest()
+            entry = dict(manifest.get(dataset, {"version": 0, "date_column": date_column}))
+            if entry["date_column"] != date_column:
+                raise ValueError(
+                    f"Dataset '{dataset}' is partitioned on '{entry['date_column']}', not '{date_column}'"
+                )
+            next_version = entry["version"] + 1
+
+            ds.write_dataset(
+                table,
+                self.root / dataset,
+                format="parquet",
+                partitioning=PARTITIONING,
+                basename_template=f"part-{next_version}-{{i}}.parquet",
+                existing_data_behavior=(
+                    "delete_matching" if mode == "overwrite" else "overwrite_or_ignore"
+                ),
+            )
+
+            entry["version"] = next_version
+            entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            manifest = dict(manifest, **{dataset: entry})
+            self._save_manifest(manifest)
+            self._date_columns[dataset] = date_column
+
+        for callback in list(self._listeners):
+            callback(dataset)
+        return next_version
+
+    def subscribe(self, callback):
+        """Call ``callback(dataset)`` after every write to the store."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    # Reads ------------------------------------------------------------
+
+    def _dataset(self, dataset):
+        if not self.has(dataset):
+            raise KeyError(f"Unknown dataset: {dataset}")
+        return ds.dataset(self.root / dataset, format="parquet", partitioning=PARTITIONING)
+
+    def partitions(self, dataset):
+        """Map each ``(year, month)`` partition of ``dataset`` to its file names.
+
+        Every write creates files with a new name, so a changed set of
+        names means the partition changed.
+        """
+        files = {}
+        for path in map(Path, self._dataset(dataset).files):
+            year = int(path.parent.parent.name.split("=", 1)[1])
+            month = int(path.parent.name.split("=", 1)[1])
+            files.setdefault((year, month), set()).add(path.name)
+        return {key: frozenset(names) for key, names in files.items()}
+
+    def scan_partitions(self, dataset, keys, columns=None):
+        """Arrow table of the ``(year, month)`` partitions ``keys``, with ``year`` and ``month`` columns."""
+        data = self._dataset(dataset)
+        expr = None
+        for year, month in keys:
+            partition = (ds.field("year") == year) & (ds.field("month") == month)
+            expr = partition if expr is None else expr | partition
+        return data.to_table(columns=self._columns(data, columns) + PARTITION_KEYS, filter=expr)
+
+    def columns(self, dataset):
+        schema = self._dataset(dataset).schema
+        return [name for name in schema.names if name not in PARTITION_KEYS]
+
+    def _expression(self, dataset, start, end, filter):
+        date_column = self.date_column(dataset)
+        start = _to_timestamp(start)
+        end = _to_timestamp(end)
+
+        expr = _partition_filter(start, end)
+        if start is not None:
+            expr = expr & (ds.field(date_column) >= pa.scalar(start.to_pydatetime()))
+        if end is not None:
+            # End dates are inclusive of the whole day
+            end_of_day = end.normalize() + pd.Timedelta(days=1)
+            expr = expr & (ds.field(date_column) < pa.scalar(end_of_day.to_pydatetime()))
+        if filter is not None:
+            expr = filter if expr is None else expr & filter
+        return expr
+
+    def _columns(self, data, columns):
+        if columns is None:
+            return [name for name in data.schema.names if name not in PARTITION_KEYS]
+        return list(columns)
+
+    def scan(self, dataset, columns=None, start=None, end=None, filter=None):
+        """Return an Arrow table for the requested slice of ``dataset``.
+
+        ``start``/``end`` are inclusive bounds on the dataset's date column
+        and are pushed down both to partition pruning and to the Parquet
+        row-group statistics. ``filter`` is an optional extra
+        ``pyarrow.dataset`` expression.
+        """
+        data = self._dataset(dataset)
+        expr = self._expression(dataset, start, end, filter)
+        return data.to_table(columns=self._columns(data, columns), filter=expr)
+
+    def count(self, dataset, start=None, end=None, filter=None):
+        """Number of rows :meth:`scan` would return with the same bounds.
+
+        Without a filter the count comes from the Parquet footers alone.
+        """
+        expr = self._expression(dataset, start, end, filter)
+        return self._dataset(dataset).count_rows(filter=expr)
+
+    def head(self, dataset, n, columns=None, start=None, end=None, filter=None):
+        """First ``n`` matching rows in storage order, reading only as far as needed."""
+        data = self._dataset(dataset)
+        expr = self._expression(dataset, start, end, filter)
+        return data.head(n, columns=self._columns(data, columns), filter=expr)
+
+    def read(self, dataset, columns=None, start=None, end=None, filter=None):
+        """Like :meth:`scan`, but returns a pandas DataFrame sorted by date."""
+        table = self.scan(dataset, columns=columns, start=start, end=end, filter=filter)
+        df = table.to_pandas()
+        date_column = self.date_column(dataset)
+        if date_column in df.columns:
+            df = df.sort_values(date_column, kind="stable").reset_index(drop=True)
+        return df
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(root=None):
+    """Process-wide store, seeded with the sample datasets on first use.
+
+    The warm-up thread and the first page run may ask for it at the same
+    time; only one of them builds and seeds it.
+    """
+    store = _stores.get(root)
+    if store is not None:
+        return store
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            from utils.cache import result_cache
+            from utils.figure_cache import figure_cache
+            from utils.sample_data import seed_store
+
+            store = MetricsStore(root)
+            store.subscribe(result_cache.invalidate)
+            store.subscribe(figure_cache.invalidate)
+            seed_store(store)
+            _stores[root] = store
+    return store
@@ -0,0 +1,95 @@
+"""Server-side downsampling for line charts.
+
+Plotly draws every point it is sent, and a browser cannot show more
+distinct points per trace than the chart is pixels wide. Long series are
+reduced to at most ``max_points`` per trace before they reach the chart,
+with Largest-Triangle-Three-Buckets (which keeps the visual shape,
+including peaks) or min/max bucketing (which keeps every bucket's extremes
+exactly).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Rendered width (px) of a full-width chart in the wide page layout
+DEFAULT_MAX_POINTS = 1200
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb_indices(x, y, max_points):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps."""
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # First and last points are always kept; the rest is split into
+    # max_points - 2 buckets that each contribute one point
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) as the third vertex
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (avg_y - y[previous])
+        )
+        previous = lo + int(np.nanargmax(area)) if not np.isnan(area).all() else lo
+        keep[i + 1] = previous
+    return keep
+
+
+def minmax_indices(x, y, max_points):
+    """Indices of the end points and the minimum and maximum of each bucket, at most ``max_points``."""
+    n = len(y)
+    if max_points >= n or max_points < 2:
+        return np.arange(n)
+    y = _as_float(y)
+    # The two end points take one bucket's pair of the budget
+    edges = np.linspace(0, n, (max_points - 2) // 2 + 1).astype(int)
+    keep = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            bucket = y[lo:hi]
+            keep.extend([lo + int(np.nanargmin(bucket)), lo + int(np.nanargmax(bucket))])
+    return np.unique(keep)
+
+
+METHODS = {"lttb": lttb_indices, "minmax": minmax_indices}
+
+
+def downsample(df, x, y, color=None, max_points=DEFAULT_MAX_POINTS, method="lttb",
+               var_name="variable", value_name="value"):
+    """Reduce each trace of a line chart's data to at most ``max_points`` rows.
+
+    ``y`` is either one column, with traces split by ``color`` (long
+    format), or a list of columns (wide format, one trace per column). Wide
+    input comes back in long format with ``var_name``/``value_name``
+    columns, since the traces no longer share x values.
+    """
+    select = METHODS[method]
+    if isinstance(y, (list, tuple)):
+        df = df.melt(id_vars=[x], value_vars=list(y), var_name=var_name, value_name=value_name)
+        y, color = value_name, var_name
+
+    groups = df.groupby(color, sort=False) if color is not None else [(None, df)]
+    parts = []
+    for _, trace in groups:
+        trace = trace.sort_values(x, kind="stable")
+        parts.append(trace.iloc[select(trace[x].to_numpy(), trace[y].to_numpy(), max_points)])
+    if not parts:
+        return df.iloc[0:0]
+    return pd.concat(parts, ignore_index=True)
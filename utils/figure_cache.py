@@ -0,0 +1,56 @@
+"""Cache of built, serialized Plotly figures.
+
+Figures whose inputs rarely change (the landing page is all static
+content) are built once per (figure id, data version, theme) and kept as
+Plotly JSON, so later sessions and reruns skip the Plotly Express build
+and go straight to ``st.plotly_chart``.
+"""
+
+import hashlib
+import json
+
+import streamlit as st
+
+from utils.cache import ResultCache
+
+FIGURE_CACHE_SIZE = 256
+FIGURE_TTL = 24 * 60 * 60
+
+figure_cache = ResultCache(max_entries=FIGURE_CACHE_SIZE, ttl=FIGURE_TTL)
+
+_digests = {}
+
+
+def _builder_digest(build):
+    # Editing a builder (new literals, new styling) changes its bytecode and
+    # constants, which gives it a fresh cache key without a restart
+    code = build.__code__
+    digest = _digests.get(code)
+    if digest is None:
+        payload = code.co_code + repr(code.co_consts).encode()
+        digest = hashlib.blake2b(payload, digest_size=8).hexdigest()
+        _digests[code] = digest
+    return digest
+
+
+def figure_json(figure_id, build, datasets=(), theme="streamlit"):
+    """Return the serialized figure for ``figure_id``, building it on a miss.
+
+    ``build`` takes no arguments and returns a Plotly figure. ``datasets``
+    lists the store datasets it reads; their data version is part of the
+    key, and writes to them evict the figure. Sessions missing the same
+    figure at once share one build.
+    """
+    from utils.data_store import get_store
+
+    store = get_store()
+    versions = tuple(store.version(dataset) for dataset in datasets)
+    key = (figure_id, _builder_digest(build), versions, theme)
+
+    return figure_cache.get_or_compute(key, lambda: build().to_json(), datasets=datasets)
+
+
+def plotly_chart_cached(figure_id, build, datasets=(), theme="streamlit", **kwargs):
+    """``st.plotly_chart`` for a figure served from the figure cache."""
+    spec = figure_json(figure_id, build, datasets=datasets, theme=theme)
+    return st.plotly_chart(json.loads(spec), theme=theme, **kwargs)
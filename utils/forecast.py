@@ -0,0 +1,123 @@
+"""Registration forecasts for upcoming webinars.
+
+Past webinars give the typical registration curve: the share of a
+webinar's final registrations already in with ``d`` days to go. Curves
+are learned per webinar type and promotion lead time (how long before
+the webinar it was announced), as one ``types x lead times x days``
+array. Projecting an upcoming webinar divides its registrations so far
+by its curve's share at its days to go; all upcoming webinars are
+projected with one fancy-indexing lookup.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Promotion lead times (days from announcement to webinar) are bucketed at these edges
+LEAD_TIME_EDGES = [35, 56]
+
+# Curves reach back this many days before a webinar
+MAX_DAYS_LEFT = 180
+
+# Fewer completed webinars than this in a (type, lead time) cell: use the type's overall curve
+MIN_WEBINARS = 8
+
+# Webinars announced this recently have too few registrations to project; so
+# do webinars of a type with no completed webinars to learn a curve from
+JUST_ANNOUNCED_DAYS = 7
+
+# Projection / goal at or above which a webinar is On Track, resp. Needs Attention
+ON_TRACK_RATIO = 0.95
+ATTENTION_RATIO = 0.75
+
+PACE_STATUSES = ['On Track', 'Needs Attention', 'At Risk', 'Just Announced']
+
+# Smallest curve share a projection divides by
+_MIN_SHARE = 0.02
+
+
+def _lead_buckets(webinars):
+    lead_days = (webinars['Date'] - webinars['Announced']).dt.days.to_numpy()
+    return np.digitize(lead_days, LEAD_TIME_EDGES)
+
+
+def _day_numbers(values):
+    return np.asarray(pd.to_datetime(values), dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def _days_left(dates, when):
+    return np.clip(_day_numbers(dates) - _day_numbers(when), 0, MAX_DAYS_LEFT)
+
+
+class RegistrationCurves:
+    """Fitted share-of-final-registrations curves by type and lead time."""
+
+    def __init__(self, types, shares, sizes):
+        self.types = list(types)
+        self.shares = shares
+        # Completed webinars behind each (type, lead time) curve
+        self.sizes = sizes
+
+    @classmethod
+    def fit(cls, webinars, registrations, today):
+        """Learn the curves from the webinars held before ``today`` and their registrations.
+
+        Only types with held webinars get a curve.
+        """
+        n_buckets = len(LEAD_TIME_EDGES) + 1
+        held = webinars[webinars['Date'] < pd.Timestamp(today)]
+        types = sorted(held['Type'].unique())
+        cell = pd.Index(types).get_indexer(held['Type']) * n_buckets + _lead_buckets(held)
+        n_cells = len(types) * n_buckets
+
+        # Registrations of held webinars by cell and days to go
+        positions = pd.Index(held['Webinar ID']).get_indexer(registrations['Webinar ID'])
+        mine = positions >= 0
+        days_left = _days_left(held['Date'].to_numpy()[positions[mine]], registrations['Registered At'].to_numpy()[mine])
+        counts = np.bincount(
+            cell[positions[mine]] * (MAX_DAYS_LEFT + 1) + days_left, minlength=n_cells * (MAX_DAYS_LEFT + 1)
+        ).reshape(n_cells, MAX_DAYS_LEFT + 1).astype(float)
+
+        # Share already in with d days to go: registrations made d or more days before
+        received = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1]
+        totals = received[:, :1]
+        by_type = received.reshape(len(types), n_buckets, MAX_DAYS_LEFT + 1).sum(axis=1)
+        type_shares = by_type / np.maximum(by_type[:, :1], 1)
+
+        shares = (received / np.maximum(totals, 1)).reshape(len(types), n_buckets, MAX_DAYS_LEFT + 1)
+        sizes = np.bincount(cell, minlength=n_cells).reshape(len(types), n_buckets)
+        sparse = sizes < MIN_WEBINARS
+        shares[sparse] = np.broadcast_to(type_shares[:, None, :], shares.shape)[sparse]
+        # Held webinars without any registrations on record give no curve
+        shares[by_type[:, 0] == 0] = np.nan
+        return cls(types, shares, sizes)
+
+    def share(self, webinars, today):
+        """Expected share of final registrations already in, per webinar; NaN where its type has no curve."""
+        types = pd.Index(self.types, dtype=object).get_indexer(webinars['Type'])
+        if not self.types:
+            return np.full(len(webinars), np.nan)
+        shares = self.shares[np.clip(types, 0, None), _lead_buckets(webinars), _days_left(webinars['Date'], today)]
+        return np.where(types >= 0, shares, np.nan)
+
+    def project(self, webinars, today):
+        """Projected final registrations and pace status of upcoming ``webinars``.
+
+        Returns a frame aligned with ``webinars`` with ``Projected
+        Registrations`` and ``Status`` (one of :data:`PACE_STATUSES`).
+        Webinars whose type has no curve project to their registrations so
+        far and count as Just Announced.
+        """
+        share = self.share(webinars, today)
+        registrations = webinars['Registrations'].to_numpy(dtype=float)
+        projected = registrations / np.clip(np.nan_to_num(share, nan=1.0), _MIN_SHARE, 1.0)
+        ratio = projected / webinars['Registration Goal'].to_numpy(dtype=float)
+        live_days = (pd.Timestamp(today) - webinars['Announced']).dt.days.to_numpy()
+        status = np.select(
+            [(live_days < JUST_ANNOUNCED_DAYS) | np.isnan(share), ratio >= ON_TRACK_RATIO, ratio >= ATTENTION_RATIO],
+            PACE_STATUSES[3:] + PACE_STATUSES[:2],
+            default=PACE_STATUSES[2]
+        )
+        return pd.DataFrame(
+            {'Projected Registrations': np.round(projected).astype(np.int64), 'Status': status},
+            index=webinars.index
+        )
@@ -0,0 +1,108 @@
+"""Ordered-step funnel computed from raw event logs.
+
+A user enters the funnel at their first stage-0 event and reaches stage
+``k`` with the earliest stage-``k`` event that is not earlier than the
+time they reached stage ``k - 1`` and falls inside the conversion window
+counted from entry. Each stage is one vectorized pass over that stage's
+events with a per-user scatter-min (``np.minimum.at``), so the cost is
+linear in the number of events and no (user, time) sort is needed.
+
+The result is kept as a small dense cube of users by dimension values
+(device, channel, campaign, ...) and deepest stage reached, so counts for
+any slice are sums over the cube instead of a new pass over the events.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.ga4_ingest import NOT_SET
+
+_NOT_REACHED = np.iinfo(np.int64).max
+
+
+class FunnelEngine:
+    """Stage counts of an ordered funnel, sliceable by user dimensions."""
+
+    def __init__(self, stages, window, dimensions, labels, cube):
+        self.stages = list(stages)
+        self.window = window
+        self.dimensions = list(dimensions)
+        self.labels = labels
+        self._cube = cube
+
+    @classmethod
+    def from_events(cls, users, steps, timestamps, stages, window=pd.Timedelta(days=90), dimensions=None):
+        """Build the funnel from per-event arrays.
+
+        ``steps`` are stage positions (0 = first stage), ``window`` the
+        longest time allowed from entry to any later stage, and
+        ``dimensions`` maps a name to per-event values; a user's value is
+        the one on their entry event, and missing values count as ``(not set)``.
+        """
+        dimensions = dimensions or {}
+        user_codes, _ = pd.factorize(np.asarray(users))
+        n_users = int(user_codes.max()) + 1 if len(user_codes) else 0
+        steps = np.asarray(steps)
+        times = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64)
+        window_ns = pd.Timedelta(window).value
+
+        def earliest(event_users, event_times):
+            first = np.full(n_users, _NOT_REACHED, dtype=np.int64)
+            np.minimum.at(first, event_users, event_times)
+            return first
+
+        entry_mask = steps == 0
+        entry = earliest(user_codes[entry_mask], times[entry_mask])
+        entered = entry != _NOT_REACHED
+        deadline = np.where(entered, entry + window_ns, -1)
+        depth = entered.astype(np.int8)
+
+        reached = entry
+        for stage in range(1, len(stages)):
+            stage_mask = steps == stage
+            stage_users = user_codes[stage_mask]
+            stage_times = times[stage_mask]
+            ok = (stage_times >= reached[stage_users]) & (stage_times <= deadline[stage_users])
+            reached = earliest(stage_users[ok], stage_times[ok])
+            depth[reached != _NOT_REACHED] = stage + 1
+
+        # A user's dimension values are the ones on their entry event
+        entry_rows = np.flatnonzero(entry_mask)
+        entry_rows = entry_rows[times[entry_rows] == entry[user_codes[entry_rows]]]
+        names, labels, codes = [], {}, []
+        for name, values in dimensions.items():
+            value_codes, uniques = pd.factorize(pd.Series(np.asarray(values)).fillna(NOT_SET), sort=True)
+            per_user = np.zeros(n_users, dtype=np.int64)
+            per_user[user_codes[entry_rows]] = value_codes[entry_rows]
+            names.append(name)
+            labels[name] = list(uniques)
+            codes.append(per_user)
+
+        shape = tuple(len(labels[name]) for name in names) + (len(stages) + 1,)
+        flat = np.ravel_multi_index(tuple(codes) + (depth,), shape) if n_users else np.empty(0, dtype=np.int64)
+        cube = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        return cls(stages, window, names, labels, cube)
+
+    def counts(self, **filters):
+        """Users reaching each stage, optionally restricted per dimension.
+
+        ``filters`` maps a dimension name to the values to keep, e.g.
+        ``counts(Device=['Mobile'], Channel=['Email', 'Direct'])``.
+        """
+        cube = self._cube
+        for axis, name in enumerate(self.dimensions):
+            selected = filters.get(name)
+            if selected:
+                keep = np.isin(self.labels[name], list(selected))
+                cube = np.compress(keep, cube, axis=axis)
+        by_depth = cube.reshape(-1, cube.shape[-1]).sum(axis=0)
+        # Users at depth d reached stages 1..d; depth 0 never entered
+        return np.cumsum(by_depth[::-1])[::-1][1:]
+
+    def breakdown(self, dimension, **filters):
+        """Stage counts per value of ``dimension`` (rows) after ``filters``."""
+        return pd.DataFrame(
+            [self.counts(**dict(filters, **{dimension: [value]})) for value in self.labels[dimension]],
+            index=pd.Index(self.labels[dimension], name=dimension),
+            columns=self.stages
+        )
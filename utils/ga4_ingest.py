@@ -0,0 +1,308 @@
+"""Streaming ingestion of GA4 / BigQuery exports into the traffic dataset.
+
+Exports are read in fixed-size row chunks (CSV, or newline-delimited JSON
+as written by the BigQuery GA4 export, optionally gzipped), each row is
+classified into one of the dashboard's traffic sources, and the chunk is
+folded into a day-level rollup. Memory stays bounded by the chunk size and
+the number of days in the export, not by the size of the file.
+
+Every export is identified by the SHA-256 of its bytes and its daily
+totals are kept per export in the ``ga4_traffic`` dataset, so ingesting
+the same file twice is a no-op. The export's days replace those days in
+the ``traffic`` dataset and every other day is kept, so a later export of
+a day (a corrected re-export, say) supersedes the earlier one instead of
+adding to it. The export is only recorded once the rebuilds below have
+succeeded, so a failed ingest can be retried.
+
+The ``marketing`` facts behind the Digital Marketing cube are rescaled on
+the export's days only, so their visitors add up to the new traffic per
+day and channel: existing facts are scaled to the export's totals, and
+visits on channels without facts land in ``(not set)`` device, country
+and campaign cells. Other days keep their facts. Exports carry sessions
+only, so conversions, MQLs and spend stay as they were.
+
+Run ``python -m utils.ga4_ingest EXPORT [EXPORT ...]`` to load files.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from utils.data_store import get_store
+from utils.rollups import RollupEngine
+from utils.sample_data import TRAFFIC_SOURCES
+
+logger = logging.getLogger(__name__)
+
+EXPORTS_DATASET = 'ga4_traffic'
+TRAFFIC_DATASET = 'traffic'
+MARKETING_DATASET = 'marketing'
+MARKETING_CELL = ['Device', 'Country', 'Campaign']
+NOT_SET = '(not set)'
+CHUNK_ROWS = 100_000
+
+SOURCE_COLUMNS = list(TRAFFIC_SOURCES)
+
+# Accepted column names, in order of preference: BigQuery export (flattened
+# NDJSON), GA4 Data API / UI exports, then plain names
+DATE_FIELDS = ['event_date', 'date', 'Date']
+SOURCE_FIELDS = ['traffic_source.source', 'sessionSource', 'session_source', 'source', 'Source']
+MEDIUM_FIELDS = ['traffic_source.medium', 'sessionMedium', 'session_medium', 'medium', 'Medium']
+SESSIONS_FIELDS = ['sessions', 'Sessions']
+EVENT_NAME_FIELD = 'event_name'
+
+# Simplified GA4 default channel grouping, mapped onto the dashboard sources
+SEARCH_ENGINES = {
+    'google', 'bing', 'yahoo', 'duckduckgo', 'baidu', 'yandex', 'ecosia', 'ask', 'naver', 'aol'
+}
+SOCIAL_SOURCES = {
+    'facebook', 'facebook.com', 'm.facebook.com', 'l.facebook.com', 'instagram', 'instagram.com',
+    'linkedin', 'linkedin.com', 'lnkd.in', 't.co', 'twitter', 'twitter.com', 'x.com', 'youtube',
+    'youtube.com', 'reddit', 'reddit.com', 'pinterest', 'tiktok'
+}
+SOCIAL_MEDIUMS = {'social', 'social-network', 'social-media', 'sm', 'social network', 'social media'}
+EMAIL_MEDIUMS = {'email', 'e-mail', 'e_mail', 'e mail', 'newsletter'}
+PAID_MEDIUM_PATTERN = r'^(?:.*cp.*|ppc|retargeting|paid.*)$'
+
+
+def classify_sources(source, medium):
+    """Dashboard traffic source of each (source, medium) pair."""
+    source = pd.Series(source, dtype='string').fillna('').str.strip().str.lower()
+    medium = pd.Series(medium, dtype='string').fillna('').str.strip().str.lower()
+
+    # A search engine host like "www.google.com" counts as "google"
+    engine = source.str.replace(r'^(?:www\.)?([^.]+)\..*$', r'\1', regex=True)
+    is_direct = (source.isin(['(direct)', '']) & medium.isin(['(none)', '(not set)', '']))
+    is_email = medium.isin(EMAIL_MEDIUMS) | source.str.contains('email', regex=False)
+    is_social = source.isin(SOCIAL_SOURCES) | medium.isin(SOCIAL_MEDIUMS)
+    is_paid = medium.str.fullmatch(PAID_MEDIUM_PATTERN)
+    is_organic = (medium == 'organic') | engine.isin(SEARCH_ENGINES)
+
+    labels = np.select(
+        [is_direct, is_email, is_social, is_paid, is_organic],
+        ['Direct', 'Email', 'Social Media', 'Paid Search', 'Organic Search'],
+        default='Referral'
+    )
+    return pd.Series(labels, index=source.index)
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of the file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _open_text(path):
+    if str(path).endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def _is_ndjson(path):
+    suffixes = Path(path).suffixes
+    return bool({'.json', '.ndjson', '.jsonl'} & set(suffixes))
+
+
+def _pick(columns, candidates):
+    for name in candidates:
+        if name in columns:
+            return name
+    return None
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the export as DataFrames of at most ``chunk_rows`` rows."""
+    if _is_ndjson(path):
+        with _open_text(path) as f:
+            while True:
+                lines = [line for line in islice(f, chunk_rows) if line.strip()]
+                if not lines:
+                    break
+                # Nested records (traffic_source.source, ...) become dotted columns
+                yield pd.json_normalize([json.loads(line) for line in lines])
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        wanted = [
+            _pick(header, fields)
+            for fields in (DATE_FIELDS, SOURCE_FIELDS, MEDIUM_FIELDS, SESSIONS_FIELDS, [EVENT_NAME_FIELD])
+        ]
+        usecols = [name for name in wanted if name is not None]
+        yield from pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunk_rows)
+
+
+def _parse_dates(values):
+    values = values.astype('string').str.strip()
+    # BigQuery exports write event_date as YYYYMMDD
+    if values.str.fullmatch(r'\d{8}').all():
+        return pd.to_datetime(values, format='%Y%m%d')
+    return pd.to_datetime(values)
+
+
+def daily_sources(chunk):
+    """Visitors per day and traffic source in one export chunk.
+
+    Rows count as one visit each, unless the export carries a sessions
+    column (aggregated reports) or event names (raw BigQuery events, where
+    only ``session_start`` events count).
+    """
+    columns = chunk.columns
+    date_field = _pick(columns, DATE_FIELDS)
+    if date_field is None:
+        raise ValueError(f"Export has no date column (expected one of {DATE_FIELDS})")
+    source_field = _pick(columns, SOURCE_FIELDS)
+    medium_field = _pick(columns, MEDIUM_FIELDS)
+    sessions_field = _pick(columns, SESSIONS_FIELDS)
+
+    if sessions_field is not None:
+        weights = pd.to_numeric(chunk[sessions_field], errors='coerce').fillna(0).to_numpy()
+    elif EVENT_NAME_FIELD in columns:
+        weights = (chunk[EVENT_NAME_FIELD] == 'session_start').to_numpy(dtype=float)
+    else:
+        weights = np.ones(len(chunk))
+
+    empty = pd.Series('', index=chunk.index)
+    frame = pd.DataFrame({
+        'Date': _parse_dates(chunk[date_field]),
+        'Source': classify_sources(
+            chunk[source_field] if source_field else empty,
+            chunk[medium_field] if medium_field else empty
+        ),
+        'Visitors': weights
+    })
+    daily = frame.pivot_table(index='Date', columns='Source', values='Visitors', aggfunc='sum', fill_value=0)
+    return daily.reindex(columns=SOURCE_COLUMNS, fill_value=0).reset_index()
+
+
+def _already_ingested(store, digest):
+    if not store.has(EXPORTS_DATASET):
+        return False
+    rows = store.scan(EXPORTS_DATASET, columns=['Export'], filter=ds.field('Export') == digest)
+    return rows.num_rows > 0
+
+
+def _rebuild_traffic(store, export, start, end):
+    # Whole months, because an overwrite replaces every partition it touches:
+    # the export's days replace the stored ones, the month's other days are kept
+    days = export[['Date'] + SOURCE_COLUMNS].copy()
+    days['Date'] = pd.to_datetime(days['Date'])
+    days[SOURCE_COLUMNS] = days[SOURCE_COLUMNS].round().astype('int32')
+    if store.has(TRAFFIC_DATASET):
+        stored = store.read(TRAFFIC_DATASET, columns=['Date'] + SOURCE_COLUMNS, start=start, end=end)
+        stored['Date'] = pd.to_datetime(stored['Date'])
+        days = pd.concat([stored[~stored['Date'].isin(days['Date'])], days], ignore_index=True)
+    traffic = days.sort_values('Date', kind='stable').reset_index(drop=True)
+    store.write(TRAFFIC_DATASET, traffic, date_column='Date', mode='overwrite')
+
+
+def split_totals(totals, weights, groups):
+    """Integer shares of each group's total, proportional to ``weights`` (largest remainder).
+
+    ``totals`` holds the group total on every row of the group; the shares
+    of a group add up to its total exactly.
+    """
+    weights = pd.Series(np.asarray(weights, dtype=float))
+    groups = pd.Series(np.asarray(groups))
+    raw = np.asarray(totals, dtype=float) * (weights / weights.groupby(groups).transform('sum')).to_numpy()
+    shares = np.floor(raw)
+    short = np.asarray(totals, dtype=float) - pd.Series(shares).groupby(groups).transform('sum').to_numpy()
+    rank = pd.Series(raw - shares).groupby(groups).rank(method='first', ascending=False).to_numpy()
+    return (shares + (rank <= np.round(short))).astype(np.int64)
+
+
+def _rebuild_marketing(store, export, start, end):
+    # Scale the facts of the export's days so their visitors per channel equal
+    # the export; the months' other days keep their facts as they are
+    if not store.has(MARKETING_DATASET):
+        return
+    facts = store.read(MARKETING_DATASET, start=start, end=end)
+    dtypes = facts.dtypes
+    targets = export.melt(id_vars='Date', value_vars=SOURCE_COLUMNS, var_name='Channel', value_name='Target')
+    targets['Date'] = pd.to_datetime(targets['Date'])
+    targets['Target'] = targets['Target'].round().astype(np.int64)
+    facts['Date'] = pd.to_datetime(facts['Date'])
+    exported = facts['Date'].isin(targets['Date'])
+    kept, facts = facts[~exported], facts[exported]
+    facts = facts.merge(targets, on=['Date', 'Channel'], how='left')
+    facts['Target'] = facts['Target'].fillna(0)
+    facts['Visitors'] = facts['Visitors'].astype(np.int64)
+
+    group = facts['Date'].dt.strftime('%Y%m%d') + facts['Channel']
+    covered = facts['Visitors'].groupby(group).transform('sum') > 0
+    facts.loc[covered, 'Visitors'] = split_totals(facts.loc[covered, 'Target'], facts.loc[covered, 'Visitors'], group[covered])
+
+    # Visits on days and channels the facts have no visitors for
+    has_visitors = facts.loc[covered, ['Date', 'Channel']].drop_duplicates()
+    missing = targets[targets['Target'] > 0].merge(has_visitors, how='left', indicator=True)
+    missing = missing[missing['_merge'] == 'left_only']
+    unset = pd.DataFrame({'Date': missing['Date'], 'Channel': missing['Channel'], 'Visitors': missing['Target']})
+    for column in MARKETING_CELL:
+        unset[column] = NOT_SET
+
+    measures = [column for column in facts.columns if column not in ['Date', 'Channel', 'Target'] + MARKETING_CELL]
+    facts = pd.concat([facts.drop(columns='Target'), unset], ignore_index=True)
+    facts[measures] = facts[measures].fillna(0)
+    facts = facts[(facts[measures] != 0).any(axis=1)]
+    facts = pd.concat([kept, facts], ignore_index=True).astype({column: dtypes[column] for column in measures})
+    facts = facts.sort_values('Date', kind='stable').reset_index(drop=True)
+    store.write(MARKETING_DATASET, facts, date_column='Date', mode='overwrite')
+
+
+def ingest_export(path, store=None, chunk_rows=CHUNK_ROWS):
+    """Load one GA4 export into the traffic dataset (and the matching marketing facts).
+
+    Returns a summary dict; ``skipped`` is true when the same file was
+    ingested before.
+    """
+    store = store or get_store()
+    digest = file_digest(path)
+    summary = {'path': str(path), 'export': digest, 'rows': 0, 'days': 0, 'skipped': False}
+    if _already_ingested(store, digest):
+        summary['skipped'] = True
+        return summary
+
+    rollup = RollupEngine(SOURCE_COLUMNS)
+    for chunk in iter_chunks(path, chunk_rows):
+        summary['rows'] += len(chunk)
+        rollup.add_frame(daily_sources(chunk), 'Date')
+
+    daily = rollup.daily_frame('Date')
+    if daily.empty:
+        return summary
+    daily['Export'] = digest
+    summary['days'] = len(daily)
+
+    start = pd.Timestamp(rollup.first_day).replace(day=1)
+    end = pd.Timestamp(rollup.last_day) + pd.offsets.MonthEnd(0)
+    _rebuild_traffic(store, daily, start, end)
+    _rebuild_marketing(store, daily, start, end)
+    # Last, so an ingest that failed above is not taken for done on a retry
+    store.write(EXPORTS_DATASET, daily, date_column='Date', mode='append')
+    logger.info("Ingested %s: %d rows over %d days", path, summary['rows'], summary['days'])
+    return summary
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load GA4 exports into the traffic dataset.")
+    parser.add_argument("exports", nargs="+", help="CSV or NDJSON export files (optionally .gz)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows read per chunk")
+    args = parser.parse_args(argv)
+
+    for path in args.exports:
+        print(json.dumps(ingest_export(path, chunk_rows=args.chunk_rows)))
+
+
+if __name__ == "__main__":
+    main()
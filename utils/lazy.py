@@ -0,0 +1,35 @@
+"""Tabs and expanders whose hidden content is not computed.
+
+``st.tabs`` and ``st.expander`` normally run the body of every section on
+each rerun, hidden or not. The helpers here create them with state
+tracking (``on_change="rerun"``), so switching a tab or opening an
+expander reruns the script with the new selection, and
+:func:`is_open` tells the body whether to build its data and figures at
+all. A closed section gets a placeholder instead, shown only for the
+moment it takes the rerun to fill it.
+"""
+
+import streamlit as st
+
+PLACEHOLDER = "Loading…"
+
+
+def lazy_tabs(labels, key):
+    """``st.tabs`` that reruns on selection; wrap each body in :func:`is_open`."""
+    return st.tabs(labels, key=key, on_change="rerun")
+
+
+def lazy_expander(label, key, expanded=False):
+    """``st.expander`` that reruns when opened or closed."""
+    return st.expander(label, expanded=expanded, key=key, on_change="rerun")
+
+
+def is_open(section):
+    """Whether ``section`` is the selected tab or an open expander.
+
+    A closed section gets the placeholder; skip its body when this is False.
+    """
+    if section.open:
+        return True
+    section.caption(PLACEHOLDER)
+    return False
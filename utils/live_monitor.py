@@ -0,0 +1,178 @@
+"""Live counters for webinars in progress.
+
+Join, leave, poll and question events come from a feed: a JSON-lines file
+an integration appends to (:class:`FileFeed`, read on from the last offset
+on every tick) or a recorded session played back against the wall clock
+(:class:`ReplayFeed`). :class:`LiveMonitor` folds each batch of new
+events into per-webinar counters in one vectorized pass: attendees
+present now and at peak, unique attendees, poll responses and questions.
+A tick costs in proportion to the events since the previous tick, not to
+the session so far. One monitor serves every session viewing the page, so
+it polls its feed at most once per ``interval``; ticks in between return
+the current counters without touching the feed or the history.
+"""
+
+import json
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+EVENT_COLUMNS = ['Timestamp', 'Webinar ID', 'Attendee', 'Event']
+
+EVENT_TYPES = ['join', 'leave', 'poll', 'question']
+
+COUNTERS = ['Attending', 'Peak', 'Joined', 'Poll Responses', 'Questions']
+
+# Seconds between polls of the feed, however many sessions tick the monitor
+TICK_SECONDS = 2
+
+# Polls of per-webinar attendance kept for the live chart (an hour at TICK_SECONDS)
+HISTORY_TICKS = 1800
+
+
+def _empty_events():
+    return pd.DataFrame({column: pd.Series(dtype='datetime64[ns]' if column == 'Timestamp' else object)
+                         for column in EVENT_COLUMNS})
+
+
+class FileFeed:
+    """Events appended to a JSON-lines file, one object per line with :data:`EVENT_COLUMNS`."""
+
+    def __init__(self, path):
+        self.path = path
+        self.source = f"Live feed {path}"
+        self._offset = 0
+
+    def poll(self, now=None):
+        """Events written since the previous poll (complete lines only)."""
+        try:
+            with open(self.path, 'rb') as feed:
+                feed.seek(self._offset)
+                chunk = feed.read()
+        except FileNotFoundError:
+            return _empty_events()
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return _empty_events()
+        self._offset += end
+        rows = [json.loads(line) for line in chunk[:end].splitlines() if line.strip()]
+        events = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+        events['Timestamp'] = pd.to_datetime(events['Timestamp'])
+        return events
+
+
+class ReplayFeed:
+    """A recorded session released as the wall clock passes each event's offset.
+
+    Timestamps are shifted so the recording starts when the feed is
+    created; ``speed`` > 1 plays it back faster.
+    """
+
+    def __init__(self, events, source="Replay", speed=1.0, started=None):
+        events = events.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+        self.started = pd.Timestamp(started or pd.Timestamp.now())
+        self.source = source
+        self.speed = speed
+        offsets = events['Timestamp'] - events['Timestamp'].min() if len(events) else events['Timestamp']
+        self._offsets = (offsets / speed).to_numpy(dtype='timedelta64[ns]')
+        self._events = events.assign(Timestamp=self.started + pd.to_timedelta(self._offsets))
+        self._next = 0
+
+    @property
+    def finished(self):
+        return self._next >= len(self._events)
+
+    def poll(self, now=None):
+        """Events whose replay time has passed since the previous poll."""
+        elapsed = (pd.Timestamp(now or pd.Timestamp.now()) - self.started).to_timedelta64()
+        upto = int(np.searchsorted(self._offsets, elapsed, side='right'))
+        batch = self._events.iloc[self._next:upto]
+        self._next = max(self._next, upto)
+        return batch
+
+
+class LiveMonitor:
+    """Per-webinar attendance and engagement counters fed from an event feed."""
+
+    def __init__(self, feed, interval=TICK_SECONDS):
+        self.feed = feed
+        self.interval = pd.Timedelta(seconds=interval)
+        self.counters = pd.DataFrame(columns=COUNTERS, dtype=np.int64)
+        self._updated_at = None
+        self._present = pd.Series(dtype=bool)
+        self._history = deque(maxlen=HISTORY_TICKS)
+        self._lock = threading.Lock()
+
+    @property
+    def source(self):
+        return self.feed.source
+
+    @property
+    def updated_at(self):
+        """When the feed was last polled."""
+        with self._lock:
+            return self._updated_at
+
+    def _fold(self, events):
+        webinars = events['Webinar ID'].to_numpy()
+        counters = self.counters.reindex(self.counters.index.union(pd.unique(webinars)), fill_value=0)
+        kind = events['Event'].to_numpy()
+
+        # Presence: a join or leave only counts when it flips the attendee's state
+        moves = np.isin(kind, ['join', 'leave'])
+        if moves.any():
+            webinar = webinars[moves]
+            keys = pd.Series(webinar) + '\x1f' + events.loc[moves, 'Attendee'].astype(str).to_numpy()
+            codes, uniques = pd.factorize(keys)
+            state = kind[moves] == 'join'
+            known = self._present.reindex(uniques, fill_value=False).to_numpy(dtype=bool)
+
+            # Stable sort by attendee keeps each attendee's moves in time order
+            order = np.argsort(codes, kind='stable')
+            sorted_codes, sorted_state = codes[order], state[order]
+            follows = np.r_[False, sorted_codes[1:] == sorted_codes[:-1]]
+            prior = np.empty(len(codes), dtype=bool)
+            prior[order] = np.where(follows, np.r_[False, sorted_state[:-1]], known[sorted_codes])
+            delta = state.astype(np.int64) - prior
+
+            # Attendance after every move, for the peak within the batch
+            attending = counters['Attending'].reindex(webinar).to_numpy()
+            running = attending + pd.Series(delta).groupby(webinar).cumsum().to_numpy()
+            peaks = pd.Series(running).groupby(webinar).max()
+            counters['Peak'] = np.maximum(counters['Peak'], peaks.reindex(counters.index, fill_value=0))
+            counters['Attending'] += pd.Series(delta).groupby(webinar).sum().reindex(counters.index, fill_value=0)
+
+            # Latest state per attendee; those joining for the first time count as joined
+            last = order[np.r_[sorted_codes[1:] != sorted_codes[:-1], True]]
+            latest = pd.Series(state[last], index=uniques[codes[last]])
+            seen = latest.index.isin(self._present.index)
+            tracked = seen | (np.bincount(codes[state], minlength=len(uniques)) > 0)[codes[last]]
+            fresh = tracked & ~seen
+            counters['Joined'] += pd.Series(webinar[last][fresh]).value_counts().reindex(counters.index, fill_value=0)
+            self._present = pd.concat([self._present.drop(latest.index[tracked], errors='ignore'), latest[tracked]])
+
+        for event, column in (('poll', 'Poll Responses'), ('question', 'Questions')):
+            hits = pd.Series(webinars[kind == event]).value_counts()
+            counters[column] += hits.reindex(counters.index, fill_value=0)
+        return counters
+
+    def tick(self, now=None):
+        """Fold in the events since the last poll, if ``interval`` has passed; returns the counters (read-only)."""
+        now = pd.Timestamp(now or pd.Timestamp.now())
+        with self._lock:
+            if self._updated_at is not None and now - self._updated_at < self.interval:
+                return self.counters
+            events = self.feed.poll(now)
+            if len(events):
+                self.counters = self._fold(events.reset_index(drop=True))
+            self._updated_at = now
+            for webinar_id, attending in self.counters['Attending'].items():
+                self._history.append((now, webinar_id, attending))
+            return self.counters
+
+    def history(self):
+        """Attendance per webinar at each tick: ``Timestamp``, ``Webinar ID``, ``Attending``."""
+        with self._lock:
+            return pd.DataFrame(list(self._history), columns=['Timestamp', 'Webinar ID', 'Attending'])
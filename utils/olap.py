@@ -0,0 +1,135 @@
+"""In-memory OLAP cube over daily marketing facts.
+
+Facts are kept column-wise: the date as a day offset, every dimension
+dictionary-encoded to the smallest integer type that holds its codes, and
+one NumPy array per measure. Rows are sorted by date, so a date range is a
+binary search and a slice; dimension filters are a lookup of each code in
+a boolean table, and a roll-up is one ``np.bincount`` per measure over the
+combined group codes. That keeps any slice or cross-filter combination in
+the milliseconds and the whole cube a fraction of the equivalent frames.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from utils.ga4_ingest import NOT_SET
+
+DATE = 'Date'
+
+
+def _code_dtype(n_values):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class Cube:
+    """Measures addressed by date and dictionary-encoded dimensions."""
+
+    def __init__(self, origin, days, codes, labels, measures):
+        self.origin = origin
+        self._days = days
+        self._codes = codes
+        self.labels = labels
+        self._measures = measures
+
+    @classmethod
+    def from_frame(cls, df, date_column, dimensions, measures):
+        """Build the cube from a long frame with one row per fact; missing dimension values count as ``(not set)``."""
+        df = df.sort_values(date_column, kind='stable')
+        dates = pd.to_datetime(df[date_column]).dt.normalize()
+        origin = dates.min().date() if len(dates) else date.today()
+        days = ((dates - pd.Timestamp(origin)) // pd.Timedelta(days=1)).to_numpy(dtype=np.int32)
+
+        codes, labels = {}, {}
+        for name in dimensions:
+            values, uniques = pd.factorize(df[name].fillna(NOT_SET), sort=True)
+            codes[name] = values.astype(_code_dtype(len(uniques)))
+            labels[name] = list(uniques)
+        values = {name: df[name].to_numpy() for name in measures}
+        return cls(origin, days, codes, labels, values)
+
+    @property
+    def dimensions(self):
+        return list(self._codes)
+
+    @property
+    def measures(self):
+        return list(self._measures)
+
+    @property
+    def nbytes(self):
+        arrays = [self._days, *self._codes.values(), *self._measures.values()]
+        return sum(array.nbytes for array in arrays)
+
+    def __len__(self):
+        return len(self._days)
+
+    def _day(self, d):
+        return (pd.Timestamp(d) - pd.Timestamp(self.origin)).days
+
+    def _rows(self, start, end, filters):
+        # Date range as a slice of the date-sorted rows, then a row mask
+        lo = 0 if start is None else np.searchsorted(self._days, self._day(start), side='left')
+        hi = len(self._days) if end is None else np.searchsorted(self._days, self._day(end), side='right')
+        rows = slice(lo, hi)
+        mask = None
+        for name, selected in filters.items():
+            if name not in self._codes:
+                raise KeyError(f"Unknown dimension: {name}")
+            if not selected:
+                continue
+            keep = np.isin(self.labels[name], list(selected))
+            hits = keep[self._codes[name][rows]]
+            mask = hits if mask is None else mask & hits
+        return rows, mask
+
+    def rollup(self, by=(), measures=None, start=None, end=None, **filters):
+        """Measure sums grouped by ``by`` (dimensions and/or ``'Date'``).
+
+        ``filters`` maps a dimension to the values to keep, e.g.
+        ``rollup(['Channel'], Device=['Mobile'], Country=['Germany'])``;
+        empty selections keep everything. Groups without facts are left out.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        measures = list(measures) if measures is not None else self.measures
+        rows, mask = self._rows(start, end, filters)
+
+        def take(array):
+            array = array[rows]
+            return array if mask is None else array[mask]
+
+        keys, sizes = [], []
+        for name in by:
+            if name == DATE:
+                days = take(self._days)
+                first = int(days.min()) if len(days) else 0
+                keys.append(days - first)
+                sizes.append(int(days.max()) - first + 1 if len(days) else 1)
+            else:
+                keys.append(take(self._codes[name]))
+                sizes.append(len(self.labels[name]))
+        n_groups = int(np.prod(sizes)) if by else 1
+        group = np.ravel_multi_index(keys, sizes) if by else np.zeros(len(take(self._days)), dtype=np.intp)
+
+        present = np.bincount(group, minlength=n_groups) > 0
+        positions = np.unravel_index(np.flatnonzero(present), sizes) if by else ()
+        result = {}
+        for name, index in zip(by, positions):
+            if name == DATE:
+                result[name] = pd.Timestamp(self.origin) + pd.to_timedelta(index + first, unit='D')
+            else:
+                result[name] = np.asarray(self.labels[name], dtype=object)[index]
+        for name in measures:
+            values = take(self._measures[name])
+            sums = np.bincount(group, weights=values, minlength=n_groups)[present]
+            result[name] = sums.round().astype(np.int64) if values.dtype.kind in 'iu' else sums
+        return pd.DataFrame(result, columns=by + measures)
+
+    def totals(self, measures=None, start=None, end=None, **filters):
+        """Measure sums over the slice as a dict."""
+        frame = self.rollup((), measures, start, end, **filters)
+        return {name: (frame[name].iloc[0] if len(frame) else 0) for name in frame.columns}
@@ -0,0 +1,228 @@
+"""Server-paginated tables.
+
+``st.dataframe`` serializes every row it is given. :func:`paginated_table`
+instead asks a table source for the row count and for one sorted,
+filtered page at a time, so only the visible window is sent to the
+browser. Sources push the work down as far as they can:
+
+- :class:`FrameSource` wraps an in-memory frame and keeps per-column value
+  indices and sort orders, so filtering is a dictionary lookup and paging
+  a sorted column is a slice. Get it through :func:`frame_source`, which
+  keeps it across reruns for as long as the frame's contents don't change.
+- :class:`StoreSource` wraps a metrics store dataset; filters become
+  pyarrow expressions, unfiltered counts come from Parquet metadata and an
+  unsorted page only reads up to its last row.
+
+Filters are ``(column, op, value)`` tuples with ``op`` either ``"in"``
+(value is a list) or ``"contains"`` (case-insensitive substring).
+"""
+
+import hashlib
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import streamlit as st
+
+from utils.data_store import get_store
+from utils.table_format import colored_dataframe
+
+DEFAULT_PAGE_SIZE = 25
+
+
+class FrameSource:
+    """Table source over a pandas DataFrame."""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self._indices = {}
+        self._orders = {}
+
+    @property
+    def columns(self):
+        return list(self.df.columns)
+
+    def _value_index(self, column):
+        if column not in self._indices:
+            self._indices[column] = self.df.groupby(column, sort=False).indices
+        return self._indices[column]
+
+    def _positions(self, filters):
+        # Row positions passing every filter, or None for "all rows"
+        positions = None
+        for column, op, value in filters:
+            if op == 'in':
+                index = self._value_index(column)
+                parts = [index[v] for v in value if v in index]
+                matched = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            elif op == 'contains':
+                candidates = self.df[column] if positions is None else self.df[column].iloc[positions]
+                hits = candidates.astype(str).str.contains(value, case=False, regex=False).to_numpy()
+                matched = candidates.index.to_numpy()[hits]
+            else:
+                raise ValueError(f"Unknown filter operator: {op}")
+            positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+        return positions
+
+    def _order(self, column, ascending):
+        if column not in self._orders:
+            values = self.df[column]
+            nulls = values.isna().to_numpy()
+            valid = np.flatnonzero(~nulls)
+            ranked = valid[values.iloc[valid].argsort(kind='stable').to_numpy()]
+            self._orders[column] = (ranked, np.flatnonzero(nulls))
+        ranked, nulls = self._orders[column]
+        # Missing values go last either way, as in pandas
+        return np.concatenate([ranked if ascending else ranked[::-1], nulls])
+
+    def count(self, filters=()):
+        positions = self._positions(filters)
+        return len(self.df) if positions is None else len(positions)
+
+    def page(self, filters=(), sort=None, ascending=True, offset=0, limit=DEFAULT_PAGE_SIZE):
+        positions = self._positions(filters)
+        if sort is not None:
+            order = self._order(sort, ascending)
+            rows = order if positions is None else order[np.isin(order, positions)]
+        else:
+            rows = np.arange(len(self.df)) if positions is None else positions
+        return self.df.iloc[rows[offset:offset + limit]]
+
+
+def _fingerprint(df):
+    # Content hash of a frame, or None when its cells aren't hashable
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        return None
+    return tuple(df.columns), hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def frame_source(df, key):
+    """A :class:`FrameSource` over ``df`` that survives reruns while ``df``'s contents are unchanged.
+
+    Pages rebuild their frames on every rerun; reusing the source keeps its
+    value indices and sort orders, so only the first render pays for them.
+    """
+    state_key = f"{key}_source"
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] is df:
+        return cached[2]
+    fingerprint = _fingerprint(df)
+    if cached is not None and fingerprint is not None and cached[1] == fingerprint:
+        source = cached[2]
+    else:
+        source = FrameSource(df)
+    st.session_state[state_key] = (df, fingerprint, source)
+    return source
+
+
+class StoreSource:
+    """Table source over a metrics store dataset."""
+
+    def __init__(self, dataset, columns=None, start=None, end=None, store=None):
+        self.store = store or get_store()
+        self.dataset = dataset
+        self.start = start
+        self.end = end
+        self._columns = list(columns) if columns is not None else None
+
+    @property
+    def columns(self):
+        return self._columns or self.store.columns(self.dataset)
+
+    def _expression(self, filters):
+        expr = None
+        for column, op, value in filters:
+            if op == 'in':
+                term = ds.field(column).isin(list(value))
+            elif op == 'contains':
+                term = pc.match_substring(ds.field(column), value, ignore_case=True)
+            else:
+                raise ValueError(f"Unknown filter operator: {op}")
+            expr = term if expr is None else expr & term
+        return expr
+
+    def count(self, filters=()):
+        return self.store.count(self.dataset, start=self.start, end=self.end, filter=self._expression(filters))
+
+    def page(self, filters=(), sort=None, ascending=True, offset=0, limit=DEFAULT_PAGE_SIZE):
+        bounds = dict(start=self.start, end=self.end, filter=self._expression(filters))
+        if sort is None:
+            table = self.store.head(self.dataset, offset + limit, columns=self._columns, **bounds)
+        else:
+            table = self.store.scan(self.dataset, columns=self._columns, **bounds)
+            # Only the top offset + limit rows need ordering
+            keys = [(sort, 'ascending' if ascending else 'descending')]
+            top = pc.select_k_unstable(table, k=min(offset + limit, table.num_rows), sort_keys=keys)
+            table = table.take(top).sort_by(keys)
+        return table.slice(offset, limit).to_pandas()
+
+
+def _filters(key, filter_options, search_column):
+    filters = []
+    if search_column:
+        text = st.text_input(f"Search {search_column}", key=f"{key}_search")
+        if text:
+            filters.append((search_column, 'contains', text))
+    for column, options in (filter_options or {}).items():
+        selected = st.multiselect(column, options, key=f"{key}_filter_{column}")
+        if selected:
+            filters.append((column, 'in', selected))
+    return filters
+
+
+def paginated_table(source, key, page_size=DEFAULT_PAGE_SIZE, filter_options=None, search_column=None,
+                    sort_columns=None, default_sort=None, descending=False, colors=None, **dataframe_kwargs):
+    """Render one page of ``source`` with search, filter, sort and paging controls.
+
+    ``filter_options`` maps columns to the values offered in a multiselect;
+    ``default_sort``/``descending`` set the initial ordering; ``colors`` maps columns to ``{value: color}``
+    and shows them as colored tags. Remaining keyword arguments go to ``st.dataframe``.
+    """
+    controls = st.columns(2) if (filter_options or search_column) else None
+    if controls:
+        with controls[0]:
+            filters = _filters(key, filter_options, search_column)
+    else:
+        filters = []
+
+    sort_columns = sort_columns or source.columns
+    with controls[1] if controls else st.container():
+        sort_col, order_col = st.columns([3, 2])
+        with sort_col:
+            options = ['(none)'] + list(sort_columns)
+            default = options.index(default_sort) if default_sort in options else 0
+            sort = st.selectbox("Sort by", options, index=default, key=f"{key}_sort")
+        with order_col:
+            order = st.radio(
+                "Order", ["Ascending", "Descending"], index=int(descending), horizontal=True, key=f"{key}_order"
+            )
+    sort = None if sort == '(none)' else sort
+
+    total = source.count(filters)
+    pages = max(math.ceil(total / page_size), 1)
+    # Back to the first page whenever the result set changes
+    signature = (tuple((c, op, tuple(v) if isinstance(v, list) else v) for c, op, v in filters), sort, order)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_page"] = 1
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+
+    page_col, info_col = st.columns([1, 3])
+    with page_col:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    offset = (page - 1) * page_size
+    window = source.page(filters, sort=sort, ascending=order == "Ascending", offset=offset, limit=page_size)
+    with info_col:
+        first = offset + 1 if total else 0
+        st.caption(f"Rows {first:,}–{offset + len(window):,} of {total:,}")
+
+    if colors:
+        colored_dataframe(window, colors, column_configs=dataframe_kwargs.pop('column_config', None), **dataframe_kwargs)
+    else:
+        st.dataframe(window, **dataframe_kwargs)
+    return window
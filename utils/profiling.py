@@ -0,0 +1,220 @@
+"""Section-level render profiling for the dashboard pages.
+
+A page calls :func:`profile_page` after ``st.set_page_config`` and
+``finish()`` on the returned profiler at the end of the script. In
+between, every ``st.title``/``st.header``/``st.subheader`` starts a new
+section, and the wall time of each section is split into
+
+- ``figure_ms``: building Plotly figures (``px.*``, ``go.Figure``, ``update_*``)
+- ``emit_ms``: Streamlit element and widget calls, including serialization
+- ``data_ms``: everything else, i.e. preparing the data
+
+Profiling is off unless ``VERATHON_PROFILE=1`` is set, which logs every
+finished rerun as one JSON line on the ``verathon.profile`` logger (to
+stderr), or the page URL has ``?profile=1``, which shows the breakdown in
+a debug panel at the bottom of that page. The split comes from timing
+wrappers installed around those calls the first time a run is profiled;
+they only record anything on the thread of a script run being profiled.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+logger = logging.getLogger("verathon.profile")
+
+QUERY_PARAM = "profile"
+ENV_FLAG = "VERATHON_PROFILE"
+
+SECTION_LEVELS = {"title": 0, "header": 1, "subheader": 2}
+# Containers only open a block; what is rendered inside them is timed on its own
+LAYOUT_METHODS = {
+    "columns", "tabs", "expander", "container", "empty", "form", "popover", "sidebar", "dialog",
+}
+FIGURE_METHODS = [
+    "__init__", "add_trace", "add_traces", "update_layout", "update_traces",
+    "update_xaxes", "update_yaxes", "add_annotation", "add_shape",
+]
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class PageProfiler:
+    """Timings of one script run, grouped by page section."""
+
+    def __init__(self, page):
+        self.page = page
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.perf_counter()
+        self.sections = []
+        self._path = []
+        self._open("Page setup")
+
+    def _open(self, name):
+        self.sections.append({
+            "section": name, "data_ms": 0.0, "figure_ms": 0.0, "emit_ms": 0.0,
+            "_start": time.perf_counter(),
+        })
+
+    def _close(self):
+        section = self.sections[-1]
+        total = (time.perf_counter() - section.pop("_start")) * 1000
+        section["total_ms"] = round(total, 2)
+        section["data_ms"] = round(max(total - section["figure_ms"] - section["emit_ms"], 0.0), 2)
+        section["figure_ms"] = round(section["figure_ms"], 2)
+        section["emit_ms"] = round(section["emit_ms"], 2)
+
+    def start_section(self, level, title):
+        # "Header / Subheader" paths, reset by any heading at or above a level
+        self._path = self._path[:level] + [str(title)]
+        self._close()
+        self._open(" / ".join(self._path))
+
+    def add(self, phase, elapsed):
+        self.sections[-1][f"{phase}_ms"] += elapsed * 1000
+
+    def finish(self):
+        """Close the last section, log the run and show the debug panel."""
+        if getattr(_local, "profiler", None) is self:
+            _local.profiler = None
+        self._close()
+        # The "Page setup" lead-in is usually empty when a title comes first
+        self.sections = [s for s in self.sections if s["total_ms"] >= 0.1]
+        report = {
+            "event": "page_render",
+            "page": self.page,
+            "run_id": self.run_id,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "sections": self.sections,
+        }
+        if logging_enabled():
+            logger.info(json.dumps(report))
+        if debug_enabled():
+            _render_panel(report)
+        return report
+
+
+class _Disabled:
+    """Stands in for a profiler when profiling is off."""
+
+    def finish(self):
+        return None
+
+
+_DISABLED = _Disabled()
+
+
+def _truthy(value):
+    return value.lower() in ("1", "true", "yes")
+
+
+def logging_enabled():
+    return _truthy(os.environ.get(ENV_FLAG, ""))
+
+
+def debug_enabled():
+    return _truthy(st.query_params.get(QUERY_PARAM, ""))
+
+
+def _configure_logger():
+    # Python's default WARNING level would drop the INFO reports
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+
+def _render_panel(report):
+    import pandas as pd
+
+    with st.expander(f"Render profile: {report['total_ms']:.0f} ms", expanded=True):
+        sections = pd.DataFrame(report["sections"])[
+            ["section", "data_ms", "figure_ms", "emit_ms", "total_ms"]
+        ]
+        st.dataframe(sections.sort_values("total_ms", ascending=False), hide_index=True, use_container_width=True)
+        st.caption(f"Run {report['run_id']}")
+
+
+def _timed(phase, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_local, "profiler", None)
+        # Only the outermost call is timed, so px.line -> go.Figure or
+        # st.write -> st.dataframe is not counted twice
+        if profiler is None or getattr(_local, "busy", False):
+            return fn(*args, **kwargs)
+        _local.busy = True
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.busy = False
+            profiler.add(phase, time.perf_counter() - started)
+    return wrapper
+
+
+def _section(level, fn):
+    @functools.wraps(fn)
+    def wrapper(self, body, *args, **kwargs):
+        profiler = getattr(_local, "profiler", None)
+        if profiler is not None and not getattr(_local, "busy", False):
+            profiler.start_section(level, body)
+        return fn(self, body, *args, **kwargs)
+    return wrapper
+
+
+def _install():
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        for name in dir(DeltaGenerator):
+            if name.startswith("_") or name in LAYOUT_METHODS:
+                continue
+            method = getattr(DeltaGenerator, name)
+            if not callable(method) or isinstance(method, property):
+                continue
+            wrapped = _timed("emit", method)
+            if name in SECTION_LEVELS:
+                wrapped = _section(SECTION_LEVELS[name], wrapped)
+            setattr(DeltaGenerator, name, wrapped)
+            # st.header etc. are methods bound to the main container at import
+            alias = getattr(st, name, None)
+            if getattr(alias, "__func__", None) is method:
+                setattr(st, name, getattr(alias.__self__, name))
+
+        for name in FIGURE_METHODS:
+            setattr(go.Figure, name, _timed("figure", getattr(go.Figure, name)))
+        for name in dir(px):
+            fn = getattr(px, name)
+            if not name.startswith("_") and callable(fn) and not isinstance(fn, type):
+                setattr(px, name, _timed("figure", fn))
+        if logging_enabled():
+            _configure_logger()
+        _installed = True
+
+
+def profile_page(page):
+    """Start profiling the current script run of ``page``; a no-op unless profiling is enabled."""
+    if not (logging_enabled() or debug_enabled()):
+        _local.profiler = None
+        return _DISABLED
+    _install()
+    profiler = PageProfiler(page)
+    _local.profiler = profiler
+    _local.busy = False
+    return profiler
@@ -0,0 +1,349 @@
+"""Typed query functions the dashboard pages read their data through."""
+
+import os
+import threading
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from utils.anomalies import detect_anomalies
+from utils.attribution import StoreLeadAttribution
+from utils.cache import cached
+from utils.data_store import get_store
+from utils.forecast import RegistrationCurves
+from utils.funnel import FunnelEngine
+from utils.live_monitor import FileFeed, LiveMonitor, ReplayFeed
+from utils.olap import Cube
+from utils.rollups import StoreRollups
+from utils.sample_data import CAMPAIGNS, COMPETITIVE_TABLES, FUNNEL_STAGES, TRAFFIC_SOURCES, build_session_events
+from utils.sessions import StoreLandingPages
+from utils.trends import RollingTrends, WebinarTrends
+from utils.webinar_aggregates import WebinarAggregates
+from utils.webinar_catalog import WebinarCatalog
+
+TRAFFIC_SOURCE_COLUMNS = list(TRAFFIC_SOURCES)
+
+# Days of competitive snapshots averaged per analysis timeframe
+TIMEFRAME_DAYS = {
+    'Last 30 Days': 30,
+    'Last Quarter': 91,
+    'Last 6 Months': 182,
+    'Year to Date': None
+}
+
+TIME_PERIODS = ['Last 7 Days', 'Last 30 Days', 'Last Quarter', 'Year to Date', 'Custom']
+
+# Dimensions the conversion funnel can be sliced by
+FUNNEL_DIMENSIONS = ['Device', 'Channel', 'Campaign']
+
+# Dataset -> the KPI measures it provides
+KPI_SOURCES = {
+    'traffic': TRAFFIC_SOURCE_COLUMNS,
+    'conversions': ['Conversions', 'MQLs', 'Spend']
+}
+
+KPI_MEASURES = [measure for measures in KPI_SOURCES.values() for measure in measures]
+
+# Dimensions and measures of the daily marketing cube
+MARKETING_DIMENSIONS = ['Channel', 'Device', 'Country', 'Campaign']
+
+MARKETING_MEASURES = ['Visitors', 'MQLs', 'Opportunities', 'Spend', 'Revenue']
+
+# Date ranges of landing-page stats kept up to date at once
+LANDING_PAGE_RANGES = 8
+
+# JSON-lines file of live webinar events; without it the monitor replays sample sessions
+LIVE_FEED_ENV = 'VERATHON_LIVE_FEED'
+
+
+def _isin(column, values):
+    # Typed array so an empty selection still binds against string columns
+    return ds.field(column).isin(pa.array(list(values), type=pa.string()))
+
+
+def roi_trend(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channels: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Monthly ROI per marketing channel in long format (Date, Channel, ROI)."""
+    expr = _isin('Channel', channels) if channels is not None else None
+    return get_store().read('roi_trend', columns=['Date', 'Channel', 'ROI'], start=start, end=end, filter=expr)
+
+
+@cached(datasets=['cvent_events'])
+def cvent_sync_status() -> pd.DataFrame:
+    """Number of Cvent events per sync status (Status, Count), most common first."""
+    statuses = get_store().read('cvent_events', columns=['Sync Status'])['Sync Status']
+    return statuses.value_counts().rename_axis('Status').reset_index(name='Count')
+
+
+@cached(datasets=['competitive'])
+def competitor_table(table: str, competitors: Sequence[str], timeframe: str = 'Last 30 Days') -> pd.DataFrame:
+    """Competitive benchmark ``table`` with one column per selected company.
+
+    Values are averaged over the snapshots in ``timeframe``, counted back
+    from the latest snapshot. Columns follow the order of ``competitors``.
+    The result is cached; treat it as read-only.
+    """
+    label = COMPETITIVE_TABLES[table][0]
+    expr = (ds.field('Table') == table) & _isin('Company', competitors)
+    rows = get_store().read(
+        'competitive',
+        columns=['Snapshot Date', 'Position', 'Row', 'Company', 'Value'],
+        filter=expr
+    )
+
+    if not rows.empty:
+        latest = rows['Snapshot Date'].max()
+        days = TIMEFRAME_DAYS[timeframe]
+        window_start = latest.replace(month=1, day=1) if days is None else latest - pd.Timedelta(days=days)
+        rows = rows[rows['Snapshot Date'] >= window_start]
+
+    wide = rows.pivot_table(index=['Position', 'Row'], columns='Company', values='Value', aggfunc='mean')
+    wide = wide.reset_index(level='Position', drop=True).reset_index()
+    wide.columns.name = None
+    wide = wide.rename(columns={'Row': label})
+
+    companies = [c for c in competitors if c in wide.columns]
+    wide = wide[[label] + companies]
+    for company in companies:
+        if (wide[company] % 1 == 0).all():
+            wide[company] = wide[company].astype('int64')
+    return wide
+
+
+def period_bounds(time_period: str, today: date, start: Optional[date] = None, end: Optional[date] = None) -> tuple:
+    """Inclusive (start, end) dates of a dashboard time period selection.
+
+    Relative periods end on ``today``; pass :func:`data_through` to anchor
+    them to the data rather than the calendar.
+    """
+    if time_period == 'Last 7 Days':
+        return today - timedelta(days=6), today
+    if time_period == 'Last 30 Days':
+        return today - timedelta(days=29), today
+    if time_period == 'Last Quarter':
+        # Previous full calendar quarter
+        quarter_start = date(today.year, 3 * ((today.month - 1) // 3) + 1, 1)
+        last_end = quarter_start - timedelta(days=1)
+        return date(last_end.year, last_end.month - 2, 1), last_end
+    if time_period == 'Year to Date':
+        return date(today.year, 1, 1), today
+    if time_period == 'Custom':
+        return min(start, end), max(start, end)
+    raise ValueError(f"Unknown time period: {time_period}")
+
+
+# Incrementally maintained engines, one per kind, store and variant (e.g. a date range)
+_live_engines = {}
+_live_engines_lock = threading.Lock()
+
+
+def _live_engine(kind, factory, variant=None, keep=None):
+    # With ``keep``, only the ``keep`` most recently used variants of a kind stay alive
+    store = get_store()
+    key = (kind, store.root, variant)
+    with _live_engines_lock:
+        engine = _live_engines.pop(key, None)
+        if engine is None:
+            engine = factory(store)
+        _live_engines[key] = engine
+        if keep is not None:
+            variants = [other for other in _live_engines if other[:2] == key[:2]]
+            for stale in variants[:-keep]:
+                del _live_engines[stale]
+    return engine
+
+
+def kpi_rollups() -> StoreRollups:
+    """Day/week/month rollups of traffic, conversions, MQLs and spend.
+
+    The rollups live for the whole process and only re-read the month
+    partitions that changed since the last call, so calling this on every
+    KPI refresh is cheap. Read them through ``totals``, ``daily_frame``
+    and ``last_day``, which wait for a refresh in progress.
+    """
+    return _live_engine('kpi', lambda store: StoreRollups(store, KPI_SOURCES)).refresh()
+
+
+def data_through(today: date) -> date:
+    """Last day with KPI data, at most ``today``.
+
+    Relative time periods end here, so a store that was seeded (or last
+    ingested) a few days ago doesn't show "Last 7 Days" as half empty.
+    """
+    last_day = kpi_rollups().last_day
+    return today if last_day is None else min(today, last_day)
+
+
+def kpi_totals(start: date, end: date) -> dict:
+    """Totals of every KPI measure over ``start``..``end``, plus derived KPIs."""
+    totals = kpi_rollups().totals(start, end)
+    visitors = sum(totals[source] for source in TRAFFIC_SOURCE_COLUMNS)
+    totals['Visitors'] = visitors
+    totals['Conversion Rate'] = totals['Conversions'] / visitors * 100 if visitors else 0.0
+    totals['Cost per MQL'] = totals['Spend'] / totals['MQLs'] if totals['MQLs'] else 0.0
+    return totals
+
+
+@cached(datasets=['marketing'])
+def marketing_cube() -> Cube:
+    """Daily marketing facts by channel, device, country and campaign.
+
+    Slice and roll it up with ``rollup(['Channel'], start=..., Device=[...])``;
+    that does not read the store again.
+    """
+    facts = get_store().read('marketing', columns=['Date'] + MARKETING_DIMENSIONS + MARKETING_MEASURES)
+    return Cube.from_frame(facts, 'Date', MARKETING_DIMENSIONS, MARKETING_MEASURES)
+
+
+@cached(datasets=['traffic', 'conversions', 'marketing'])
+def daily_anomalies() -> pd.DataFrame:
+    """Anomalous days across every traffic source, KPI tile, channel and campaign.
+
+    All series are scanned together as one matrix; the result has one row
+    per flagged day with ``Group``, ``Series``, ``Date``, ``Value``,
+    ``Baseline`` and ``Z``. Cached per data version; treat it as read-only.
+    """
+    daily = kpi_rollups().daily_frame('Date').set_index('Date')
+    kpis = pd.DataFrame({'Visitors': daily[TRAFFIC_SOURCE_COLUMNS].sum(axis=1), 'MQLs': daily['MQLs']})
+    kpis['Conversion Rate'] = daily['Conversions'] / kpis['Visitors'].where(kpis['Visitors'] > 0) * 100
+    kpis['Cost per MQL'] = daily['Spend'] / daily['MQLs'].where(daily['MQLs'] > 0)
+
+    cube = marketing_cube()
+    channels = cube.rollup(['Date', 'Channel'], ['MQLs']).pivot(index='Date', columns='Channel', values='MQLs')
+    campaigns = cube.rollup(['Date', 'Campaign'], ['Visitors']).pivot(index='Date', columns='Campaign', values='Visitors')
+
+    series = pd.concat(
+        {
+            'Traffic': daily[TRAFFIC_SOURCE_COLUMNS],
+            'KPI': kpis,
+            'Channel MQLs': channels.fillna(0),
+            'Campaign Visitors': campaigns.fillna(0)
+        },
+        axis=1,
+        names=['Group', 'Series']
+    )
+    return detect_anomalies(series)
+
+
+@cached(datasets=['funnel_events'])
+def conversion_funnel(window_days: int = 90) -> FunnelEngine:
+    """Marketing funnel over the event log, with a ``window_days`` conversion window.
+
+    Slice it with ``counts(Device=[...], ...)``; that does not touch the events again.
+    """
+    events = get_store().read('funnel_events', columns=['User ID', 'Stage', 'Timestamp'] + FUNNEL_DIMENSIONS)
+    return FunnelEngine.from_events(
+        events['User ID'],
+        events['Stage'],
+        events['Timestamp'],
+        FUNNEL_STAGES,
+        window=timedelta(days=window_days),
+        dimensions={name: events[name] for name in FUNNEL_DIMENSIONS}
+    )
+
+
+@cached(datasets=['webinars'])
+def webinar_catalog(today: date) -> WebinarCatalog:
+    """Every webinar, indexed for filtering; statuses are as of ``today``.
+
+    Filter it with ``rows(start=..., Status=[...], Type=[...])`` or
+    ``select(...)``; that does not read the store again.
+    """
+    return WebinarCatalog(get_store().read('webinars'), today)
+
+
+@cached(datasets=['webinars', 'webinar_registrations'])
+def registration_curves(today: date) -> RegistrationCurves:
+    """Registration curves by webinar type and lead time, fitted on the webinars held before ``today``.
+
+    Only the fit is cached; project upcoming webinars with
+    ``project(upcoming, today)``.
+    """
+    store = get_store()
+    return RegistrationCurves.fit(
+        store.read('webinars', columns=['Webinar ID', 'Date', 'Announced', 'Type']),
+        store.read('webinar_registrations', columns=['Webinar ID', 'Registered At']),
+        today
+    )
+
+
+def webinar_trends() -> RollingTrends:
+    """Weekly registrations and attendees per webinar type, region and product line.
+
+    Each series carries its trailing 4-week mean; read them with
+    ``frame(groups=[...], start=...)``. Like :func:`kpi_rollups`, the
+    trends live for the whole process and only fold in the registration
+    months that changed, so calling this on every rerun is cheap.
+    """
+    return _live_engine('webinar_trends', WebinarTrends).refresh()
+
+
+def webinar_aggregates() -> WebinarAggregates:
+    """Webinars, registrations and attendees per type, region, product line and quarter.
+
+    The aggregates are updated in place whenever webinar data is written,
+    so reading them costs a roll-up of the cells, e.g.
+    ``rollup('Type', start=..., Region=[...])``.
+    """
+    return _live_engine('webinar_aggregates', WebinarAggregates).refresh()
+
+
+def webinar_lead_funnel() -> pd.DataFrame:
+    """Registrations, MQLs, SQLs, Opportunities and Closed Won per webinar id.
+
+    Registrations are matched to CRM lead-stage records by normalized
+    email, and each stage is credited to the contact's last attended
+    webinar. Also has ``MQL Rate`` and ``SQL Rate`` (percent). Only
+    registration months that changed are re-joined; treat the result as
+    read-only.
+    """
+    return _live_engine('webinar_leads', StoreLeadAttribution).refresh()
+
+
+def _sample_sessions(store, today):
+    # Today's webinars or, if none run today, the last day's that ran
+    webinars = store.read('webinars', columns=['Webinar ID', 'Date', 'Type'])
+    dates = webinars['Date'].dt.normalize()
+    day = pd.Timestamp(today)
+    if not (dates == day).any():
+        day = dates[dates < day].max()
+    webinars = webinars[dates == day]
+    registrations = store.read(
+        'webinar_registrations', columns=['Webinar ID', 'Email', 'Attended'], filter=_isin('Webinar ID', webinars['Webinar ID'])
+    )
+    label = "Sample sessions" if day == pd.Timestamp(today) else f"Replay of the {day:%b %d, %Y} sessions"
+    return ReplayFeed(build_session_events(webinars, registrations), source=label)
+
+
+def live_webinar_monitor(today: date) -> LiveMonitor:
+    """Attendance and engagement counters of the webinars in progress.
+
+    Events come from the JSON-lines file named by ``VERATHON_LIVE_FEED``,
+    or else a replay of sample sessions. One monitor per process serves
+    every session, and only today's is kept; ``tick()`` polls the feed at
+    most once per its interval however many sessions call it.
+    """
+    def start(store):
+        path = os.environ.get(LIVE_FEED_ENV)
+        return LiveMonitor(FileFeed(path) if path else _sample_sessions(store, today))
+
+    return _live_engine('live_webinars', start, variant=today, keep=1)
+
+
+def landing_page_stats(start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    """Sessions, bounce rate, pages per session and duration per landing page.
+
+    Each range keeps its per-month session totals for the whole process
+    (the last few ranges asked for stay alive); a pageview write only
+    re-sessionizes the months whose partitions changed. Treat the result
+    as read-only.
+    """
+    return _live_engine(
+        'landing_pages', lambda store: StoreLandingPages(store, start, end), variant=(start, end), keep=LANDING_PAGE_RANGES
+    ).refresh()
@@ -0,0 +1,254 @@
+"""Daily, weekly and monthly rollups of the daily marketing measures.
+
+A range query is split into the coarsest aligned periods that fit inside
+it (whole months, then whole Monday-to-Sunday weeks) plus the leftover
+days at the edges, so answering "Year to Date" touches about a dozen
+array slices no matter how much raw traffic sits behind the daily rows.
+"""
+
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.data_store import changed_partitions
+
+LEVELS = ('day', 'week', 'month')
+
+
+def _day_key(d):
+    return d.toordinal()
+
+
+def _week_key(d):
+    # Ordinal of the week's Monday, divided into whole weeks
+    return (d.toordinal() - d.weekday()) // 7
+
+
+def _month_key(d):
+    return d.year * 12 + d.month - 1
+
+
+_KEYS = {'day': _day_key, 'week': _week_key, 'month': _month_key}
+
+
+def _month_start(d):
+    return d.replace(day=1)
+
+
+def _next_month_start(d):
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+class _Level:
+    """Dense ``periods x measures`` array addressed by a period key."""
+
+    def __init__(self, n_measures):
+        self.origin = None
+        self.values = np.zeros((0, n_measures))
+
+    def _ensure(self, lo, hi):
+        # Grow the array (with headroom) so keys lo..hi are addressable
+        if self.origin is None:
+            self.origin = lo
+        if lo < self.origin:
+            pad = self.origin - lo
+            self.values = np.vstack([np.zeros((pad, self.values.shape[1])), self.values])
+            self.origin = lo
+        needed = hi - self.origin + 1
+        if needed > len(self.values):
+            grow = max(needed, 2 * len(self.values)) - len(self.values)
+            self.values = np.vstack([self.values, np.zeros((grow, self.values.shape[1]))])
+
+    def add(self, keys, values):
+        keys = np.asarray(keys, dtype=np.int64)
+        self._ensure(int(keys.min()), int(keys.max()))
+        np.add.at(self.values, keys - self.origin, values)
+
+    def sum(self, first, last):
+        """Sum of periods ``first``..``last`` (inclusive) per measure."""
+        if self.origin is None:
+            return np.zeros(self.values.shape[1])
+        lo = max(first - self.origin, 0)
+        hi = min(last - self.origin + 1, len(self.values))
+        if hi <= lo:
+            return np.zeros(self.values.shape[1])
+        return self.values[lo:hi].sum(axis=0)
+
+
+class RollupEngine:
+    """Keeps day/week/month sums of a fixed set of daily measures."""
+
+    def __init__(self, measures):
+        self.measures = list(measures)
+        self._levels = {level: _Level(len(self.measures)) for level in LEVELS}
+        self.first_day = None
+        self.last_day = None
+
+    @classmethod
+    def from_frame(cls, df, date_column='Date', measures=None):
+        measures = measures or [c for c in df.columns if c != date_column]
+        engine = cls(measures)
+        engine.add_frame(df, date_column)
+        return engine
+
+    def add_frame(self, df, date_column='Date'):
+        """Add daily rows (``date_column`` plus measure columns) to every level."""
+        if df.empty:
+            return
+        dates = pd.to_datetime(df[date_column])
+        values = df[self.measures].to_numpy(dtype=float)
+
+        days = dates.dt.normalize().to_numpy().astype('datetime64[D]')
+        ordinals = days.astype(np.int64) + date(1970, 1, 1).toordinal()
+        weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        months = dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1
+
+        self._levels['day'].add(ordinals, values)
+        self._levels['week'].add((ordinals - weekdays) // 7, values)
+        self._levels['month'].add(months, values)
+
+        first, last = dates.min().date(), dates.max().date()
+        self.first_day = first if self.first_day is None else min(self.first_day, first)
+        self.last_day = last if self.last_day is None else max(self.last_day, last)
+
+    def add(self, day, **values):
+        """Add one day's measures, e.g. ``add(date(2024, 5, 1), MQLs=3)``."""
+        row = np.array([values.get(m, 0) for m in self.measures], dtype=float)
+        for level in LEVELS:
+            self._levels[level].add([_KEYS[level](day)], row[np.newaxis, :])
+        self.first_day = day if self.first_day is None else min(self.first_day, day)
+        self.last_day = day if self.last_day is None else max(self.last_day, day)
+
+    def daily_frame(self, date_column='Date'):
+        """Day-level sums as a frame with one row per day that has data."""
+        level = self._levels['day']
+        if level.origin is None:
+            return pd.DataFrame(columns=[date_column] + self.measures)
+        first = self.first_day.toordinal() - level.origin
+        last = self.last_day.toordinal() - level.origin
+        values = level.values[first:last + 1]
+        dates = pd.date_range(self.first_day, self.last_day, freq='D')
+        frame = pd.DataFrame(values, columns=self.measures)
+        frame.insert(0, date_column, dates)
+        return frame[values.any(axis=1)].reset_index(drop=True)
+
+    @staticmethod
+    def plan(start, end):
+        """Split ``start``..``end`` into (level, first day, last day) pieces."""
+        pieces = []
+
+        def weeks_and_days(a, b):
+            if a > b:
+                return
+            first_monday = a + timedelta(days=(7 - a.weekday()) % 7)
+            last_sunday = b - timedelta(days=(b.weekday() + 1) % 7)
+            if first_monday + timedelta(days=6) <= b and first_monday <= last_sunday:
+                if a < first_monday:
+                    pieces.append(('day', a, first_monday - timedelta(days=1)))
+                pieces.append(('week', first_monday, last_sunday))
+                if last_sunday < b:
+                    pieces.append(('day', last_sunday + timedelta(days=1), b))
+            else:
+                pieces.append(('day', a, b))
+
+        first_full = start if start.day == 1 else _next_month_start(start)
+        after_last_full = _month_start(end + timedelta(days=1))
+        if first_full < after_last_full:
+            weeks_and_days(start, first_full - timedelta(days=1))
+            pieces.append(('month', first_full, after_last_full - timedelta(days=1)))
+            weeks_and_days(after_last_full, end)
+        else:
+            weeks_and_days(start, end)
+        return pieces
+
+    def totals(self, start, end):
+        """Per-measure totals over ``start``..``end`` (inclusive dates)."""
+        total = np.zeros(len(self.measures))
+        if start <= end:
+            for level, first, last in self.plan(start, end):
+                key = _KEYS[level]
+                total += self._levels[level].sum(key(first), key(last))
+        return dict(zip(self.measures, total))
+
+
+class StoreRollups:
+    """A :class:`RollupEngine` kept current with store datasets month by month.
+
+    ``sources`` maps a dataset to the measures it provides. On
+    :meth:`refresh`, only the month partitions whose files changed since
+    the last refresh are read: what they contributed before is subtracted
+    and their new rows are added, so appending today's numbers costs one
+    month of reads instead of a rebuild.
+    """
+
+    def __init__(self, store, sources, date_column='Date'):
+        self.store = store
+        self.sources = {dataset: list(measures) for dataset, measures in sources.items()}
+        self.date_column = date_column
+        self.engine = RollupEngine([m for measures in self.sources.values() for m in measures])
+        self._versions = {}
+        self._partitions = {}
+        self._added = {}
+        self._lock = threading.Lock()
+
+    def _apply(self, frame, measures, sign):
+        rows = pd.DataFrame(0.0, index=frame.index, columns=self.engine.measures)
+        rows[measures] = frame[measures].to_numpy(dtype=float) * sign
+        rows.insert(0, self.date_column, frame[self.date_column])
+        self.engine.add_frame(rows, self.date_column)
+
+    def _refresh_dataset(self, dataset, measures):
+        partitions = self.store.partitions(dataset)
+        changed = changed_partitions(self._partitions.get(dataset, {}), partitions)
+        for key in changed:
+            previous = self._added.pop((dataset, key), None)
+            if previous is not None:
+                self._apply(previous, measures, -1)
+
+        reload = [key for key in changed if key in partitions]
+        if reload:
+            # One read spanning the changed months, keeping only those months
+            first = date(*reload[0], 1)
+            last = _next_month_start(date(*reload[-1], 1)) - timedelta(days=1)
+            frame = self.store.read(dataset, columns=[self.date_column] + measures, start=first, end=last)
+            dates = pd.to_datetime(frame[self.date_column])
+            frame = frame[(dates.dt.year * 12 + dates.dt.month).isin([year * 12 + month for year, month in reload])]
+            daily = frame.groupby(self.date_column, as_index=False)[measures].sum()
+            self._apply(daily, measures, 1)
+            daily_dates = pd.to_datetime(daily[self.date_column])
+            for (year, month), rows in daily.groupby([daily_dates.dt.year, daily_dates.dt.month]):
+                self._added[(dataset, (int(year), int(month)))] = rows
+        self._partitions[dataset] = partitions
+
+    def refresh(self):
+        """Fold in whatever changed in the source datasets; returns ``self``."""
+        with self._lock:
+            for dataset, measures in self.sources.items():
+                version = self.store.version(dataset)
+                if self._versions.get(dataset) != version:
+                    self._refresh_dataset(dataset, measures)
+                    self._versions[dataset] = version
+        return self
+
+    # Reads take the refresh lock, so they never see a partition half swapped
+
+    @property
+    def measures(self):
+        return self.engine.measures
+
+    @property
+    def last_day(self):
+        with self._lock:
+            return self.engine.last_day
+
+    def totals(self, start, end):
+        """Per-measure totals over ``start``..``end`` (inclusive dates)."""
+        with self._lock:
+            return self.engine.totals(start, end)
+
+    def daily_frame(self, date_column='Date'):
+        """Day-level sums as a frame with one row per day that has data."""
+        with self._lock:
+            return self.engine.daily_frame(date_column)
@@ -0,0 +1,639 @@
+"""Synthetic sample datasets used to seed an empty metrics store.
+
+These replace the inline literals the pages used to build on every
+rerun. They are generated once with a fixed seed and persisted, so the
+numbers are stable across reruns and sessions.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+SEED = 42
+
+TRAFFIC_START = date(2022, 1, 1)
+
+# (low, high) daily visitor ranges per traffic source
+TRAFFIC_SOURCES = {
+    'Organic Search': (500, 1500),
+    'Direct': (300, 800),
+    'Referral': (200, 600),
+    'Social Media': (100, 400),
+    'Email': (50, 250),
+    'Paid Search': (150, 500)
+}
+
+# (start ROI, end ROI, noise) over the trend window per channel
+ROI_TREND_CHANNELS = {
+    'Webinars': (3.8, 5.2, 0.3),
+    'Trade Shows': (3.5, 2.8, 0.3),
+    'Content Marketing': (4.0, 4.8, 0.2),
+    'Email': (5.5, 6.2, 0.4),
+    'Paid Media': (2.8, 3.5, 0.3)
+}
+
+
+# Share of days per source with an outage or a spike
+TRAFFIC_INCIDENT_RATE = 0.005
+
+
+def build_traffic(start=TRAFFIC_START, end=None):
+    rng = np.random.default_rng(SEED)
+    incidents = np.random.default_rng(SEED + 5)
+    dates = pd.date_range(start=start, end=end or date.today(), freq='D')
+    data = {'Date': dates}
+    for source, (low, high) in TRAFFIC_SOURCES.items():
+        visitors = rng.integers(low, high, len(dates)).astype(float)
+        hit = incidents.random(len(dates)) < TRAFFIC_INCIDENT_RATE
+        visitors[hit] *= incidents.choice([0.2, 0.4, 2.5, 3.0], hit.sum())
+        data[source] = visitors.round().astype('int32')
+    return pd.DataFrame(data)
+
+
+def build_conversions(start=TRAFFIC_START, end=None):
+    # Derived from the traffic sample so rates stay in line with the page's
+    # ~3.2% conversion rate and ~$42 cost per MQL
+    rng = np.random.default_rng(SEED + 1)
+    traffic = build_traffic(start, end)
+    visitors = traffic[list(TRAFFIC_SOURCES)].sum(axis=1).to_numpy()
+    conversions = rng.binomial(visitors, 0.032)
+    mqls = rng.binomial(conversions, 0.75)
+    return pd.DataFrame({
+        'Date': traffic['Date'],
+        'Conversions': conversions.astype('int32'),
+        'MQLs': mqls.astype('int32'),
+        'Spend': np.round(mqls * rng.normal(42.0, 4.0, len(mqls)), 2)
+    })
+
+
+def build_roi_trend():
+    rng = np.random.default_rng(SEED)
+    # Month-end dates for 2023
+    dates = pd.date_range(start='2023-01-01', periods=12, freq='MS') + pd.offsets.MonthEnd(0)
+
+    frames = []
+    for channel, (first, last, noise) in ROI_TREND_CHANNELS.items():
+        frames.append(pd.DataFrame({
+            'Date': dates,
+            'Channel': channel,
+            'ROI': np.linspace(first, last, len(dates)) + rng.normal(0, noise, len(dates))
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_cvent_events():
+    return pd.DataFrame({
+        'Event ID': ['EVT001', 'EVT002', 'EVT003', 'EVT004', 'EVT005', 'EVT006'],
+        'Event Name': [
+            'Product A Clinical Applications',
+            'Healthcare Innovation Summit',
+            'Visualization Technology Webinar',
+            'Q2 Product Roadmap Update',
+            'Hospital Efficiency Workshop',
+            'New Feature Introduction'
+        ],
+        'Event Date': pd.to_datetime(['2023-12-15', '2024-01-20', '2024-02-12', '2024-03-05', '2024-03-22', '2024-04-10']),
+        'Event Type': ['Webinar', 'Virtual Conference', 'Webinar', 'Webinar', 'Workshop', 'Webinar'],
+        'Status': ['Active', 'Planning', 'Planning', 'Draft', 'Planning', 'Draft'],
+        'Sync Status': ['Synced', 'Synced', 'Synced', 'Pending', 'Synced', 'Error']
+    })
+
+
+FUNNEL_STAGES = [
+    'Website Visitors', 'Product Page Views', 'Form Fills', 'MQLs', 'SQLs', 'Opportunities', 'Closed Won'
+]
+
+# Share of users reaching each stage who go on to the next one, and mean
+# days between the two
+FUNNEL_TRANSITIONS = [(0.502, 0.02), (0.2, 1.0), (0.236, 3.0), (0.499, 7.0), (0.299, 14.0), (0.368, 21.0)]
+
+FUNNEL_DEVICES = {'Desktop': 0.6, 'Mobile': 0.33, 'Tablet': 0.07}
+
+FUNNEL_CAMPAIGNS = {
+    '(none)': 0.55,
+    'New Product Launch': 0.15,
+    'Healthcare Conference': 0.08,
+    'Q1 Email Nurture': 0.07,
+    'Retargeting Ads': 0.1,
+    'Medical Blog Promotion': 0.03,
+    'Partner Webinar': 0.02
+}
+
+
+def build_funnel_events(n_users=24589, start=date(2024, 1, 1), days=90):
+    # One row per event with the user's Device, Channel and Campaign on
+    # every row; users revisit the site, so stage 0 repeats
+    rng = np.random.default_rng(SEED + 2)
+    channel_weights = np.array([low + high for low, high in TRAFFIC_SOURCES.values()], dtype=float)
+
+    def pick(options, weights):
+        weights = np.asarray(weights, dtype=float)
+        return np.asarray(options)[rng.choice(len(options), n_users, p=weights / weights.sum())]
+
+    users = np.arange(1, n_users + 1, dtype=np.int64)
+    entry = pd.Timestamp(start) + pd.to_timedelta(rng.uniform(0, days, n_users), unit='D')
+    device = pick(list(FUNNEL_DEVICES), list(FUNNEL_DEVICES.values()))
+    channel = pick(list(TRAFFIC_SOURCES), channel_weights)
+    campaign = pick(list(FUNNEL_CAMPAIGNS), list(FUNNEL_CAMPAIGNS.values()))
+
+    frames = []
+    # Repeat visits after the first one
+    visits = rng.poisson(0.6, n_users)
+    repeat = np.repeat(np.arange(n_users), visits)
+    frames.append((repeat, 0, entry[repeat] + pd.to_timedelta(rng.exponential(10, len(repeat)), unit='D')))
+
+    reached = np.arange(n_users)
+    times = entry
+    frames.append((reached, 0, times))
+    for stage, (rate, mean_days) in enumerate(FUNNEL_TRANSITIONS, start=1):
+        keep = rng.random(len(reached)) < rate
+        reached = reached[keep]
+        times = times[keep] + pd.to_timedelta(rng.exponential(mean_days, len(reached)), unit='D')
+        frames.append((reached, stage, times))
+
+    idx = np.concatenate([f[0] for f in frames])
+    events = pd.DataFrame({
+        'User ID': users[idx],
+        'Stage': np.concatenate([np.full(len(f[0]), f[1], dtype='int8') for f in frames]),
+        'Timestamp': np.concatenate([np.asarray(f[2], dtype='datetime64[ns]') for f in frames]),
+        'Device': device[idx],
+        'Channel': channel[idx],
+        'Campaign': campaign[idx]
+    })
+    return events.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+
+# Relative visitor volume per country
+MARKETING_COUNTRIES = {
+    'United States': 12453,
+    'Canada': 3245,
+    'United Kingdom': 2876,
+    'Germany': 1765,
+    'Australia': 1342,
+    'France': 876,
+    'Japan': 765,
+    'Other': 1267
+}
+
+# Campaign -> (status, monthly budget)
+CAMPAIGNS = {
+    'New Product Launch': ('Active', 25000),
+    'Healthcare Conference': ('Completed', 15000),
+    'Q1 Email Nurture': ('Active', 5000),
+    'Retargeting Ads': ('Active', 10000),
+    'Medical Blog Promotion': ('Paused', 3000),
+    'Partner Webinar': ('Completed', 2000)
+}
+
+# Share of each channel's visitors attributed to a campaign; the rest is '(none)'
+CHANNEL_CAMPAIGNS = {
+    'Organic Search': {'Medical Blog Promotion': 0.05},
+    'Direct': {},
+    'Referral': {'Healthcare Conference': 0.2, 'Partner Webinar': 0.15},
+    'Social Media': {'New Product Launch': 0.3, 'Retargeting Ads': 0.25, 'Medical Blog Promotion': 0.15},
+    'Email': {'Q1 Email Nurture': 0.5, 'New Product Launch': 0.2, 'Partner Webinar': 0.1},
+    'Paid Search': {'New Product Launch': 0.45, 'Retargeting Ads': 0.35}
+}
+
+# Channel -> (relative MQL rate, cost per MQL)
+CHANNEL_ECONOMICS = {
+    'Organic Search': (2.5, 0.0),
+    'Direct': (0.9, 0.0),
+    'Referral': (0.8, 133.33),
+    'Social Media': (1.3, 167.44),
+    'Email': (3.4, 75.0),
+    'Paid Search': (3.2, 84.33)
+}
+
+
+def build_marketing(start=TRAFFIC_START, end=None):
+    # Daily facts by Channel x Device x Country x Campaign. Visitors, MQLs
+    # and Spend split the traffic and conversions samples exactly, so any
+    # roll-up agrees with the KPI tiles.
+    rng = np.random.default_rng(SEED + 4)
+    traffic = build_traffic(start, end)
+    daily = build_conversions(start, end)
+    channels = list(TRAFFIC_SOURCES)
+    devices = list(FUNNEL_DEVICES)
+    countries = list(MARKETING_COUNTRIES)
+    campaigns = ['(none)'] + list(CAMPAIGNS)
+
+    device_share = np.array(list(FUNNEL_DEVICES.values()))
+    country_share = np.array(list(MARKETING_COUNTRIES.values()), dtype=float)
+    mix = np.multiply.outer(device_share / device_share.sum(), country_share / country_share.sum())
+    pvals = []
+    for channel in channels:
+        campaign_share = np.array([CHANNEL_CAMPAIGNS[channel].get(name, 0.0) for name in campaigns])
+        campaign_share[0] = 1 - campaign_share.sum()
+        pvals.append(np.multiply.outer(mix, campaign_share).ravel())
+    shape = (len(channels), len(devices), len(countries), len(campaigns))
+
+    visitors = rng.multinomial(traffic[channels].to_numpy(), np.array(pvals)).reshape(len(traffic), -1)
+    economics = np.repeat([CHANNEL_ECONOMICS[channel] for channel in channels], visitors.shape[1] // len(channels), axis=0)
+    rate, cpl = economics[:, 0], economics[:, 1]
+    weight = visitors * rate
+    mqls = rng.multinomial(daily['MQLs'].to_numpy(), weight / weight.sum(axis=1, keepdims=True))
+    cost = (mqls + 0.01 * visitors) * cpl
+    spend = daily['Spend'].to_numpy()[:, None] * cost / cost.sum(axis=1, keepdims=True)
+    opportunities = rng.binomial(mqls, 0.08)
+    revenue = opportunities * rng.normal(14000, 2000, opportunities.shape)
+
+    day, cell = np.nonzero(visitors)
+    channel, device, country, campaign = np.unravel_index(cell, shape)
+    return pd.DataFrame({
+        'Date': traffic['Date'].to_numpy()[day],
+        'Channel': np.asarray(channels)[channel],
+        'Device': np.asarray(devices)[device],
+        'Country': np.asarray(countries)[country],
+        'Campaign': np.asarray(campaigns)[campaign],
+        'Visitors': visitors[day, cell].astype('int32'),
+        'MQLs': mqls[day, cell].astype('int32'),
+        'Opportunities': opportunities[day, cell].astype('int32'),
+        'Spend': np.round(spend[day, cell], 2),
+        'Revenue': np.round(revenue[day, cell], 2)
+    })
+
+
+# Landing page -> (share of sessions, bounce probability)
+LANDING_PAGES = {
+    '/products/new-device': (0.31, 0.32),
+    '/solutions/healthcare': (0.28, 0.29),
+    '/blog/medical-innovation': (0.16, 0.45),
+    '/about-verathon': (0.14, 0.39),
+    '/contact': (0.11, 0.23)
+}
+
+PAGEVIEW_DAYS = 180
+
+
+def build_pageviews(days=PAGEVIEW_DAYS, sessions_per_day=350, end=None):
+    rng = np.random.default_rng(SEED + 3)
+    n_sessions = days * sessions_per_day
+    first_day = pd.Timestamp(end or date.today()) - pd.Timedelta(days=days - 1)
+    pages = list(LANDING_PAGES)
+    shares = np.array([share for share, _ in LANDING_PAGES.values()])
+    bounce = np.array([rate for _, rate in LANDING_PAGES.values()])
+
+    landing = rng.choice(len(pages), n_sessions, p=shares / shares.sum())
+    # Returning visitors make up part of the sessions
+    visitors = rng.integers(1, int(n_sessions * 0.7), n_sessions)
+    start = first_day + pd.to_timedelta(rng.uniform(0, days * 86400, n_sessions), unit='s')
+    views = np.where(rng.random(n_sessions) < bounce[landing], 1, 2 + rng.geometric(0.45, n_sessions))
+    campaign = np.where(rng.random(n_sessions) < 0.2, rng.choice(list(FUNNEL_CAMPAIGNS)[1:], n_sessions), None)
+
+    session = np.repeat(np.arange(n_sessions), views)
+    step = np.arange(len(session)) - np.repeat(np.cumsum(views) - views, views)
+    # Mean 90 s between pageviews of a session
+    offsets = rng.exponential(90, len(session))
+    offsets[step == 0] = 0
+    elapsed = pd.Series(offsets).groupby(session).cumsum().to_numpy()
+
+    page = np.where(step == 0, np.asarray(pages)[landing[session]], np.asarray(pages)[rng.integers(0, len(pages), len(session))])
+    events = pd.DataFrame({
+        'Visitor ID': visitors[session],
+        'Timestamp': start[session] + pd.to_timedelta(elapsed, unit='s'),
+        'Page': page,
+        'Campaign': np.where(step == 0, campaign[session], None)
+    })
+    return events.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+
+# Webinar type -> (mean final registrations, attendance rate)
+WEBINAR_TYPES = {
+    'Product Demo': (155, 0.45),
+    'Thought Leadership': (146, 0.48),
+    'Educational': (109, 0.52),
+    'Customer Stories': (80, 0.39),
+    'Partner Webinars': (53, 0.37)
+}
+
+WEBINAR_REGIONS = {'North America': 0.5, 'EMEA': 0.25, 'APAC': 0.17, 'LATAM': 0.08}
+
+WEBINAR_PRODUCT_LINES = ['GlideScope', 'BladderScan', 'Airway Solutions', 'Clinical Education']
+
+WEBINAR_TOPICS = [
+    'New Product Launch', 'Healthcare Trends', 'Regulatory Compliance Update', 'Customer Success Story',
+    'Medical Device Innovations', 'Healthcare Marketing Strategies', 'Patient Engagement Solutions',
+    'Digital Transformation in Healthcare', 'Supply Chain Optimization', 'Healthcare Data Security',
+    'Remote Patient Monitoring', 'Clinical Workflow Efficiency'
+]
+
+# Webinars per day, and how far ahead the catalog is scheduled
+WEBINARS_PER_DAY = 1.3
+WEBINAR_HORIZON_DAYS = 120
+
+# Distinct people registering for webinars, and the domains of their emails
+WEBINAR_CONTACTS = 40000
+CONTACT_DOMAINS = ['stmarys.org', 'mercyhealth.com', 'unityhospital.org', 'valleymed.com', 'gmail.com', 'outlook.com']
+
+
+def build_webinars(start=TRAFFIC_START, end=None):
+    # One row per webinar; Registrations on upcoming webinars are the ones
+    # received so far, and outcome columns stay 0 until the webinar ran
+    rng = np.random.default_rng(SEED + 6)
+    today = pd.Timestamp(end or date.today())
+    first, last = pd.Timestamp(start), today + pd.Timedelta(days=WEBINAR_HORIZON_DAYS)
+    n = int((last - first).days * WEBINARS_PER_DAY)
+
+    dates = (first + pd.to_timedelta(rng.integers(0, (last - first).days + 1, n), unit='D')).sort_values()
+    types = np.asarray(list(WEBINAR_TYPES))[rng.integers(0, len(WEBINAR_TYPES), n)]
+    means = np.array([WEBINAR_TYPES[t][0] for t in types], dtype=float)
+    attendance = np.array([WEBINAR_TYPES[t][1] for t in types])
+    regions = rng.choice(list(WEBINAR_REGIONS), n, p=list(WEBINAR_REGIONS.values()))
+    products = np.asarray(WEBINAR_PRODUCT_LINES)[rng.integers(0, len(WEBINAR_PRODUCT_LINES), n)]
+    topics = np.asarray(WEBINAR_TOPICS)[rng.integers(0, len(WEBINAR_TOPICS), n)]
+
+    lead_days = rng.integers(21, 90, n)
+    goal = np.round(means * rng.uniform(0.9, 1.4, n), -1).astype('int32')
+    final = rng.poisson(means * rng.lognormal(0, 0.25, n))
+    # Share of the final registrations already in, by share of the promotion window elapsed
+    elapsed = np.clip(1 - (dates - today).days.to_numpy() / lead_days, 0, 1)
+    registrations = np.round(final * elapsed ** 1.5).astype('int32')
+
+    ran = dates < today
+    attendees = np.where(ran, rng.binomial(registrations, attendance), 0)
+    mqls = rng.binomial(attendees, 0.38)
+    sqls = rng.binomial(mqls, 0.35)
+    opportunities = rng.binomial(sqls, 0.25)
+    closed_won = rng.binomial(opportunities, 0.35)
+
+    return pd.DataFrame({
+        'Webinar ID': [f'WEB{i:05d}' for i in range(1, n + 1)],
+        'Webinar Name': [f'{topic}: {product}' for topic, product in zip(topics, products)],
+        'Date': dates,
+        'Announced': dates - pd.to_timedelta(lead_days, unit='D'),
+        'Type': types,
+        'Region': regions,
+        'Product Line': products,
+        'Registration Goal': goal,
+        'Registrations': registrations,
+        'Attendees': attendees.astype('int32'),
+        'MQLs': mqls.astype('int32'),
+        'SQLs': sqls.astype('int32'),
+        'Opportunities': opportunities.astype('int32'),
+        'Closed Won': closed_won.astype('int32')
+    })
+
+
+def contact_emails(contact_ids):
+    """Canonical (lower-case) email of each contact id."""
+    contact_ids = np.asarray(contact_ids)
+    domains = np.asarray(CONTACT_DOMAINS)[contact_ids % len(CONTACT_DOMAINS)]
+    return pd.Series(contact_ids).map('contact{:06d}@'.format).str.cat(domains).to_numpy()
+
+
+def build_webinar_registrations(start=TRAFFIC_START, end=None):
+    # One row per registration of the webinars from build_webinars; the
+    # per-webinar counts add up to its Registrations and Attendees columns
+    return _webinar_registrations(start, end).drop(columns='Contact')
+
+
+def _webinar_registrations(start, end):
+    webinars = build_webinars(start=start, end=end)
+    rng = np.random.default_rng(SEED + 7)
+    today = pd.Timestamp(end or date.today())
+    counts = webinars['Registrations'].to_numpy()
+    webinar = np.repeat(np.arange(len(webinars)), counts)
+    n = len(webinar)
+
+    # Registrations pile up towards the webinar: share in by elapsed share e is e ** 1.5
+    announced = webinars['Announced'].to_numpy()[webinar]
+    window = (webinars['Date'] - webinars['Announced']).to_numpy()[webinar]
+    elapsed = np.clip((today.to_datetime64() - announced) / window, 0, 1)
+    share = elapsed * rng.random(n) ** (2 / 3)
+    registered = announced + (share * window).astype('timedelta64[ns]')
+
+    # The first Attendees registrations of each webinar, in random order, attended
+    order = np.lexsort((rng.random(n), webinar))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
+    attended = rank < webinars['Attendees'].to_numpy()[webinar]
+
+    # Emails as typed into the registration form: some upper-case, some padded
+    contacts = rng.integers(0, WEBINAR_CONTACTS, n)
+    emails = contact_emails(contacts)
+    shouted = rng.random(n) < 0.1
+    emails[shouted] = np.char.upper(emails[shouted].astype(str))
+    padded = rng.random(n) < 0.03
+    emails[padded] = np.char.add(emails[padded].astype(str), ' ')
+
+    registrations = pd.DataFrame({
+        'Webinar ID': webinars['Webinar ID'].to_numpy()[webinar],
+        'Registered At': registered,
+        'Email': emails,
+        'Attended': attended,
+        'Contact': contacts
+    })
+    registrations = registrations.sort_values('Registered At', kind='stable').reset_index(drop=True)
+    registrations.insert(0, 'Registration ID', np.arange(1, n + 1))
+    return registrations
+
+
+# A live webinar runs this long, with polls opening at these minutes into it
+WEBINAR_SESSION_MINUTES = 60
+WEBINAR_POLL_MINUTES = [15, 30, 45]
+
+
+def build_session_events(webinars, registrations, start_hour=10):
+    # Join/leave/poll/question events of live sessions of ``webinars``,
+    # attended by their registrants with Attended set (or, for webinars not
+    # held yet, a share of them at the type's attendance rate). Most join
+    # around the start and stay to the end; some drop off early, some
+    # reconnect once, about 60% answer each poll and a few ask questions
+    rng = np.random.default_rng(SEED + 9)
+    minutes = WEBINAR_SESSION_MINUTES
+    mine = registrations[registrations['Webinar ID'].isin(webinars['Webinar ID'])]
+    rates = webinars.set_index('Webinar ID')['Type'].map(lambda t: WEBINAR_TYPES[t][1])
+    held = mine.groupby('Webinar ID')['Attended'].transform('any').to_numpy()
+    present = np.where(held, mine['Attended'].to_numpy(), rng.random(len(mine)) < rates.reindex(mine['Webinar ID']).to_numpy())
+    attendees = mine[present]
+    n = len(attendees)
+
+    join = np.clip(rng.normal(2, 3, n), -5, minutes - 5)
+    leave = np.where(rng.random(n) < 0.25, join + rng.uniform(5, minutes, n), minutes + rng.uniform(0, 3, n))
+    leave = np.minimum(leave, minutes + 3)
+    reconnect = rng.random(n) < 0.1
+    dropped = join + (leave - join) * rng.uniform(0.2, 0.6, n)
+    back = np.minimum(dropped + rng.uniform(0.5, 5, n), leave)
+
+    def there(at):
+        return (join <= at) & (at < leave) & ~(reconnect & (dropped <= at) & (at < back))
+
+    everyone = np.ones(n, dtype=bool)
+    frames = [(join, 'join', everyone), (leave, 'leave', everyone), (dropped, 'leave', reconnect), (back, 'join', reconnect)]
+    for poll in WEBINAR_POLL_MINUTES:
+        frames.append((poll + rng.uniform(0, 2, n), 'poll', there(poll) & (rng.random(n) < 0.6)))
+    asks = rng.poisson(0.15, n)
+    asker = np.repeat(np.arange(n), asks)
+    asked = join[asker] + (leave[asker] - join[asker]) * rng.random(len(asker))
+
+    dates = webinars.set_index('Webinar ID')['Date'] + pd.Timedelta(hours=start_hour)
+    starts = dates.reindex(attendees['Webinar ID']).to_numpy()
+    parts = []
+    for at, event, keep in frames:
+        parts.append(pd.DataFrame({
+            'Timestamp': starts[keep] + pd.to_timedelta(at[keep], unit='min').to_numpy(),
+            'Webinar ID': attendees['Webinar ID'].to_numpy()[keep],
+            'Attendee': attendees['Email'].to_numpy()[keep],
+            'Event': event
+        }))
+    parts.append(pd.DataFrame({
+        'Timestamp': starts[asker] + pd.to_timedelta(asked, unit='min').to_numpy(),
+        'Webinar ID': attendees['Webinar ID'].to_numpy()[asker],
+        'Attendee': attendees['Email'].to_numpy()[asker],
+        'Event': 'question'
+    }))
+    events = pd.concat(parts, ignore_index=True)
+    return events.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+
+# CRM lead stages in funnel order, and the days each takes after the one before
+LEAD_STAGES = ['MQL', 'SQL', 'Opportunity', 'Closed Won']
+LEAD_STAGE_DELAYS = [(1, 14), (3, 21), (7, 30), (14, 60)]
+
+# Lead-stage records from sources other than webinars
+CRM_OTHER_LEADS = 30000
+
+
+def _pick(groups, counts, rng):
+    # Random counts[g] of the rows of each group g
+    order = np.lexsort((rng.random(len(groups)), groups))
+    sizes = np.bincount(groups, minlength=len(counts))
+    rank = np.empty(len(groups), dtype=np.int64)
+    rank[order] = np.arange(len(groups)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return rank < counts[groups]
+
+
+def build_crm_leads(start=TRAFFIC_START, end=None):
+    # Lead-stage history from the CRM: webinar attendees become MQLs, SQLs,
+    # ... in the numbers the webinars dataset reports, plus leads of
+    # contacts who never registered for a webinar
+    webinars = build_webinars(start=start, end=end)
+    registrations = _webinar_registrations(start, end)
+    rng = np.random.default_rng(SEED + 8)
+    today = pd.Timestamp(end or date.today()).to_datetime64()
+
+    attended = registrations[registrations['Attended']]
+    webinar = pd.Index(webinars['Webinar ID']).get_indexer(attended['Webinar ID'])
+    contacts = attended['Contact'].to_numpy()
+    reached = webinars['Date'].to_numpy()[webinar]
+
+    # Each stage takes a random subset of the attendees in the stage before
+    stages, stage_contacts, stage_dates = [], [], []
+    candidates = np.arange(len(webinar))
+    for stage, column, (low, high) in zip(LEAD_STAGES, ['MQLs', 'SQLs', 'Opportunities', 'Closed Won'], LEAD_STAGE_DELAYS):
+        candidates = candidates[_pick(webinar[candidates], webinars[column].to_numpy(), rng)]
+        reached = reached + pd.to_timedelta(rng.integers(low, high + 1, len(webinar)), unit='D').to_numpy()
+        stages.append(np.full(len(candidates), stage))
+        stage_contacts.append(contacts[candidates])
+        stage_dates.append(np.minimum(reached[candidates], today))
+
+    # Other sources: contacts outside the webinar audience, reaching MQL up to Closed Won
+    other = rng.integers(WEBINAR_CONTACTS, 3 * WEBINAR_CONTACTS, CRM_OTHER_LEADS)
+    depth = rng.choice(len(LEAD_STAGES), CRM_OTHER_LEADS, p=[0.55, 0.25, 0.12, 0.08])
+    first = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, (pd.Timestamp(today) - pd.Timestamp(start)).days, CRM_OTHER_LEADS), unit='D')
+    for level, stage in enumerate(LEAD_STAGES):
+        keep = depth >= level
+        stages.append(np.full(keep.sum(), stage))
+        stage_contacts.append(other[keep])
+        stage_dates.append(np.minimum((first + pd.Timedelta(days=20 * level))[keep].to_numpy(), today))
+
+    contact_ids = np.concatenate(stage_contacts)
+    leads = pd.DataFrame({
+        'Contact ID': pd.Series(contact_ids).map('C{:06d}'.format).to_numpy(),
+        'Email': contact_emails(contact_ids),
+        'Stage': np.concatenate(stages),
+        'Stage Date': np.concatenate(stage_dates)
+    })
+    return leads.sort_values('Stage Date', kind='stable').reset_index(drop=True)
+
+
+COMPETITIVE_SNAPSHOT_DATE = date(2024, 4, 30)
+
+COMPANIES = ['Verathon', 'Competitor A', 'Competitor B', 'Competitor C', 'Competitor D']
+
+# table name -> (row label column, rows, values per company in COMPANIES order)
+COMPETITIVE_TABLES = {
+    'positioning': ('Metric', ['Price', 'Quality', 'Market Share'], [
+        [85, 90, 28], [70, 75, 22], [90, 85, 18], [65, 60, 12], [55, 50, 8]
+    ]),
+    'digital_metrics': ('Metric', [
+        'Website Traffic (K/mo)', 'Domain Authority', 'Keyword Rankings',
+        'Social Following (K)', 'Media Mentions', 'Review Score'
+    ], [
+        [120, 65, 428, 35, 42, 4.5], [95, 58, 352, 48, 38, 4.2], [105, 62, 387, 22, 29, 4.3],
+        [65, 48, 245, 18, 22, 4.0], [45, 42, 198, 12, 15, 3.8]
+    ]),
+    'content_volume': ('Content Type', [
+        'Blog Posts', 'Whitepapers', 'Case Studies', 'Videos', 'Webinars', 'Infographics'
+    ], [
+        [45, 12, 8, 24, 18, 15], [38, 8, 12, 36, 12, 10], [42, 15, 6, 18, 24, 8],
+        [25, 6, 4, 12, 8, 6], [18, 4, 2, 8, 6, 4]
+    ]),
+    'seo': ('Metric', [
+        'Organic Traffic (K/mo)', 'Keyword Rankings Top 3', 'Keyword Rankings Top 10',
+        'Backlinks', 'Referring Domains', 'Domain Rating'
+    ], [
+        [75, 42, 156, 3250, 428, 65], [62, 38, 142, 2850, 382, 58], [68, 45, 138, 3120, 405, 62],
+        [41, 24, 98, 1820, 245, 48], [28, 18, 76, 1250, 198, 42]
+    ]),
+    'social_following': ('Platform', ['LinkedIn', 'Twitter', 'Facebook', 'YouTube', 'Instagram'], [
+        [25000, 8500, 6200, 4500, 3200], [32000, 12000, 8500, 6700, 5200], [18000, 7500, 5600, 5200, 2800],
+        [12000, 5000, 4200, 3500, 2000], [8000, 3500, 2800, 2200, 1500]
+    ]),
+    'social_engagement': ('Metric', [
+        'Avg. Post Engagement Rate', 'Avg. Comments per Post', 'Shares per Post', 'Link Clicks per Post'
+    ], [
+        [2.8, 18, 24, 35], [3.2, 22, 28, 42], [2.5, 16, 22, 28], [1.8, 10, 15, 22], [1.5, 8, 12, 18]
+    ]),
+    'content_performance': ('Content Type', [
+        'Product Updates', 'Industry News', 'Case Studies', 'Educational', 'Company Culture'
+    ], [
+        [3.2, 2.5, 4.1, 3.8, 2.9], [3.5, 2.8, 3.8, 4.2, 3.4], [2.8, 2.3, 3.9, 3.5, 2.5],
+        [2.2, 1.9, 3.1, 2.8, 2.0], [1.8, 1.5, 2.5, 2.3, 1.7]
+    ]),
+    'perception': ('Attribute', [
+        'Product Quality', 'Reliability', 'Innovation', 'Customer Service', 'Value for Money', 'Brand Reputation'
+    ], [
+        [90, 92, 85, 88, 75, 88], [82, 85, 80, 76, 78, 80], [85, 88, 78, 72, 82, 82],
+        [72, 75, 65, 68, 80, 70], [65, 70, 60, 65, 88, 65]
+    ]),
+}
+
+
+def build_competitive():
+    # Long format: one row per (table, row, company) benchmark value
+    records = []
+    for table, (_, rows, values) in COMPETITIVE_TABLES.items():
+        for company, company_values in zip(COMPANIES, values):
+            for position, (row, value) in enumerate(zip(rows, company_values)):
+                records.append((COMPETITIVE_SNAPSHOT_DATE, table, position, row, company, float(value)))
+
+    return pd.DataFrame.from_records(
+        records,
+        columns=['Snapshot Date', 'Table', 'Position', 'Row', 'Company', 'Value']
+    )
+
+
+# dataset name -> (builder, date column)
+SAMPLE_DATASETS = {
+    'traffic': (build_traffic, 'Date'),
+    'conversions': (build_conversions, 'Date'),
+    'marketing': (build_marketing, 'Date'),
+    'roi_trend': (build_roi_trend, 'Date'),
+    'cvent_events': (build_cvent_events, 'Event Date'),
+    'funnel_events': (build_funnel_events, 'Timestamp'),
+    'pageviews': (build_pageviews, 'Timestamp'),
+    'webinars': (build_webinars, 'Date'),
+    'webinar_registrations': (build_webinar_registrations, 'Registered At'),
+    'crm_leads': (build_crm_leads, 'Stage Date'),
+    'competitive': (build_competitive, 'Snapshot Date'),
+}
+
+
+def seed_store(store):
+    """Write any sample dataset the store does not have yet."""
+    for name, (builder, date_column) in SAMPLE_DATASETS.items():
+        if not store.has(name):
+            store.write(name, builder(), date_column=date_column, mode='overwrite')
@@ -0,0 +1,189 @@
+"""Streaming sessionization of pageview logs.
+
+Pageviews are fed in chunks, roughly in time order. A visitor's next
+pageview starts a new session when
+
+- more than ``timeout`` passed since their previous pageview,
+- it falls on a different calendar day (sessions break at midnight), or
+- it carries a campaign different from the one the visitor arrived with.
+
+Each chunk is sessionized in one vectorized pass together with the
+pageviews of the sessions still open from earlier chunks, which is the
+only per-visitor state kept. A session is final once the stream's
+watermark (latest timestamp seen minus ``allowed_lateness``) is more than
+``timeout`` past its last pageview; final sessions are folded into
+per-landing-page totals and their pageviews dropped. Late pageviews that
+arrive while their session is still open are merged into it; anything
+older is counted in ``late_dropped``.
+
+Because sessions break at midnight, no session spans two months:
+:class:`StoreLandingPages` sessionizes each month partition of the store
+on its own and, when pageviews are written, re-sessionizes only the
+months whose partitions changed.
+"""
+
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.data_store import changed_partitions
+
+COLUMNS = ['Visitor ID', 'Timestamp', 'Page', 'Campaign']
+
+TOTALS = ['Sessions', 'Bounces', 'Pageviews', 'Duration']
+
+
+class Sessionizer:
+    """Turns pageview chunks into per-landing-page session totals."""
+
+    def __init__(self, timeout=timedelta(minutes=30), allowed_lateness=timedelta(minutes=10)):
+        self.timeout = pd.Timedelta(timeout)
+        self.allowed_lateness = pd.Timedelta(allowed_lateness)
+        self.watermark = None
+        self.late_dropped = 0
+        self._open = pd.DataFrame(columns=COLUMNS)
+        self._totals = {}
+
+    def _sessionize(self, events):
+        events = events.sort_values(['Visitor ID', 'Timestamp'], kind='stable').reset_index(drop=True)
+        visitor = events['Visitor ID'].to_numpy()
+        ts = events['Timestamp']
+        campaign = events['Campaign']
+
+        same_visitor = np.r_[False, visitor[1:] == visitor[:-1]]
+        gap = ts.diff().to_numpy()
+        same_day = np.r_[False, ts.dt.normalize().to_numpy()[1:] == ts.dt.normalize().to_numpy()[:-1]]
+        # Campaign the visitor arrived with, carried forward per visitor
+        arrived_with = campaign.groupby(events['Visitor ID'], sort=False).ffill()
+        previous = arrived_with.groupby(events['Visitor ID'], sort=False).shift()
+        new_campaign = (campaign.notna() & (campaign != previous)).to_numpy()
+
+        starts = ~same_visitor | (gap > self.timeout.to_timedelta64()) | ~same_day | new_campaign
+        events['Session'] = np.cumsum(starts)
+        return events
+
+    def _finalize(self, sessions):
+        grouped = sessions.groupby('Session', sort=False)
+        summary = pd.DataFrame({
+            'Landing Page': grouped['Page'].first(),
+            'Pageviews': grouped['Page'].size(),
+            'Duration': (grouped['Timestamp'].max() - grouped['Timestamp'].min()).dt.total_seconds()
+        })
+        summary['Bounces'] = (summary['Pageviews'] == 1).astype(int)
+        summary['Sessions'] = 1
+        by_page = summary.groupby('Landing Page')[TOTALS].sum()
+        for page, row in by_page.iterrows():
+            totals = self._totals.setdefault(page, dict.fromkeys(TOTALS, 0))
+            for column in TOTALS:
+                totals[column] += row[column]
+
+    def add(self, chunk):
+        """Sessionize a chunk of pageviews (``COLUMNS``)."""
+        chunk = chunk[COLUMNS].copy()
+        chunk['Timestamp'] = pd.to_datetime(chunk['Timestamp'])
+        if chunk.empty:
+            return
+
+        if self.watermark is not None:
+            # Older than anything still open for this visitor: the session it
+            # belonged to is already final
+            open_visitors = set(self._open['Visitor ID'])
+            too_late = (chunk['Timestamp'] < self.watermark - self.timeout) & ~chunk['Visitor ID'].isin(open_visitors)
+            self.late_dropped += int(too_late.sum())
+            chunk = chunk[~too_late]
+
+        latest = chunk['Timestamp'].max()
+        watermark = latest - self.allowed_lateness
+        self.watermark = watermark if self.watermark is None else max(self.watermark, watermark)
+
+        events = pd.concat([self._open, chunk], ignore_index=True) if len(self._open) else chunk
+        events = self._sessionize(events)
+        last_seen = events.groupby('Session')['Timestamp'].transform('max')
+        final = (last_seen + self.timeout) < self.watermark
+        self._finalize(events[final])
+        self._open = events.loc[~final, COLUMNS].reset_index(drop=True)
+
+    def flush(self):
+        """Close every open session, e.g. at the end of the input."""
+        if len(self._open):
+            self._finalize(self._sessionize(self._open))
+            self._open = self._open.iloc[0:0]
+
+    @property
+    def open_pageviews(self):
+        return len(self._open)
+
+    def totals(self):
+        """``TOTALS`` per landing page over the sessions closed so far."""
+        return pd.DataFrame.from_dict(self._totals, orient='index', columns=TOTALS)
+
+    def landing_pages(self):
+        """Sessions, bounce rate, pages per session and average duration per landing page."""
+        return landing_page_table(self.totals())
+
+
+def landing_page_table(totals):
+    """Per-page stats table from ``TOTALS`` per landing page."""
+    if totals.empty:
+        return pd.DataFrame(columns=['Page', 'Sessions', 'Bounce Rate', 'Pages / Session', 'Avg. Duration (s)'])
+    stats = pd.DataFrame({
+        'Page': totals.index,
+        'Sessions': totals['Sessions'].astype(int).to_numpy(),
+        'Bounce Rate': (totals['Bounces'] / totals['Sessions'] * 100).round(1).to_numpy(),
+        'Pages / Session': (totals['Pageviews'] / totals['Sessions']).round(2).to_numpy(),
+        'Avg. Duration (s)': (totals['Duration'] / totals['Sessions']).round(0).to_numpy()
+    })
+    return stats.sort_values('Sessions', ascending=False, kind='stable').reset_index(drop=True)
+
+
+class StoreLandingPages:
+    """Landing-page stats over ``start``..``end`` (None: unbounded), kept current with the store's pageviews.
+
+    Each month partition in the range is streamed through its own
+    :class:`Sessionizer` and its per-page totals kept. On :meth:`refresh`,
+    only the months whose files changed are re-sessionized and their
+    totals replaced.
+    """
+
+    def __init__(self, store, start=None, end=None, timeout=timedelta(minutes=30), allowed_lateness=timedelta(minutes=10)):
+        self.store = store
+        self.start = start
+        self.end = end
+        self.timeout = timeout
+        self.allowed_lateness = allowed_lateness
+        self._version = None
+        self._partitions = {}
+        self._months = {}
+        self._stats = None
+        self._lock = threading.Lock()
+
+    def _month_totals(self, year, month):
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        first = max(first, self.start) if self.start else first
+        last = min(last, self.end) if self.end else last
+        if first > last:
+            return None
+        sessionizer = Sessionizer(self.timeout, self.allowed_lateness)
+        sessionizer.add(self.store.read('pageviews', columns=COLUMNS, start=first, end=last))
+        sessionizer.flush()
+        return sessionizer.totals()
+
+    def refresh(self):
+        """Re-sessionize the months that changed; returns the landing-page table (read-only)."""
+        with self._lock:
+            version = self.store.version('pageviews')
+            if version != self._version:
+                partitions = self.store.partitions('pageviews')
+                for key in changed_partitions(self._partitions, partitions):
+                    self._months.pop(key, None)
+                    totals = self._month_totals(*key) if key in partitions else None
+                    if totals is not None and not totals.empty:
+                        self._months[key] = totals
+                totals = pd.concat(self._months.values()).groupby(level=0).sum() if self._months else pd.DataFrame(columns=TOTALS)
+                self._stats = landing_page_table(totals)
+                self._partitions = partitions
+                self._version = version
+            return self._stats
@@ -0,0 +1,100 @@
+"""Display formats for numeric table columns.
+
+Columns stay numeric in the frame handed to ``st.dataframe``; currency,
+percent and multiplier formatting is declared per column in the column
+metadata and applied by the frontend. That keeps sorting numeric and
+avoids a Python call per cell, however many rows the table has.
+
+Conditional colors work the same way. Instead of a Styler (a Python call
+and a CSS rule per cell), a colored column holds each value as a one-tag
+list, built in one Arrow operation, and the column config maps every
+distinct value to its color; thresholds are resolved once per distinct
+value, not per row.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+# kind -> (printf format with a {decimals} placeholder, default decimals)
+FORMATS = {
+    'currency': ('$%,.{decimals}f', 0),
+    'percent': ('%.{decimals}f%%', 1),  # values already in percent, e.g. 12.5
+    'multiplier': ('%.{decimals}fx', 2),
+    'integer': ('%,.{decimals}f', 0),
+    'number': ('%,.{decimals}f', 2),
+}
+
+# Tag colors of good / warning / bad / neutral values
+STATUS_COLORS = {
+    'good': '#d4edda',
+    'warning': '#fff3cd',
+    'bad': '#f8d7da',
+    'info': '#d1ecf1',
+}
+
+
+def number_format(kind, decimals=None):
+    """printf-style format string for a column of ``kind``."""
+    template, default = FORMATS[kind]
+    return template.format(decimals=default if decimals is None else decimals)
+
+
+def column_config(formats, **columns):
+    """``column_config`` for ``st.dataframe`` from ``{column: kind}``.
+
+    A kind may also be given as ``(kind, decimals)``. Extra keyword
+    arguments are passed through as column configs of their own.
+    """
+    config = dict(columns)
+    for column, spec in formats.items():
+        kind, decimals = spec if isinstance(spec, tuple) else (spec, None)
+        config[column] = st.column_config.NumberColumn(format=number_format(kind, decimals))
+    return config
+
+
+def formatted_dataframe(df, formats, column_configs=None, **kwargs):
+    """``st.dataframe`` with numeric columns formatted per ``formats``."""
+    return st.dataframe(df, column_config=column_config(formats, **(column_configs or {})), **kwargs)
+
+
+def tags(values):
+    """``values`` as one-element lists, the cell shape of a colored tag column."""
+    array = pa.array(pd.Series(values).astype(str), type=pa.string())
+    offsets = pa.array(np.arange(len(array) + 1, dtype=np.int32))
+    cells = pa.ListArray.from_arrays(offsets, array).to_numpy(zero_copy_only=False)
+    return pd.Series(cells, index=getattr(values, 'index', None), dtype=object)
+
+
+def tag_column(colors, label=None):
+    """Read-only column config showing each value as a tag colored per ``{value: color}``."""
+    return st.column_config.MultiselectColumn(label, options=list(colors), color=list(colors.values()))
+
+
+def threshold_colors(values, thresholds, colors):
+    """``{value: color}`` for the distinct ``values``, banded by ascending ``thresholds``.
+
+    ``colors`` has one more entry than ``thresholds``: values below the first
+    threshold get ``colors[0]``, values at or above the last get ``colors[-1]``.
+    """
+    distinct = np.unique(np.asarray(values))
+    bands = np.asarray(colors)[np.digitize(distinct, thresholds)]
+    return dict(zip(distinct.astype(str), bands))
+
+
+def threshold_bands(values, thresholds, labels):
+    """Band label of each of ``values``, banded by ascending ``thresholds`` like :func:`threshold_colors`.
+
+    Color the labels in a column of their own, so the values stay numeric.
+    """
+    bands = np.asarray(labels)[np.digitize(np.asarray(values), thresholds)]
+    return pd.Series(bands, index=getattr(values, 'index', None))
+
+
+def colored_dataframe(df, colors, column_configs=None, **kwargs):
+    """``st.dataframe`` with the columns in ``colors`` (``{column: {value: color}}``) shown as colored tags."""
+    config = dict(column_configs or {})
+    config.update({column: tag_column(mapping) for column, mapping in colors.items()})
+    df = df.assign(**{column: tags(df[column]) for column in colors})
+    return st.dataframe(df, column_config=config, **kwargs)
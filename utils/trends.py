@@ -0,0 +1,209 @@
+"""Weekly trends with trailing-window means, kept current event by event.
+
+Every (group, measure) series is one row of a dense ``groups x measures x
+weeks`` array of weekly totals, stored next to an array of trailing-window
+sums. An event adds its amount to one weekly total and to the ``window``
+sums that cover that week, so a new registration costs O(window) however
+long the history is, and late events still land in the week they belong
+to. The trend for a set of groups is the sum of their rows; window means
+are linear, so they add up the same way.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.data_store import changed_partitions
+
+WINDOW = 4
+
+# 1970-01-01 was a Thursday: day 0 sits 3 days into its Monday-based week
+_EPOCH_WEEKDAY = 3
+
+
+def week_keys(timestamps):
+    """Index of the Monday-to-Sunday week of each timestamp."""
+    days = np.asarray(timestamps, dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    return (days + _EPOCH_WEEKDAY) // 7
+
+
+def week_starts(keys):
+    """Monday of each week index, as timestamps."""
+    days = np.asarray(keys, dtype=np.int64) * 7 - _EPOCH_WEEKDAY
+    return pd.to_datetime(days.astype('datetime64[D]'))
+
+
+class RollingTrends:
+    """Weekly totals and trailing ``window``-week means per group and measure."""
+
+    def __init__(self, groups, measures, window=WINDOW):
+        self.groups = list(groups)
+        self.measures = list(measures)
+        self.window = window
+        self._codes = {group: code for code, group in enumerate(self.groups)}
+        self.origin = None
+        self.last = None
+        self.totals = np.zeros((len(self.groups), len(self.measures), 0))
+        self.sums = np.zeros_like(self.totals)
+
+    def codes(self, groups):
+        """Integer code of each group label, -1 for unknown groups."""
+        return np.array([self._codes.get(group, -1) for group in groups], dtype=np.int64)
+
+    def _refill(self, lo, hi):
+        # Window sums of columns lo..hi-1 from the weekly totals
+        first = max(lo - self.window + 1, 0)
+        running = np.cumsum(self.totals[..., first:hi], axis=2)
+        lagged = np.zeros_like(running)
+        lagged[..., self.window:] = running[..., :-self.window]
+        self.sums[..., lo:hi] = (running - lagged)[..., lo - first:]
+
+    def _ensure(self, lo, hi):
+        # Grow the week axis (with headroom) so weeks lo..hi are addressable
+        if self.origin is None:
+            self.origin = lo
+        if lo < self.origin:
+            pad = np.zeros(self.totals.shape[:2] + (self.origin - lo,))
+            self.totals = np.concatenate([pad, self.totals], axis=2)
+            self.sums = np.concatenate([pad, self.sums], axis=2)
+            self.origin = lo
+        needed = hi - self.origin + 1
+        length = self.totals.shape[2]
+        if needed > length:
+            grow = max(needed, 2 * length) - length
+            pad = np.zeros(self.totals.shape[:2] + (grow,))
+            self.totals = np.concatenate([self.totals, pad], axis=2)
+            self.sums = np.concatenate([self.sums, pad], axis=2)
+            # Fresh weeks still carry the tail of the weeks before them
+            self._refill(length, length + grow)
+        self.last = hi if self.last is None else max(self.last, hi)
+
+    def add(self, when, group, measure, amount=1):
+        """Add one event, e.g. ``add(timestamp, ('Educational', 'EMEA', 'GlideScope'), 'Registrations')``."""
+        week = int(week_keys([when])[0])
+        self._ensure(week, week)
+        g, m, c = self._codes[group], self.measures.index(measure), week - self.origin
+        self.totals[g, m, c] += amount
+        self.sums[g, m, c:c + self.window] += amount
+
+    def add_many(self, when, codes, measure, amounts=None):
+        """Add events in bulk; ``codes`` are group codes from :meth:`codes` (-1 rows are skipped)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        known = codes >= 0
+        if not known.any():
+            return
+        weeks = week_keys(when)[known]
+        amounts = np.ones(len(weeks)) if amounts is None else np.asarray(amounts, dtype=float)[known]
+        lo, hi = int(weeks.min()), int(weeks.max())
+        self._ensure(lo, hi)
+        np.add.at(self.totals[:, self.measures.index(measure)], (codes[known], weeks - self.origin), amounts)
+        self._refill(lo - self.origin, min(hi - self.origin + self.window, self.totals.shape[2]))
+
+    def frame(self, groups=None, start=None, end=None, date_column='Date'):
+        """Weekly totals and window means (``<measure> <window>W Avg``) summed over ``groups``.
+
+        Weeks run from the first week with data (or ``start``) to the last
+        (or ``end``); means are NaN until ``window`` weeks of history exist.
+        """
+        averages = [f"{measure} {self.window}W Avg" for measure in self.measures]
+        if self.origin is None:
+            return pd.DataFrame(columns=[date_column] + self.measures + averages)
+        if groups is None:
+            rows = slice(None)
+        else:
+            codes = self.codes(groups)
+            rows = codes[codes >= 0]
+        totals = self.totals[rows].sum(axis=0)
+        means = self.sums[rows].sum(axis=0) / self.window
+        means[:, :self.window - 1] = np.nan
+
+        first, last = self.origin, self.last
+        if start is not None:
+            first = max(first, int(week_keys([pd.Timestamp(start)])[0]))
+        if end is not None:
+            last = min(last, int(week_keys([pd.Timestamp(end)])[0]))
+        span = slice(first - self.origin, max(last - self.origin + 1, first - self.origin))
+
+        frame = pd.DataFrame(np.vstack([totals[:, span], means[:, span]]).T, columns=self.measures + averages)
+        frame.insert(0, date_column, week_starts(np.arange(first, first + len(frame))))
+        return frame
+
+
+# Registration trend series per webinar group
+TREND_GROUP_COLUMNS = ['Type', 'Region', 'Product Line']
+
+TREND_MEASURES = ['Registrations', 'Attendees']
+
+
+class WebinarTrends:
+    """Registration and attendance trends kept current with the store.
+
+    Registrations count in the week they were made, attendees in the week
+    of their webinar. On :meth:`refresh`, only the registration month
+    partitions whose files changed are read: their previous events are
+    taken out and the new ones added. A change to the webinars themselves
+    (their dates or groups) rebuilds the trends.
+    """
+
+    def __init__(self, store, window=WINDOW):
+        self.store = store
+        self.window = window
+        self.trends = None
+        self._versions = {}
+        self._partitions = {}
+        self._added = {}
+        self._lock = threading.Lock()
+
+    def _rebuild(self):
+        webinars = self.store.read('webinars', columns=['Webinar ID', 'Date'] + TREND_GROUP_COLUMNS)
+        groups = list(webinars[TREND_GROUP_COLUMNS].drop_duplicates().sort_values(TREND_GROUP_COLUMNS).itertuples(index=False, name=None))
+        self.trends = RollingTrends(groups, TREND_MEASURES, self.window)
+        self._webinars = pd.DataFrame({
+            'Code': self.trends.codes(webinars[TREND_GROUP_COLUMNS].itertuples(index=False, name=None)),
+            'Date': webinars['Date'].to_numpy()
+        }, index=webinars['Webinar ID'])
+        self._partitions = {}
+        self._added = {}
+
+    def _apply(self, events, sign):
+        codes, registered, webinar_dates, attended = events
+        self.trends.add_many(registered, codes, 'Registrations', np.full(len(codes), sign))
+        self.trends.add_many(webinar_dates[attended], codes[attended], 'Attendees', np.full(attended.sum(), sign))
+
+    def _refresh_registrations(self):
+        partitions = self.store.partitions('webinar_registrations')
+        changed = changed_partitions(self._partitions, partitions)
+        for key in changed:
+            previous = self._added.pop(key, None)
+            if previous is not None:
+                self._apply(previous, -1)
+
+        reload = [key for key in changed if key in partitions]
+        if reload:
+            rows = self.store.scan_partitions(
+                'webinar_registrations', reload, columns=['Webinar ID', 'Registered At', 'Attended']
+            ).to_pandas()
+            months = rows['year'].to_numpy(dtype=np.int64) * 12 + rows['month'].to_numpy(dtype=np.int64)
+            webinars = self._webinars.reindex(rows['Webinar ID'])
+            codes = webinars['Code'].fillna(-1).to_numpy(dtype=np.int64)
+            registered = rows['Registered At'].to_numpy(dtype='datetime64[ns]')
+            webinar_dates = webinars['Date'].to_numpy(dtype='datetime64[ns]')
+            attended = rows['Attended'].to_numpy(dtype=bool) & (codes >= 0)
+            for year, month in reload:
+                mask = months == year * 12 + month
+                events = (codes[mask], registered[mask], webinar_dates[mask], attended[mask])
+                self._apply(events, 1)
+                self._added[(year, month)] = events
+        self._partitions = partitions
+
+    def refresh(self):
+        """Fold in whatever changed in the webinar datasets; returns the :class:`RollingTrends`."""
+        with self._lock:
+            versions = {dataset: self.store.version(dataset) for dataset in ('webinars', 'webinar_registrations')}
+            if versions['webinars'] != self._versions.get('webinars'):
+                self._rebuild()
+            if versions != self._versions:
+                self._refresh_registrations()
+                self._versions = versions
+        return self.trends
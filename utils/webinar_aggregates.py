@@ -0,0 +1,146 @@
+"""Webinar totals per type, region, product line and quarter, maintained on write.
+
+One dense ``cells x measures`` array holds the number of webinars and
+their registrations and attendees for every (type, region, product line,
+quarter) cell. The aggregates subscribe to the store: when registration
+records land, only the month partitions that changed are read, their
+previous per-cell counts are subtracted and the new ones added in place.
+A page rolls up a few hundred cells instead of grouping raw records, so
+its cost does not grow with the number of registrations. Counts are also
+kept per webinar, so taking some webinars out of a roll-up subtracts what
+the same records gave them.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.data_store import changed_partitions
+
+AGGREGATE_GROUPS = ['Type', 'Region', 'Product Line']
+
+AGGREGATE_MEASURES = ['Webinars', 'Registrations', 'Attendees']
+
+
+def quarter_keys(dates):
+    """``year * 4 + quarter index`` of each date."""
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    return dates.year.to_numpy() * 4 + (dates.month.to_numpy() - 1) // 3
+
+
+def quarter_labels(keys):
+    """``'2024 Q2'`` style labels of quarter keys."""
+    return [f"{key // 4} Q{key % 4 + 1}" for key in keys]
+
+
+class WebinarAggregates:
+    """Materialized webinar totals, kept current with the store's webinar datasets."""
+
+    def __init__(self, store):
+        self.store = store
+        self.cells = None
+        self.values = None
+        self._versions = {}
+        self._partitions = {}
+        self._added = {}
+        self._lock = threading.Lock()
+        store.subscribe(self._on_write)
+
+    def _on_write(self, dataset):
+        if dataset in ('webinars', 'webinar_registrations'):
+            self.refresh()
+
+    def _rebuild(self):
+        webinars = self.store.read('webinars', columns=['Webinar ID', 'Date'] + AGGREGATE_GROUPS)
+        keys = webinars[AGGREGATE_GROUPS].assign(Quarter=quarter_keys(webinars['Date']))
+        self.cells = keys.drop_duplicates().sort_values(list(keys.columns)).reset_index(drop=True)
+        cell = pd.MultiIndex.from_frame(self.cells).get_indexer(pd.MultiIndex.from_frame(keys))
+        self._webinars = pd.Index(webinars['Webinar ID'])
+        self._webinar_cells = cell
+        self._webinar_values = np.zeros((len(webinars), len(AGGREGATE_MEASURES) - 1), dtype=np.int64)
+        self.values = np.zeros((len(self.cells), len(AGGREGATE_MEASURES)), dtype=np.int64)
+        self.values[:, 0] = np.bincount(cell, minlength=len(self.cells))
+        self._partitions = {}
+        self._added = {}
+
+    def _counts(self, rows):
+        # Registrations and attendees per webinar of a batch of registration records
+        webinar = self._webinars.get_indexer(rows['Webinar ID'])
+        known = webinar >= 0
+        attended = rows['Attended'].to_numpy(dtype=bool)[known]
+        return np.stack([
+            np.bincount(webinar[known], minlength=len(self._webinars)),
+            np.bincount(webinar[known][attended], minlength=len(self._webinars))
+        ], axis=1)
+
+    def _cell_totals(self, webinar_values, webinars=None):
+        # Per-webinar counts summed into cells (of every webinar, or of the ``webinars`` positions)
+        cell = self._webinar_cells if webinars is None else self._webinar_cells[webinars]
+        return np.stack(
+            [np.bincount(cell, weights=column, minlength=len(self.cells)) for column in webinar_values.T], axis=1
+        ).astype(np.int64)
+
+    def _add(self, counts, sign):
+        self._webinar_values += sign * counts
+        self.values[:, 1:] += sign * self._cell_totals(counts)
+
+    def _refresh_registrations(self):
+        partitions = self.store.partitions('webinar_registrations')
+        changed = changed_partitions(self._partitions, partitions)
+        for key in changed:
+            previous = self._added.pop(key, None)
+            if previous is not None:
+                self._add(previous, -1)
+
+        reload = [key for key in changed if key in partitions]
+        if reload:
+            rows = self.store.scan_partitions(
+                'webinar_registrations', reload, columns=['Webinar ID', 'Attended']
+            ).to_pandas()
+            for (year, month), batch in rows.groupby(['year', 'month']):
+                counts = self._counts(batch)
+                self._add(counts, 1)
+                self._added[(int(year), int(month))] = counts
+        self._partitions = partitions
+
+    def refresh(self):
+        """Fold in whatever changed since the last refresh; returns ``self``."""
+        with self._lock:
+            versions = {dataset: self.store.version(dataset) for dataset in ('webinars', 'webinar_registrations')}
+            if versions != self._versions:
+                if versions['webinars'] != self._versions.get('webinars'):
+                    self._rebuild()
+                self._refresh_registrations()
+                self._versions = versions
+        return self
+
+    def frame(self, exclude=None):
+        """Every non-empty cell with its totals, less the webinar ids in ``exclude``."""
+        with self._lock:
+            values = self.values.copy()
+            if exclude is not None:
+                webinars = self._webinars.get_indexer(pd.Index(exclude).unique())
+                webinars = webinars[webinars >= 0]
+                values[:, 0] -= np.bincount(self._webinar_cells[webinars], minlength=len(self.cells))
+                values[:, 1:] -= self._cell_totals(self._webinar_values[webinars], webinars)
+            cells = self.cells.assign(**dict(zip(AGGREGATE_MEASURES, values.T)))
+        return cells[cells['Webinars'] > 0].reset_index(drop=True)
+
+    def rollup(self, by='Type', start=None, exclude=None, **filters):
+        """Totals per ``by`` over the cells from ``start``'s quarter on, within ``filters``.
+
+        ``filters`` map group columns to the values to keep (None keeps all).
+        ``exclude`` optionally lists webinar ids to take out of the totals,
+        e.g. the ones not held yet; their registrations and attendees come
+        from the same records as the cells'.
+        """
+        cells = self.frame(exclude)
+        keep = np.ones(len(cells), dtype=bool)
+        if start is not None:
+            keep &= cells['Quarter'].to_numpy() >= quarter_keys([start])[0]
+        for column, values in filters.items():
+            if values is not None:
+                keep &= cells[column].isin(values).to_numpy()
+        totals = cells[keep].groupby(by)[AGGREGATE_MEASURES].sum()
+        return totals[totals['Webinars'] > 0].astype(np.int64)